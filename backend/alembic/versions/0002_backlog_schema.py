@@ -0,0 +1,136 @@
+"""Rollups, dimension lookups, email outbox, and new columns and indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('page_view_daily',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('bucket', sa.DateTime(), nullable=False),
+    sa.Column('page_path', sa.String(length=255), nullable=False),
+    sa.Column('project_slug', sa.String(length=100), nullable=False),
+    sa.Column('views', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('bucket', 'page_path', 'project_slug')
+    )
+    op.create_table('page_view_hourly',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('bucket', sa.DateTime(), nullable=False),
+    sa.Column('page_path', sa.String(length=255), nullable=False),
+    sa.Column('project_slug', sa.String(length=100), nullable=False),
+    sa.Column('views', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('bucket', 'page_path', 'project_slug')
+    )
+    op.create_table('referrer_hosts',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('host', sa.String(length=255), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('host')
+    )
+    op.create_table('user_agents',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('value', sa.String(length=512), nullable=False),
+    sa.Column('browser', sa.String(length=50), nullable=False),
+    sa.Column('os', sa.String(length=50), nullable=False),
+    sa.Column('device', sa.String(length=20), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('value')
+    )
+    op.create_table('visitor_sketches',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('bucket', sa.DateTime(), nullable=False),
+    sa.Column('registers', sa.LargeBinary(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('bucket')
+    )
+    op.create_table('email_outbox',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('contact_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.func.now(), nullable=False),
+    sa.Column('sent_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['contact_id'], ['contacts.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_email_outbox_status_next_attempt_at', 'email_outbox', ['status', 'next_attempt_at'], unique=False)
+    op.create_table('page_view_referrer_daily',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('bucket', sa.DateTime(), nullable=False),
+    sa.Column('referrer_host_id', sa.Integer(), nullable=False),
+    sa.Column('views', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['referrer_host_id'], ['referrer_hosts.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('bucket', 'referrer_host_id')
+    )
+    op.create_table('page_view_user_agent_daily',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('bucket', sa.DateTime(), nullable=False),
+    sa.Column('user_agent_id', sa.Integer(), nullable=False),
+    sa.Column('views', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_agent_id'], ['user_agents.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('bucket', 'user_agent_id')
+    )
+    op.add_column('chat_sessions', sa.Column('summary', sa.Text(), nullable=True))
+    op.add_column('contacts', sa.Column('fingerprint', sa.String(length=64), nullable=True))
+    op.create_index('ix_contacts_created_at', 'contacts', ['created_at'], unique=False)
+    op.create_index('ix_contacts_fingerprint', 'contacts', ['fingerprint'], unique=False)
+    op.create_index('ix_contacts_is_read_created_at', 'contacts', ['is_read', 'created_at'], unique=False)
+    # Batch mode: SQLite cannot add a foreign key to an existing table, so
+    # there the table is copied
+    with op.batch_alter_table('page_views') as batch_op:
+        batch_op.add_column(sa.Column('user_agent_id', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('referrer_host_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key('page_views_user_agent_id_fkey', 'user_agents', ['user_agent_id'], ['id'])
+        batch_op.create_foreign_key('page_views_referrer_host_id_fkey', 'referrer_hosts', ['referrer_host_id'], ['id'])
+    op.create_index('ix_page_views_created_at_dimensions', 'page_views', ['created_at', 'user_agent_id', 'referrer_host_id'], unique=False)
+    op.create_index('ix_page_views_created_at_page_path', 'page_views', ['created_at', 'page_path'], unique=False)
+    op.create_index('ix_page_views_created_at_project_slug', 'page_views', ['created_at', 'project_slug'], unique=False)
+    op.create_index('ix_page_views_created_at_visitor_id', 'page_views', ['created_at', 'visitor_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_page_views_created_at_visitor_id', table_name='page_views')
+    op.drop_index('ix_page_views_created_at_project_slug', table_name='page_views')
+    op.drop_index('ix_page_views_created_at_page_path', table_name='page_views')
+    op.drop_index('ix_page_views_created_at_dimensions', table_name='page_views')
+    with op.batch_alter_table('page_views') as batch_op:
+        batch_op.drop_constraint('page_views_referrer_host_id_fkey', type_='foreignkey')
+        batch_op.drop_constraint('page_views_user_agent_id_fkey', type_='foreignkey')
+        batch_op.drop_column('referrer_host_id')
+        batch_op.drop_column('user_agent_id')
+    op.drop_index('ix_contacts_is_read_created_at', table_name='contacts')
+    op.drop_index('ix_contacts_fingerprint', table_name='contacts')
+    op.drop_index('ix_contacts_created_at', table_name='contacts')
+    op.drop_column('contacts', 'fingerprint')
+    op.drop_column('chat_sessions', 'summary')
+    op.drop_table('page_view_user_agent_daily')
+    op.drop_table('page_view_referrer_daily')
+    op.drop_index('ix_email_outbox_status_next_attempt_at', table_name='email_outbox')
+    op.drop_table('email_outbox')
+    op.drop_table('visitor_sketches')
+    op.drop_table('user_agents')
+    op.drop_table('referrer_hosts')
+    op.drop_table('page_view_hourly')
+    op.drop_table('page_view_daily')
@@ -1,39 +1,74 @@
 """
 Analytics Endpoint
 """
-from datetime import datetime, timedelta
-from typing import Optional
+import csv
+import io
+import json
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Literal, Optional
 
-from fastapi import APIRouter, Depends, Request, Query
+from fastapi import APIRouter, Depends, Request, Response, Query
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy import select, func
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.v1.schemas.analytics import (
     PageViewCreate,
     PageViewResponse,
+    PageViewBatchCreate,
+    PageViewBatchError,
+    PageViewBatchResponse,
     AnalyticsStatsResponse,
     PageStats,
-    ProjectStats
+    ProjectStats,
+    BrowserStats,
+    ReferrerStats,
+    TimeSeriesPoint,
+    TimeSeriesResponse
 )
+from app.core.exceptions import BadRequestException
 from app.core.security import limiter, get_client_ip, verify_admin_api_key
-from app.db.database import get_db
-from app.db.models import PageView
+from app.db.database import async_session_maker
+from app.db.models import PageView, ReferrerHost, UserAgent
+from app.services.analytics_buffer import get_pageview_buffer
+from app.services.analytics_rollups import (
+    query_timeseries,
+    query_top_dimensions,
+    query_unique_visitors,
+    query_view_stats
+)
+from app.services.stats_cache import get_stats_cache
 from app.config import settings
 
 
 router = APIRouter()
 
 
+def _pageview_row(pageview_data: PageViewCreate, user_agent: str) -> dict:
+    """Build a buffered page view row (user agent and referrer are encoded at flush)."""
+    return {
+        "page_path": pageview_data.page_path,
+        "project_slug": pageview_data.project_slug,
+        "visitor_id": pageview_data.visitor_id,
+        "user_agent": user_agent,
+        "referrer": pageview_data.referrer
+    }
+
+
 @router.post("/pageview", response_model=PageViewResponse)
 @limiter.limit(f"{settings.rate_limit_per_minute}/minute")
 async def record_pageview(
     request: Request,
-    pageview_data: PageViewCreate,
-    db: AsyncSession = Depends(get_db)
+    pageview_data: PageViewCreate
 ):
     """
     Record a page view.
     
+    Views are buffered and written in batches, so a successful response
+    means the view was accepted, not yet committed.
+    
     - **page_path**: Page path being viewed
     - **project_slug**: Project identifier (optional)
     - **visitor_id**: Anonymous visitor ID (optional)
@@ -42,17 +77,7 @@ async def record_pageview(
     # Get request metadata
     user_agent = request.headers.get("User-Agent", "")
     
-    # Create page view record
-    pageview = PageView(
-        page_path=pageview_data.page_path,
-        project_slug=pageview_data.project_slug,
-        visitor_id=pageview_data.visitor_id,
-        user_agent=user_agent,
-        referrer=pageview_data.referrer
-    )
-    
-    db.add(pageview)
-    await db.commit()
+    await get_pageview_buffer().add(_pageview_row(pageview_data, user_agent))
     
     return PageViewResponse(
         success=True,
@@ -60,73 +85,329 @@ async def record_pageview(
     )
 
 
+async def _pageview_batch_body(request: Request) -> PageViewBatchCreate:
+    """
+    Parse the batch body whatever its content type.
+    
+    ``navigator.sendBeacon`` can only send cross-origin without a CORS
+    preflight as text/plain, so the JSON is read from the raw body.
+    """
+    try:
+        return PageViewBatchCreate.model_validate_json(await request.body())
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**err, "loc": ("body", *err["loc"])} for err in e.errors(include_url=False)]
+        )
+
+
+_BATCH_BODY_SCHEMA = {"schema": PageViewBatchCreate.model_json_schema()}
+
+
+@router.post(
+    "/pageview/batch",
+    response_model=PageViewBatchResponse,
+    openapi_extra={"requestBody": {
+        "required": True,
+        "content": {"application/json": _BATCH_BODY_SCHEMA, "text/plain": _BATCH_BODY_SCHEMA}
+    }}
+)
+@limiter.limit(f"{settings.rate_limit_per_minute}/minute")
+async def record_pageview_batch(
+    request: Request,
+    batch_data: PageViewBatchCreate = Depends(_pageview_batch_body)
+):
+    """
+    Record many page views in one request.
+    
+    Each item is validated as a single page view; invalid items are
+    reported by index and the valid ones are still recorded. Rate limiting
+    counts the batch as one request. The body is JSON, sent as
+    application/json or (from `sendBeacon`) text/plain.
+    
+    - **items**: List of page views (max `ANALYTICS_BATCH_MAX_ITEMS`)
+    """
+    user_agent = request.headers.get("User-Agent", "")
+    rows = []
+    errors = []
+    
+    for index, item in enumerate(batch_data.items):
+        try:
+            pageview_data = PageViewCreate.model_validate(item)
+        except ValidationError as e:
+            errors.append(PageViewBatchError(
+                index=index,
+                errors=[
+                    # Non-object items fail at the top level, with no location
+                    f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}"
+                    if err["loc"] else err["msg"]
+                    for err in e.errors()
+                ]
+            ))
+            continue
+        rows.append(_pageview_row(pageview_data, user_agent))
+    
+    if rows:
+        await get_pageview_buffer().add_many(rows)
+    
+    return PageViewBatchResponse(
+        success=not errors,
+        accepted=len(rows),
+        rejected=len(errors),
+        errors=errors
+    )
+
+
+async def _compute_stats(days: int, exact: bool) -> AnalyticsStatsResponse:
+    """Compute analytics statistics in a dedicated session (shared by waiters)."""
+    since_date = datetime.utcnow() - timedelta(days=days)
+    
+    async with async_session_maker() as db:
+        # Views come from the hourly/daily rollups (hour precision)
+        total_views, page_rows, project_rows = await query_view_stats(db, since_date)
+        top_pages = [
+            PageStats(page_path=page_path, view_count=count)
+            for page_path, count in page_rows
+        ]
+        top_projects = [
+            ProjectStats(project_slug=project_slug, view_count=count)
+            for project_slug, count in project_rows
+        ]
+        
+        # Browsers and referrers come from the daily dimension rollups
+        browser_rows, referrer_rows = await query_top_dimensions(db, since_date)
+        
+        # Unique visitors
+        if exact:
+            unique_visitors_result = await db.execute(
+                select(func.count(func.distinct(PageView.visitor_id))).where(
+                    PageView.created_at >= since_date,
+                    PageView.visitor_id.isnot(None)
+                )
+            )
+            unique_visitors = unique_visitors_result.scalar() or 0
+        else:
+            unique_visitors = await query_unique_visitors(db, since_date)
+    
+    return AnalyticsStatsResponse(
+        total_views=total_views,
+        unique_visitors=unique_visitors,
+        top_pages=top_pages,
+        top_projects=top_projects,
+        top_browsers=[
+            BrowserStats(browser=browser, view_count=count)
+            for browser, count in browser_rows
+        ],
+        top_referrers=[
+            ReferrerStats(referrer_host=host, view_count=count)
+            for host, count in referrer_rows
+        ],
+        period_days=days
+    )
+
+
 @router.get("/stats", response_model=AnalyticsStatsResponse)
 async def get_analytics_stats(
+    response: Response,
     days: int = Query(default=30, ge=1, le=365, description="Number of days to analyze"),
-    api_key: str = Depends(verify_admin_api_key),
-    db: AsyncSession = Depends(get_db)
+    exact: bool = Query(default=False, description="Count unique visitors exactly from raw events"),
+    api_key: str = Depends(verify_admin_api_key)
 ):
     """
     Get analytics statistics (Admin only).
     
+    Results are cached per query for up to the stats cache TTL, which the
+    Cache-Control max-age reports and which bounds staleness: new page
+    views drop the cache at most once per TTL, and are counted no later
+    than one TTL after they are written. Concurrent identical requests
+    share one computation.
+    
     - **days**: Number of days to analyze (1-365)
+    - **exact**: Count unique visitors from raw events instead of the
+      per-day HyperLogLog sketches (~1.6% standard error)
     """
+    cache = get_stats_cache()
+    stats, age = await cache.get_or_compute(
+        ("stats", days, exact),
+        lambda: _compute_stats(days, exact)
+    )
+    
+    max_age = max(0, int(cache.ttl_seconds - age))
+    response.headers["Cache-Control"] = f"private, max-age={max_age}"
+    response.headers["Age"] = str(int(age))
+    return stats
+
+
+# Hourly series are limited to keep responses small
+MAX_HOURLY_DAYS = 31
+
+
+async def _compute_timeseries(
+    days: int,
+    bucket: str,
+    page_path: Optional[str],
+    project_slug: Optional[str]
+) -> TimeSeriesResponse:
+    """Compute a time series in a dedicated session (shared by waiters)."""
     since_date = datetime.utcnow() - timedelta(days=days)
     
-    # Total views
-    total_views_result = await db.execute(
-        select(func.count(PageView.id)).where(PageView.created_at >= since_date)
-    )
-    total_views = total_views_result.scalar() or 0
+    async with async_session_maker() as db:
+        rows = await query_timeseries(db, since_date, bucket, page_path, project_slug)
     
-    # Unique visitors
-    unique_visitors_result = await db.execute(
-        select(func.count(func.distinct(PageView.visitor_id))).where(
-            PageView.created_at >= since_date,
-            PageView.visitor_id.isnot(None)
-        )
+    return TimeSeriesResponse(
+        bucket=bucket,
+        period_days=days,
+        page_path=page_path,
+        project_slug=project_slug,
+        points=[
+            TimeSeriesPoint(bucket=start, views=views, unique_visitors=uniques)
+            for start, views, uniques in rows
+        ]
     )
-    unique_visitors = unique_visitors_result.scalar() or 0
+
+
+@router.get("/timeseries", response_model=TimeSeriesResponse)
+async def get_analytics_timeseries(
+    response: Response,
+    days: int = Query(default=30, ge=1, le=365, description="Number of days to analyze"),
+    bucket: Literal["hour", "day", "week"] = Query(default="day", description="Bucket size"),
+    page_path: Optional[str] = Query(default=None, description="Only this page"),
+    project_slug: Optional[str] = Query(default=None, description="Only this project"),
+    api_key: str = Depends(verify_admin_api_key)
+):
+    """
+    Get page views and unique visitors over time (Admin only).
     
-    # Top pages
-    top_pages_result = await db.execute(
-        select(
-            PageView.page_path,
-            func.count(PageView.id).label("view_count")
-        )
-        .where(PageView.created_at >= since_date)
-        .group_by(PageView.page_path)
-        .order_by(func.count(PageView.id).desc())
-        .limit(10)
+    Buckets are UTC and weeks start on Monday. Buckets without views are
+    omitted. Results are cached like `/stats`.
+    
+    - **days**: Number of days to analyze (1-365, max 31 for hourly buckets)
+    - **bucket**: `hour`, `day` or `week`
+    - **page_path** / **project_slug**: Optional filters
+    """
+    if bucket == "hour" and days > MAX_HOURLY_DAYS:
+        raise BadRequestException(f"Hourly buckets are limited to {MAX_HOURLY_DAYS} days")
+    
+    cache = get_stats_cache()
+    series, age = await cache.get_or_compute(
+        ("timeseries", days, bucket, page_path, project_slug),
+        lambda: _compute_timeseries(days, bucket, page_path, project_slug)
     )
-    top_pages = [
-        PageStats(page_path=row[0], view_count=row[1])
-        for row in top_pages_result
-    ]
-    
-    # Top projects
-    top_projects_result = await db.execute(
-        select(
-            PageView.project_slug,
-            func.count(PageView.id).label("view_count")
-        )
-        .where(
-            PageView.created_at >= since_date,
-            PageView.project_slug.isnot(None)
+    
+    max_age = max(0, int(cache.ttl_seconds - age))
+    response.headers["Cache-Control"] = f"private, max-age={max_age}"
+    response.headers["Age"] = str(int(age))
+    return series
+
+
+EXPORT_COLUMNS = {
+    "id": PageView.id,
+    "page_path": PageView.page_path,
+    "project_slug": PageView.project_slug,
+    "visitor_id": PageView.visitor_id,
+    "user_agent": UserAgent.value,
+    "browser": UserAgent.browser,
+    "os": UserAgent.os,
+    "device": UserAgent.device,
+    "referrer_host": ReferrerHost.host,
+    "country": PageView.country,
+    "created_at": PageView.created_at
+}
+
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Convert an offset-aware time to naive UTC, as ``created_at`` is stored."""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+async def _export_pages(
+    since: Optional[datetime],
+    until: Optional[datetime]
+) -> AsyncIterator[list]:
+    """
+    Yield page_views rows in id order, one page at a time.
+    
+    Keyset pagination on id with a fresh short-lived session per page, so
+    no long read transaction holds up ingest.
+    """
+    last_id = 0
+    while True:
+        query = (
+            select(*EXPORT_COLUMNS.values())
+            .outerjoin(UserAgent, PageView.user_agent_id == UserAgent.id)
+            .outerjoin(ReferrerHost, PageView.referrer_host_id == ReferrerHost.id)
+            .where(PageView.id > last_id)
+            .order_by(PageView.id)
+            .limit(settings.analytics_export_page_size)
         )
-        .group_by(PageView.project_slug)
-        .order_by(func.count(PageView.id).desc())
-        .limit(10)
+        if since is not None:
+            query = query.where(PageView.created_at >= since)
+        if until is not None:
+            query = query.where(PageView.created_at < until)
+        
+        async with async_session_maker() as db:
+            rows = (await db.execute(query)).all()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][0]
+
+
+def _format_rows(rows: list, fmt: str) -> str:
+    """Serialize one page of rows as NDJSON lines or CSV records."""
+    if fmt == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue()
+    return "".join(
+        json.dumps(dict(zip(EXPORT_COLUMNS, row)), ensure_ascii=False, default=str) + "\n"
+        for row in rows
     )
-    top_projects = [
-        ProjectStats(project_slug=row[0], view_count=row[1])
-        for row in top_projects_result
-    ]
+
+
+@router.get("/export")
+async def export_pageviews(
+    format: Literal["ndjson", "csv"] = Query(default="ndjson", description="Output format"),
+    gzip: bool = Query(default=False, description="Gzip the output"),
+    since: Optional[datetime] = Query(default=None, description="Only views at or after this time (UTC)"),
+    until: Optional[datetime] = Query(default=None, description="Only views before this time (UTC)"),
+    api_key: str = Depends(verify_admin_api_key)
+):
+    """
+    Stream raw page views for offline analysis (Admin only).
     
-    return AnalyticsStatsResponse(
-        total_views=total_views,
-        unique_visitors=unique_visitors,
-        top_pages=top_pages,
-        top_projects=top_projects,
-        period_days=days
+    Rows are read in pages and written as they are fetched, so memory use
+    stays constant however many rows are exported.
+    
+    - **format**: `ndjson` or `csv` (with header row)
+    - **gzip**: Return a `.gz` file
+    - **since** / **until**: Optional time range
+    """
+    since, until = _naive_utc(since), _naive_utc(until)
+    
+    async def body() -> AsyncIterator[bytes]:
+        compressor = zlib.compressobj(wbits=31) if gzip else None
+        
+        def encode(text: str) -> bytes:
+            data = text.encode("utf-8")
+            return compressor.compress(data) if compressor else data
+        
+        if format == "csv":
+            yield encode(_format_rows([list(EXPORT_COLUMNS)], "csv"))
+        async for rows in _export_pages(since, until):
+            chunk = encode(_format_rows(rows, format))
+            if chunk:
+                yield chunk
+        if compressor:
+            yield compressor.flush()
+    
+    filename = f"page_views.{format}" + (".gz" if gzip else "")
+    media_type = "application/gzip" if gzip else (
+        "text/csv" if format == "csv" else "application/x-ndjson"
+    )
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
     )
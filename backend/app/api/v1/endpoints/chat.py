@@ -1,10 +1,12 @@
 """
 AI Chat Endpoint
 """
+import json
 import uuid
-from typing import List
+from typing import AsyncIterator, List
 
 from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.v1.schemas.chat import (
@@ -15,7 +17,7 @@ from app.api.v1.schemas.chat import (
 )
 from app.core.security import limiter
 from app.db.database import get_db
-from app.services.ai_service import get_ai_response
+from app.services.ai_service import get_ai_response, stream_ai_response
 from app.config import settings
 
 
@@ -79,6 +81,46 @@ async def chat(
     )
 
 
+def _sse_event(event: str, data: dict) -> str:
+    """Format a single server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.post("/stream")
+@limiter.limit(f"{settings.rate_limit_per_minute}/minute")
+async def chat_stream(
+    request: Request,
+    chat_data: ChatRequest
+):
+    """
+    Send a message to the AI assistant and stream the reply as server-sent events.
+    
+    Events:
+    - **session**: `{"session_id": ...}`, sent first
+    - **token**: `{"content": ...}`, one per response chunk
+    - **done**: `{}`, sent when the response is complete
+    """
+    session_id = chat_data.session_id or str(uuid.uuid4())
+    
+    async def event_stream() -> AsyncIterator[str]:
+        yield _sse_event("session", {"session_id": session_id})
+        async for chunk in stream_ai_response(
+            message=chat_data.message,
+            session_id=session_id
+        ):
+            yield _sse_event("token", {"content": chunk})
+        yield _sse_event("done", {})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+
 @router.get("/suggestions", response_model=ChatSuggestionsResponse)
 async def get_suggestions():
     """
@@ -5,16 +5,22 @@ from fastapi import APIRouter, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.v1.schemas.contact import ContactCreate, ContactResponse
+from app.core.exceptions import TooManyRequestsException
 from app.core.security import limiter, get_client_ip
 from app.db.database import get_db
 from app.db.models import Contact
-from app.services.email_service import send_contact_notification
+from app.services.contact_guard import contact_fingerprint, get_contact_guard
+from app.services.email_outbox import enqueue_contact_email, get_email_outbox
+from app.services.email_service import is_email_configured
 from app.config import settings
 
 
 router = APIRouter()
 
 
+SUCCESS_MESSAGE = "Mesajınız başarıyla gönderildi. En kısa sürede size döneceğim."
+
+
 @router.post("", response_model=ContactResponse)
 @limiter.limit(f"{settings.rate_limit_per_minute}/minute")
 async def submit_contact(
@@ -25,6 +31,11 @@ async def submit_contact(
     """
     Submit a contact form message.
     
+    The notification email is queued in the same transaction as the
+    message and sent in the background. An identical resubmit (same email
+    and message) is acknowledged without being stored again; too many
+    messages from one email or IP are rejected with 429.
+    
     - **name**: Sender's name
     - **email**: Sender's email address
     - **subject**: Message subject (optional)
@@ -33,26 +44,40 @@ async def submit_contact(
     # Get client IP
     ip_address = get_client_ip(request)
     
+    # Suppress duplicates and floods before anything is written or sent
+    guard = get_contact_guard()
+    fingerprint = contact_fingerprint(contact_data.email, contact_data.message)
+    verdict = guard.check(fingerprint, contact_data.email, ip_address)
+    if verdict is None and await guard.seen_in_db(db, fingerprint):
+        verdict = "duplicate"
+    if verdict is None and not guard.record(fingerprint, contact_data.email, ip_address):
+        verdict = "duplicate"
+    if verdict == "flood":
+        raise TooManyRequestsException("Too many messages, please try again later")
+    if verdict == "duplicate":
+        return ContactResponse(success=True, message=SUCCESS_MESSAGE)
+    
     # Create contact record
     contact = Contact(
         name=contact_data.name,
         email=contact_data.email,
         subject=contact_data.subject,
         message=contact_data.message,
-        ip_address=ip_address
+        ip_address=ip_address,
+        fingerprint=fingerprint
     )
     
-    db.add(contact)
-    await db.commit()
-    
-    # Send email notification (non-blocking)
     try:
-        await send_contact_notification(contact_data)
-    except Exception as e:
-        # Log error but don't fail the request
-        print(f"Failed to send email notification: {e}")
+        db.add(contact)
+        if is_email_configured():
+            await db.flush()
+            enqueue_contact_email(db, contact)
+        else:
+            print("Email service not configured - skipping notification")
+        await db.commit()
+    except BaseException:
+        guard.release(fingerprint)
+        raise
+    get_email_outbox().notify()
     
-    return ContactResponse(
-        success=True,
-        message="Mesajınız başarıyla gönderildi. En kısa sürede size döneceğim."
-    )
+    return ContactResponse(success=True, message=SUCCESS_MESSAGE)
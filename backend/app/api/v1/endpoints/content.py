@@ -0,0 +1,66 @@
+"""
+Public Content Endpoint
+Cache-friendly, read-only access to site content and translations
+"""
+from fastapi import APIRouter, Request, Response
+
+from app.api.v1.endpoints.translations import validate_lang
+from app.config import settings
+from app.services.public_content import (
+    Representation,
+    choose_encoding,
+    get_public_content,
+    is_not_modified,
+)
+
+
+router = APIRouter()
+
+
+def conditional_response(request: Request, representation: Representation) -> Response:
+    """
+    Serve a representation, or 304 if the client's copy is current.
+
+    The body is picked from the pre-compressed variants by Accept-Encoding.
+    """
+    encoding = choose_encoding(request.headers.get("accept-encoding"))
+    headers = {
+        "ETag": representation.etag(encoding),
+        "Last-Modified": representation.last_modified,
+        "Cache-Control": (
+            f"public, max-age={settings.public_content_max_age_seconds}, "
+            f"stale-while-revalidate={settings.public_content_stale_seconds}"
+        ),
+        "Vary": "Accept-Encoding",
+    }
+
+    not_modified = is_not_modified(
+        representation,
+        encoding,
+        request.headers.get("if-none-match"),
+        request.headers.get("if-modified-since")
+    )
+    get_public_content().record(not_modified)
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(
+        content=representation.bodies[encoding],
+        media_type="application/json",
+        headers=headers
+    )
+
+
+@router.get("")
+async def get_content(request: Request):
+    """Get the site content (app/data/content.json)."""
+    return conditional_response(request, await get_public_content().content())
+
+
+@router.get("/translations/{lang}")
+async def get_public_translations(lang: str, request: Request):
+    """Get all translations for a language (tr or en)."""
+    validate_lang(lang)
+    return conditional_response(request, await get_public_content().translations(lang))
@@ -1,10 +1,25 @@
 """
 Health Check Endpoint
 """
-from fastapi import APIRouter
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends
 from pydantic import BaseModel
 
 from app.config import settings
+from app.core.security import verify_admin_api_key
+from app.services.ai_service import get_prompt_cache_stats
+from app.services.analytics_buffer import get_pageview_buffer
+from app.services.analytics_dimensions import get_dimension_cache
+from app.services.analytics_retention import get_retention_job
+from app.services.contact_guard import get_contact_guard
+from app.services.email_outbox import get_email_outbox
+from app.services.history import get_prompt_size_stats
+from app.services.public_content import get_public_content
+from app.services.response_cache import get_response_cache
+from app.services.session_store import get_session_store
+from app.services.stats_cache import get_stats_cache
+from app.services.translation_store import get_translation_store
 
 
 router = APIRouter()
@@ -31,3 +46,31 @@ async def health_check():
         version="1.0.0",
         environment=settings.app_env
     )
+
+
+class MetricsResponse(BaseModel):
+    """Internal cache and store metrics."""
+    metrics: Dict[str, Dict[str, Any]]
+
+
+@router.get("/metrics", response_model=MetricsResponse)
+async def get_metrics(
+    api_key: str = Depends(verify_admin_api_key)
+):
+    """
+    Get in-process cache and store metrics (Admin only).
+    """
+    return MetricsResponse(metrics={
+        "prompt_cache": get_prompt_cache_stats(),
+        "chat_sessions": get_session_store().stats(),
+        "response_cache": get_response_cache().stats(),
+        "prompt_sizes": get_prompt_size_stats(),
+        "pageview_buffer": get_pageview_buffer().stats(),
+        "stats_cache": get_stats_cache().stats(),
+        "analytics_dimensions": get_dimension_cache().stats(),
+        "analytics_retention": get_retention_job().stats(),
+        "email_outbox": get_email_outbox().stats(),
+        "contact_guard": get_contact_guard().stats(),
+        "translations": get_translation_store().stats(),
+        "public_content": get_public_content().stats()
+    })
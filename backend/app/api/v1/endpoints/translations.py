@@ -2,69 +2,68 @@
 Translation Files Endpoint
 Directly edit tr.json and en.json files
 """
-import json
-from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
-from fastapi import APIRouter, HTTPException, Depends
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi import APIRouter, HTTPException, Depends, Header, Response
 
-from app.api.v1.endpoints.admin import verify_admin_token
 from app.api.v1.schemas.admin import ContentResponse, ContentUpdateResponse
+from app.core.exceptions import BadRequestException, PreconditionFailedException
+from app.core.security import verify_admin_api_key
+from app.services.json_patch import JsonPatchError, apply_patch
+from app.services.translation_store import LANGUAGES, VersionConflictError, get_translation_store
 
 
 router = APIRouter()
 
-# Translation files paths
-FRONTEND_MESSAGES_DIR = Path(__file__).parent.parent.parent.parent.parent.parent / "frontend" / "messages"
-TR_FILE = FRONTEND_MESSAGES_DIR / "tr.json"
-EN_FILE = FRONTEND_MESSAGES_DIR / "en.json"
+
+def validate_lang(lang: str) -> str:
+    """Reject languages without a translation file."""
+    if lang not in LANGUAGES:
+        raise HTTPException(status_code=400, detail="Invalid language. Use 'tr' or 'en'.")
+    return lang
 
 
-def load_translations(lang: str) -> Dict[str, Any]:
-    """Load translation file."""
-    file_path = TR_FILE if lang == "tr" else EN_FILE
-    if file_path.exists():
-        with open(file_path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return {}
+def etag(version: str) -> str:
+    """Strong ETag for a translations version."""
+    return f'"{version}"'
 
 
-def save_translations(lang: str, data: Dict[str, Any]) -> None:
-    """Save translation file."""
-    file_path = TR_FILE if lang == "tr" else EN_FILE
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=4)
+def parse_if_match(if_match: Optional[str]) -> Optional[str]:
+    """Version required by an If-Match header, or None if any version will do."""
+    if if_match is None or if_match.strip() == "*":
+        return None
+    return if_match.strip().strip('"')
 
 
 @router.get("/{lang}", response_model=ContentResponse)
 async def get_translations(
     lang: str,
-    admin: dict = Depends(verify_admin_token)
+    response: Response,
+    api_key: str = Depends(verify_admin_api_key)
 ):
     """Get all translations for a language (tr or en)."""
-    if lang not in ["tr", "en"]:
-        raise HTTPException(status_code=400, detail="Invalid language. Use 'tr' or 'en'.")
-    
-    content = load_translations(lang)
-    return ContentResponse(content=content)
+    validate_lang(lang)
+
+    content, version = await get_translation_store().get(lang)
+    response.headers["ETag"] = etag(version)
+    return ContentResponse(content=content, version=version)
 
 
 @router.put("/{lang}", response_model=ContentUpdateResponse)
 async def update_translations(
     lang: str,
     data: dict,
-    admin: dict = Depends(verify_admin_token)
+    api_key: str = Depends(verify_admin_api_key)
 ):
     """Update entire translations file."""
-    if lang not in ["tr", "en"]:
-        raise HTTPException(status_code=400, detail="Invalid language. Use 'tr' or 'en'.")
-    
-    save_translations(lang, data)
-    
+    validate_lang(lang)
+
+    version = await get_translation_store().update(lang, lambda current: data)
+
     return ContentUpdateResponse(
         success=True,
-        message=f"'{lang}.json' güncellendi"
+        message=f"'{lang}.json' güncellendi",
+        version=version
     )
 
 
@@ -73,19 +72,20 @@ async def update_section(
     lang: str,
     section: str,
     data: dict,
-    admin: dict = Depends(verify_admin_token)
+    api_key: str = Depends(verify_admin_api_key)
 ):
     """Update a specific section in translations."""
-    if lang not in ["tr", "en"]:
-        raise HTTPException(status_code=400, detail="Invalid language. Use 'tr' or 'en'.")
-    
-    translations = load_translations(lang)
-    translations[section] = data
-    save_translations(lang, translations)
-    
+    validate_lang(lang)
+
+    def set_section(translations: Dict[str, Any]) -> None:
+        translations[section] = data
+
+    version = await get_translation_store().update(lang, set_section)
+
     return ContentUpdateResponse(
         success=True,
-        message=f"'{lang}.json' - '{section}' bölümü güncellendi"
+        message=f"'{lang}.json' - '{section}' bölümü güncellendi",
+        version=version
     )
 
 
@@ -93,29 +93,66 @@ async def update_section(
 async def update_field(
     lang: str,
     request: dict,
-    admin: dict = Depends(verify_admin_token)
+    api_key: str = Depends(verify_admin_api_key)
 ):
     """Update a nested field using dot notation path."""
-    if lang not in ["tr", "en"]:
-        raise HTTPException(status_code=400, detail="Invalid language. Use 'tr' or 'en'.")
-    
+    validate_lang(lang)
+
     path = request.get("path", "")  # e.g., "hero.title"
     value = request.get("value", "")
-    
-    translations = load_translations(lang)
-    
-    # Navigate to nested field using path
-    keys = path.split(".")
-    current = translations
-    for key in keys[:-1]:
-        if key not in current:
-            current[key] = {}
-        current = current[key]
-    
-    current[keys[-1]] = value
-    save_translations(lang, translations)
-    
+
+    try:
+        version = await get_translation_store().update(
+            lang,
+            lambda translations: apply_patch(translations, [{"path": path, "value": value}])
+        )
+    except JsonPatchError as e:
+        raise BadRequestException(str(e))
+
+    return ContentUpdateResponse(
+        success=True,
+        message=f"'{lang}.json' - '{path}' güncellendi",
+        version=version
+    )
+
+
+@router.patch("/{lang}", response_model=ContentUpdateResponse)
+async def patch_translations(
+    lang: str,
+    operations: List[Dict[str, Any]],
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    api_key: str = Depends(verify_admin_api_key)
+):
+    """
+    Apply several changes at once and save the file a single time.
+
+    The body is an RFC 6902 JSON Patch (``[{"op": "replace", "path":
+    "/hero/title", "value": "..."}]``) or a list of dot-path field updates
+    (``[{"path": "hero.title", "value": "..."}]``); both forms may be mixed.
+    Either every operation is applied or none is. Send the ETag from GET
+    as ``If-Match`` to fail with 412 instead of overwriting someone
+    else's changes.
+    """
+    validate_lang(lang)
+
+    try:
+        version = await get_translation_store().update(
+            lang,
+            lambda translations: apply_patch(translations, operations),
+            expected_version=parse_if_match(if_match)
+        )
+    except JsonPatchError as e:
+        raise BadRequestException(str(e))
+    except VersionConflictError as e:
+        raise PreconditionFailedException(
+            "Translations were changed by someone else; reload and retry",
+            headers={"ETag": etag(e.current_version)}
+        )
+
+    response.headers["ETag"] = etag(version)
     return ContentUpdateResponse(
         success=True,
-        message=f"'{lang}.json' - '{path}' güncellendi"
+        message=f"'{lang}.json' - {len(operations)} değişiklik uygulandı",
+        version=version
     )
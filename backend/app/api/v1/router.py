@@ -3,7 +3,7 @@ API v1 Router - Aggregates all endpoint routers
 """
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import health, contact, chat, analytics
+from app.api.v1.endpoints import health, contact, chat, analytics, translations, content
 
 api_router = APIRouter()
 
@@ -12,5 +12,7 @@ api_router.include_router(health.router, prefix="/health", tags=["Health"])
 api_router.include_router(contact.router, prefix="/contact", tags=["Contact"])
 api_router.include_router(chat.router, prefix="/chat", tags=["AI Chat"])
 api_router.include_router(analytics.router, prefix="/analytics", tags=["Analytics"])
+api_router.include_router(translations.router, prefix="/translations", tags=["Translations"])
+api_router.include_router(content.router, prefix="/content", tags=["Content"])
 
 
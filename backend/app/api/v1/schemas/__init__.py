@@ -10,9 +10,16 @@ from app.api.v1.schemas.chat import (
 from app.api.v1.schemas.analytics import (
     PageViewCreate,
     PageViewResponse,
+    PageViewBatchCreate,
+    PageViewBatchError,
+    PageViewBatchResponse,
     PageStats,
     ProjectStats,
-    AnalyticsStatsResponse
+    BrowserStats,
+    ReferrerStats,
+    AnalyticsStatsResponse,
+    TimeSeriesPoint,
+    TimeSeriesResponse
 )
 
 __all__ = [
@@ -26,7 +33,14 @@ __all__ = [
     "ChatSuggestionsResponse",
     "PageViewCreate",
     "PageViewResponse",
+    "PageViewBatchCreate",
+    "PageViewBatchError",
+    "PageViewBatchResponse",
     "PageStats",
     "ProjectStats",
-    "AnalyticsStatsResponse"
+    "BrowserStats",
+    "ReferrerStats",
+    "AnalyticsStatsResponse",
+    "TimeSeriesPoint",
+    "TimeSeriesResponse"
 ]
@@ -47,10 +47,12 @@ class ArrayItemDeleteRequest(BaseModel):
 class ContentResponse(BaseModel):
     """Content response."""
     content: Dict[str, Any]
+    version: Optional[str] = None
 
 
 class ContentUpdateResponse(BaseModel):
     """Content update response."""
     success: bool
     message: str
+    version: Optional[str] = None
 
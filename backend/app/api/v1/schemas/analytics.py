@@ -2,18 +2,20 @@
 Analytics Pydantic Schemas
 """
 from datetime import datetime
-from typing import Optional, List
+from typing import Any, Literal, Optional, List
 
 from pydantic import BaseModel, Field
 
+from app.config import settings
+
 
 class PageViewCreate(BaseModel):
     """Schema for recording a page view."""
     
-    page_path: str = Field(..., description="Page path (e.g., /projects/sentiment)")
-    project_slug: Optional[str] = Field(None, description="Project slug if applicable")
-    visitor_id: Optional[str] = Field(None, description="Anonymous visitor ID")
-    referrer: Optional[str] = Field(None, description="Referrer URL")
+    page_path: str = Field(..., max_length=255, description="Page path (e.g., /projects/sentiment)")
+    project_slug: Optional[str] = Field(None, max_length=100, description="Project slug if applicable")
+    visitor_id: Optional[str] = Field(None, max_length=100, description="Anonymous visitor ID")
+    referrer: Optional[str] = Field(None, max_length=2048, description="Referrer URL")
 
 
 class PageViewResponse(BaseModel):
@@ -23,6 +25,35 @@ class PageViewResponse(BaseModel):
     message: str
 
 
+class PageViewBatchCreate(BaseModel):
+    """Schema for recording many page views in one request."""
+    
+    # Items are validated one by one so errors (including non-objects) can
+    # be reported per item
+    items: List[Any] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.analytics_batch_max_items,
+        description="Page views (PageViewCreate)"
+    )
+
+
+class PageViewBatchError(BaseModel):
+    """Validation errors for a single batch item."""
+    
+    index: int
+    errors: List[str]
+
+
+class PageViewBatchResponse(BaseModel):
+    """Schema for batch page view response."""
+    
+    success: bool
+    accepted: int
+    rejected: int
+    errors: List[PageViewBatchError] = []
+
+
 class PageStats(BaseModel):
     """Statistics for a single page."""
     
@@ -37,6 +68,20 @@ class ProjectStats(BaseModel):
     view_count: int
 
 
+class BrowserStats(BaseModel):
+    """Statistics for a browser."""
+    
+    browser: str
+    view_count: int
+
+
+class ReferrerStats(BaseModel):
+    """Statistics for a referrer host."""
+    
+    referrer_host: str
+    view_count: int
+
+
 class AnalyticsStatsResponse(BaseModel):
     """Schema for analytics stats response."""
     
@@ -44,4 +89,24 @@ class AnalyticsStatsResponse(BaseModel):
     unique_visitors: int
     top_pages: List[PageStats]
     top_projects: List[ProjectStats]
+    top_browsers: List[BrowserStats] = []
+    top_referrers: List[ReferrerStats] = []
+    period_days: int
+
+
+class TimeSeriesPoint(BaseModel):
+    """Views and unique visitors for one time bucket."""
+    
+    bucket: datetime
+    views: int
+    unique_visitors: int
+
+
+class TimeSeriesResponse(BaseModel):
+    """Schema for analytics time series response."""
+    
+    bucket: Literal["hour", "day", "week"]
     period_days: int
+    page_path: Optional[str] = None
+    project_slug: Optional[str] = None
+    points: List[TimeSeriesPoint]
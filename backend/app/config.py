@@ -37,17 +37,95 @@ class Settings(BaseSettings):
     
     # Database
     database_url: str = "sqlite+aiosqlite:///./portfolio.db"
+    database_echo: bool = False
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
+    database_pool_timeout_seconds: float = 30.0
+    database_pool_recycle_seconds: int = 1800
+    database_pool_pre_ping: bool = True
+    # PostgreSQL prepared statement cache per connection (0 behind PgBouncer)
+    database_statement_cache_size: int = 100
+    
+    # Database - SQLite profile (applied to every new connection)
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_cache_size_kb: int = 65536
+    sqlite_mmap_size_bytes: int = 268435456
+    sqlite_temp_store: str = "MEMORY"
     
     # AI - Groq
     groq_api_key: str = ""
+    groq_base_url: str = ""
+    groq_model: str = "llama-3.1-8b-instant"
+    groq_timeout_seconds: float = 30.0
+    groq_max_retries: int = 1
+    groq_max_concurrency: int = 8
+    
+    # AI - Chat sessions
+    chat_max_sessions: int = 1000
+    chat_session_ttl_seconds: int = 3600
+    chat_history_max_messages: int = 20
+    chat_history_token_budget: int = 1200
+    chat_session_backend: str = "memory"  # "memory" or "database"
+    chat_session_read_timeout_seconds: float = 0.2
+    chat_session_cache_ttl_seconds: float = 0
+    chat_session_flush_interval_seconds: float = 0.5
+    chat_session_flush_batch_size: int = 50
+    
+    # AI - Prompt assembly
+    prompt_retrieval_enabled: bool = True
+    prompt_retrieval_top_k: int = 6
+    prompt_token_budget: int = 2500
+    
+    # AI - Response cache (first-turn questions only)
+    response_cache_enabled: bool = True
+    response_cache_max_entries: int = 256
+    response_cache_ttl_seconds: int = 86400
+    response_cache_similarity: float = 0.0  # 0 disables similarity lookups
     
     # Email - Resend
     resend_api_key: str = ""
+    resend_api_url: str = ""
     contact_email: str = ""
+    email_outbox_batch_size: int = 20
+    email_outbox_poll_interval_seconds: float = 5.0
+    email_outbox_max_attempts: int = 8
+    email_outbox_backoff_base_seconds: float = 30.0
+    email_outbox_backoff_max_seconds: float = 3600.0
+    
+    # Contact form duplicate and flood detection
+    contact_duplicate_window_seconds: int = 86400
+    contact_flood_window_seconds: int = 600
+    contact_flood_max_per_email: int = 3
+    contact_flood_max_per_ip: int = 5
+    contact_guard_max_entries: int = 10000
+    
+    # Translations (defaults to the frontend's messages directory)
+    translations_dir: str = ""
+    
+    # Public content API (browser/CDN cache lifetime)
+    public_content_max_age_seconds: int = 86400
+    public_content_stale_seconds: int = 604800
+    
+    # Analytics ingestion
+    analytics_flush_batch_size: int = 200
+    analytics_flush_interval_seconds: float = 1.0
+    analytics_buffer_max_size: int = 10000
+    analytics_flush_max_attempts: int = 3
+    analytics_batch_max_items: int = 100
+    analytics_stats_cache_ttl_seconds: int = 30
+    analytics_export_page_size: int = 5000
+    analytics_retention_days: int = 0
+    analytics_retention_interval_seconds: float = 3600
+    analytics_retention_batch_size: int = 2000
     
     # Rate Limiting
     rate_limit_per_minute: int = 30
     
+    # Admin API Key (for protected endpoints)
+    admin_api_key: str = ""
+    
     @property
     def is_production(self) -> bool:
         """Check if running in production."""
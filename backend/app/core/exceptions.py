@@ -1,6 +1,8 @@
 """
 Custom Exceptions
 """
+from typing import Dict, Optional
+
 from fastapi import HTTPException
 
 
@@ -28,6 +30,18 @@ class ForbiddenException(HTTPException):
         super().__init__(status_code=403, detail=detail)
 
 
+class PreconditionFailedException(HTTPException):
+    """Precondition (e.g. If-Match) failed."""
+    def __init__(self, detail: str = "Precondition failed", headers: Optional[Dict[str, str]] = None):
+        super().__init__(status_code=412, detail=detail, headers=headers)
+
+
+class TooManyRequestsException(HTTPException):
+    """Too many requests."""
+    def __init__(self, detail: str = "Too many requests"):
+        super().__init__(status_code=429, detail=detail)
+
+
 class ServiceUnavailableException(HTTPException):
     """Service temporarily unavailable."""
     def __init__(self, detail: str = "Service temporarily unavailable"):
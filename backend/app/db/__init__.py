@@ -1,5 +1,32 @@
 """Database Package"""
 from app.db.database import Base, get_db, create_tables
-from app.db.models import Contact, PageView, ChatSession
+from app.db.models import (
+    Contact,
+    EmailOutbox,
+    UserAgent,
+    ReferrerHost,
+    PageView,
+    PageViewHourly,
+    PageViewDaily,
+    PageViewUserAgentDaily,
+    PageViewReferrerDaily,
+    VisitorSketch,
+    ChatSession
+)
 
-__all__ = ["Base", "get_db", "create_tables", "Contact", "PageView", "ChatSession"]
+__all__ = [
+    "Base",
+    "get_db",
+    "create_tables",
+    "Contact",
+    "EmailOutbox",
+    "UserAgent",
+    "ReferrerHost",
+    "PageView",
+    "PageViewHourly",
+    "PageViewDaily",
+    "PageViewUserAgentDaily",
+    "PageViewReferrerDaily",
+    "VisitorSketch",
+    "ChatSession"
+]
@@ -1,18 +1,89 @@
 """
 Database Connection and Session Management
 """
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.config import settings
 
 
+def _database_url(database_url: str) -> URL:
+    """Parse the database URL, using the asyncpg driver for plain PostgreSQL URLs."""
+    url = make_url(database_url.replace("postgres://", "postgresql://", 1))
+    if url.drivername == "postgresql":
+        url = url.set(drivername="postgresql+asyncpg")
+    if url.drivername == "postgresql+asyncpg":
+        # SQLAlchemy's own prepared statement cache; 0 disables it (PgBouncer)
+        url = url.update_query_dict({
+            "prepared_statement_cache_size": str(settings.database_statement_cache_size)
+        })
+    return url
+
+
+def _engine_options(url: URL) -> dict:
+    """Explicit pool sizing; in-memory SQLite uses a single static connection."""
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return {}
+    options = {
+        # SQLAlchemy 2.0 defaults file-backed aiosqlite to NullPool, which
+        # rejects the sizing arguments below; 2.1 already uses this pool
+        "poolclass": AsyncAdaptedQueuePool,
+        "pool_size": settings.database_pool_size,
+        "max_overflow": settings.database_max_overflow,
+        "pool_timeout": settings.database_pool_timeout_seconds,
+        "pool_recycle": settings.database_pool_recycle_seconds,
+        "pool_pre_ping": settings.database_pool_pre_ping,
+    }
+    if url.drivername == "postgresql+asyncpg":
+        options["connect_args"] = {
+            "statement_cache_size": settings.database_statement_cache_size,
+        }
+    return options
+
+
+def _sqlite_pragmas() -> list:
+    """PRAGMA statements of the configured SQLite performance profile."""
+    return [
+        # Lets retention return freed pages with incremental_vacuum; only
+        # takes effect on a new database (existing ones need a full VACUUM)
+        "PRAGMA auto_vacuum = INCREMENTAL",
+        f"PRAGMA journal_mode = {settings.sqlite_journal_mode}",
+        f"PRAGMA synchronous = {settings.sqlite_synchronous}",
+        f"PRAGMA busy_timeout = {int(settings.sqlite_busy_timeout_ms)}",
+        # Negative values are KiB rather than pages
+        f"PRAGMA cache_size = -{int(settings.sqlite_cache_size_kb)}",
+        f"PRAGMA mmap_size = {int(settings.sqlite_mmap_size_bytes)}",
+        f"PRAGMA temp_store = {settings.sqlite_temp_store}",
+    ]
+
+
+def _apply_sqlite_profile(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    for pragma in _sqlite_pragmas():
+        cursor.execute(pragma)
+    cursor.close()
+
+
+def create_engine(database_url: str) -> AsyncEngine:
+    """Create an async engine with the configured pool and SQLite profile."""
+    url = _database_url(database_url)
+    new_engine = create_async_engine(
+        url,
+        echo=settings.database_echo,
+        future=True,
+        **_engine_options(url)
+    )
+    if new_engine.dialect.name == "sqlite":
+        event.listen(new_engine.sync_engine, "connect", _apply_sqlite_profile)
+    return new_engine
+
+
 # Create async engine
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.debug,
-    future=True
-)
+engine = create_engine(settings.database_url)
 
 # Session factory
 async_session_maker = async_sessionmaker(
@@ -24,13 +95,36 @@ async_session_maker = async_sessionmaker(
 )
 
 
+def get_engine() -> AsyncEngine:
+    """Get the engine sessions are currently bound to."""
+    return engine
+
+
+def use_engine(new_engine: AsyncEngine) -> None:
+    """Bind the module engine and session factory to another database (e.g. in tests)."""
+    global engine
+    engine = new_engine
+    async_session_maker.configure(bind=new_engine)
+
+
 class Base(DeclarativeBase):
     """Base class for all database models."""
     pass
 
 
+def dialect_insert(model):
+    """INSERT construct for the engine's dialect (supports ON CONFLICT)."""
+    dialect = postgresql if engine.dialect.name == "postgresql" else sqlite
+    return dialect.insert(model)
+
+
 async def create_tables():
-    """Create all database tables."""
+    """
+    Create missing database tables.
+
+    Existing tables are not altered; schema changes to them are Alembic
+    migrations (``alembic upgrade head``).
+    """
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
@@ -4,7 +4,10 @@ SQLAlchemy Database Models
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import Boolean, DateTime, Integer, String, Text, JSON, func
+from sqlalchemy import (
+    Boolean, DateTime, ForeignKey, Index, Integer, LargeBinary, String, Text, JSON,
+    UniqueConstraint, func
+)
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.database import Base
@@ -14,6 +17,11 @@ class Contact(Base):
     """Contact form submissions."""
     
     __tablename__ = "contacts"
+    __table_args__ = (
+        Index("ix_contacts_created_at", "created_at"),
+        Index("ix_contacts_is_read_created_at", "is_read", "created_at"),
+        Index("ix_contacts_fingerprint", "fingerprint"),
+    )
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(100), nullable=False)
@@ -21,6 +29,8 @@ class Contact(Base):
     subject: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
     message: Mapped[str] = mapped_column(Text, nullable=False)
     ip_address: Mapped[Optional[str]] = mapped_column(String(45), nullable=True)
+    # Hash of email and normalized message, for duplicate detection
+    fingerprint: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
     is_read: Mapped[bool] = mapped_column(Boolean, default=False)
     created_at: Mapped[datetime] = mapped_column(
         DateTime, 
@@ -29,15 +39,76 @@ class Contact(Base):
     )
 
 
+class EmailOutbox(Base):
+    """Notification emails waiting to be sent (written with their contact)."""
+    
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        Index("ix_email_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+    
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    contact_id: Mapped[int] = mapped_column(Integer, ForeignKey("contacts.id"), nullable=False)
+    # pending -> sent, or dead after the last failed attempt
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="pending")
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        server_default=func.now(),
+        nullable=False
+    )
+    sent_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+
+class UserAgent(Base):
+    """Distinct User-Agent strings, parsed once."""
+    
+    __tablename__ = "user_agents"
+    
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    value: Mapped[str] = mapped_column(String(512), unique=True, nullable=False)
+    browser: Mapped[str] = mapped_column(String(50), nullable=False)
+    os: Mapped[str] = mapped_column(String(50), nullable=False)
+    device: Mapped[str] = mapped_column(String(20), nullable=False)
+
+
+class ReferrerHost(Base):
+    """Distinct referrer hosts."""
+    
+    __tablename__ = "referrer_hosts"
+    
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    host: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
+
+
 class PageView(Base):
     """Page view analytics."""
     
     __tablename__ = "page_views"
+    # Every stats query filters on a created_at range first
+    __table_args__ = (
+        Index("ix_page_views_created_at_page_path", "created_at", "page_path"),
+        Index("ix_page_views_created_at_project_slug", "created_at", "project_slug"),
+        Index("ix_page_views_created_at_visitor_id", "created_at", "visitor_id"),
+        Index(
+            "ix_page_views_created_at_dimensions",
+            "created_at", "user_agent_id", "referrer_host_id"
+        ),
+    )
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     page_path: Mapped[str] = mapped_column(String(255), nullable=False)
     project_slug: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
     visitor_id: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    user_agent_id: Mapped[Optional[int]] = mapped_column(
+        Integer, ForeignKey("user_agents.id"), nullable=True
+    )
+    referrer_host_id: Mapped[Optional[int]] = mapped_column(
+        Integer, ForeignKey("referrer_hosts.id"), nullable=True
+    )
+    # Legacy raw values; moved to the lookup tables by backfill_dimensions
     user_agent: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     referrer: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
     country: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
@@ -48,6 +119,71 @@ class PageView(Base):
     )
 
 
+class PageViewHourly(Base):
+    """Page views per hour, page and project (maintained at ingest)."""
+    
+    __tablename__ = "page_view_hourly"
+    __table_args__ = (UniqueConstraint("bucket", "page_path", "project_slug"),)
+    
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    bucket: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    page_path: Mapped[str] = mapped_column(String(255), nullable=False)
+    # Empty string instead of NULL so the unique constraint applies
+    project_slug: Mapped[str] = mapped_column(String(100), nullable=False, default="")
+    views: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class PageViewDaily(Base):
+    """Page views per day, page and project (maintained at ingest)."""
+    
+    __tablename__ = "page_view_daily"
+    __table_args__ = (UniqueConstraint("bucket", "page_path", "project_slug"),)
+    
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    bucket: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    page_path: Mapped[str] = mapped_column(String(255), nullable=False)
+    project_slug: Mapped[str] = mapped_column(String(100), nullable=False, default="")
+    views: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class PageViewUserAgentDaily(Base):
+    """Page views per day and user agent (maintained at ingest)."""
+    
+    __tablename__ = "page_view_user_agent_daily"
+    __table_args__ = (UniqueConstraint("bucket", "user_agent_id"),)
+    
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    bucket: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    user_agent_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("user_agents.id"), nullable=False
+    )
+    views: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class PageViewReferrerDaily(Base):
+    """Page views per day and referrer host (maintained at ingest)."""
+    
+    __tablename__ = "page_view_referrer_daily"
+    __table_args__ = (UniqueConstraint("bucket", "referrer_host_id"),)
+    
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    bucket: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    referrer_host_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("referrer_hosts.id"), nullable=False
+    )
+    views: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class VisitorSketch(Base):
+    """Per-day HyperLogLog sketch of distinct visitor IDs."""
+    
+    __tablename__ = "visitor_sketches"
+    
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    bucket: Mapped[datetime] = mapped_column(DateTime, unique=True, nullable=False)
+    registers: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+
 class ChatSession(Base):
     """AI chat sessions."""
     
@@ -55,7 +191,9 @@ class ChatSession(Base):
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     session_id: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
-    messages: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    # Running summary of turns trimmed from ``messages``
+    summary: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    messages: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime,
         server_default=func.now(),
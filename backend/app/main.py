@@ -11,7 +11,15 @@ from slowapi.errors import RateLimitExceeded
 from app.config import settings
 from app.api.v1.router import api_router
 from app.core.security import limiter
-from app.db.database import create_tables
+from app.db.database import async_session_maker, create_tables
+from app.services.ai_service import warm_up
+from app.services.analytics_buffer import get_pageview_buffer
+from app.services.analytics_dimensions import backfill_dimensions
+from app.services.analytics_retention import get_retention_job
+from app.services.analytics_rollups import backfill_dimension_rollups, backfill_rollups
+from app.services.contact_guard import get_contact_guard
+from app.services.email_outbox import get_email_outbox
+from app.services.session_store import get_session_store
 
 
 @asynccontextmanager
@@ -19,10 +27,31 @@ async def lifespan(app: FastAPI):
     """Application lifespan events."""
     # Startup
     await create_tables()
+    async with async_session_maker() as db:
+        backfilled = await backfill_rollups(db)
+        await db.commit()
+        await get_contact_guard().warm_up(db)
+    if backfilled:
+        print(f"📊 Rolled up {backfilled} existing page views")
+    encoded = await backfill_dimensions()
+    if encoded:
+        print(f"📊 Encoded user agents and referrers of {encoded} page views")
+    async with async_session_maker() as db:
+        if await backfill_dimension_rollups(db):
+            print("📊 Rolled up browsers and referrers of existing page views")
+        await db.commit()
+    warm_up()
+    get_pageview_buffer().start()
+    get_retention_job().start()
+    get_email_outbox().start()
     print(f"🚀 {settings.app_name} started")
     print(f"📚 API docs: http://{settings.host}:{settings.port}/docs")
     yield
     # Shutdown
+    await get_retention_job().close()
+    await get_email_outbox().close()
+    await get_pageview_buffer().close()
+    await get_session_store().close()
     print(f"👋 {settings.app_name} shutting down")
 
 
@@ -1,5 +1,5 @@
 """Services Package"""
-from app.services.email_service import send_contact_notification
+from app.services.email_outbox import enqueue_contact_email, get_email_outbox
 from app.services.ai_service import get_ai_response
 
-__all__ = ["send_contact_notification", "get_ai_response"]
+__all__ = ["enqueue_contact_email", "get_email_outbox", "get_ai_response"]
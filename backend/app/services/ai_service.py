@@ -1,37 +1,150 @@
 """
 AI Service - Groq Integration for Portfolio Assistant
-Uses Groq API with Llama 3.3 70B model
+Uses the async Groq API with Llama 3.1 8B model
 """
+import asyncio
+import hashlib
 import json
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
-from groq import Groq
+from groq import AsyncGroq
 
 from app.config import settings
+from app.services.history import fit_history, record_prompt_size
+from app.services.response_cache import get_response_cache
+from app.services.retrieval import BM25Index, assemble_context, chunk_knowledge_base
+from app.services.session_store import get_session_store
+from app.services.tokenizer import estimate_tokens
 
 
-# In-memory session storage (for production, use Redis or database)
-_sessions: Dict[str, List[Dict]] = {}
+NOT_CONFIGURED_MESSAGE = "AI asistan şu anda yapılandırılmamış. Lütfen daha sonra tekrar deneyin."
+ERROR_MESSAGE = "Üzgünüm, bir hata oluştu. Lütfen daha sonra tekrar deneyin."
 
 # Knowledge base cache
 _knowledge_base: Optional[Dict] = None
+_knowledge_base_version: Optional[str] = None
+
+# System prompt cache, keyed by (knowledge base version, variant)
+_prompt_cache: Dict[Tuple[str, str], str] = {}
+_prompt_cache_stats: Dict[str, int] = {"hits": 0, "misses": 0}
+
+# Retrieval index, keyed by knowledge base version
+_retrieval_index: Optional[Tuple[str, BM25Index]] = None
+
+# Placeholder for retrieved knowledge in the retrieval prompt variant
+CONTEXT_SLOT = "<<RETRIEVED_CONTEXT>>"
 
 # Groq client
-_client: Optional[Groq] = None
+_client: Optional[AsyncGroq] = None
+
+# Limits concurrent upstream completions per worker
+_llm_semaphore: Optional[asyncio.Semaphore] = None
 
 
-def get_client() -> Groq:
-    """Get or create Groq client."""
+def get_client() -> AsyncGroq:
+    """Get or create async Groq client."""
     global _client
     if _client is None:
-        _client = Groq(api_key=settings.groq_api_key)
+        _client = AsyncGroq(
+            api_key=settings.groq_api_key,
+            base_url=settings.groq_base_url or None,
+            timeout=settings.groq_timeout_seconds,
+            max_retries=settings.groq_max_retries,
+        )
     return _client
 
 
+def get_llm_semaphore() -> asyncio.Semaphore:
+    """Get or create the semaphore bounding in-flight completions."""
+    global _llm_semaphore
+    if _llm_semaphore is None:
+        _llm_semaphore = asyncio.Semaphore(settings.groq_max_concurrency)
+    return _llm_semaphore
+
+
+def _completion_params(messages: List[Dict]) -> Dict:
+    """Common arguments for chat.completions.create."""
+    return {
+        "model": settings.groq_model,
+        "messages": messages,
+        "temperature": 0.5,
+        "max_tokens": 1024,
+        "timeout": settings.groq_timeout_seconds,
+    }
+
+
+async def _acquire_slot() -> asyncio.Semaphore:
+    """
+    Wait for a free upstream slot, at most the configured timeout.
+    
+    Raises:
+        asyncio.TimeoutError: If every slot stays busy for that long
+    """
+    semaphore = get_llm_semaphore()
+    await asyncio.wait_for(semaphore.acquire(), settings.groq_timeout_seconds)
+    return semaphore
+
+
+async def create_completion(messages: List[Dict]):
+    """
+    Run a chat completion without blocking the event loop.
+    
+    Waits for a free upstream slot; the configured timeout covers the
+    whole turn, queueing included, so a slow provider cannot pile up
+    requests.
+    
+    Args:
+        messages: Chat messages for the model
+        
+    Returns:
+        Groq chat completion
+        
+    Raises:
+        asyncio.TimeoutError: If the turn takes longer than the timeout
+    """
+    client = get_client()
+    
+    async def complete():
+        semaphore = await _acquire_slot()
+        try:
+            return await client.chat.completions.create(**_completion_params(messages))
+        finally:
+            semaphore.release()
+    
+    return await asyncio.wait_for(complete(), settings.groq_timeout_seconds)
+
+
+async def stream_completion(messages: List[Dict]) -> AsyncIterator[str]:
+    """
+    Stream a chat completion, yielding text deltas.
+    
+    Waiting for a slot is bounded by the configured timeout; the slot is
+    then held until the stream is exhausted or closed.
+    """
+    client = get_client()
+    semaphore = await _acquire_slot()
+    try:
+        stream = await client.chat.completions.create(
+            **_completion_params(messages),
+            stream=True,
+        )
+        try:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+        finally:
+            await stream.close()
+    finally:
+        semaphore.release()
+
+
 def load_knowledge_base() -> Dict:
     """Load knowledge base from JSON file."""
-    global _knowledge_base
+    global _knowledge_base, _knowledge_base_version
     
     if _knowledge_base is not None:
         return _knowledge_base
@@ -55,11 +168,109 @@ def load_knowledge_base() -> Dict:
             "highlights": []
         }
     
+    _knowledge_base_version = hashlib.sha256(
+        json.dumps(_knowledge_base, sort_keys=True).encode("utf-8")
+    ).hexdigest()[:16]
+    
     return _knowledge_base
 
 
-def get_system_prompt() -> str:
-    """Generate system prompt with knowledge base."""
+def get_knowledge_base_version() -> str:
+    """Get a content hash identifying the loaded knowledge base."""
+    load_knowledge_base()
+    return _knowledge_base_version
+
+
+def reload_knowledge_base() -> Dict:
+    """Drop the cached knowledge base and prompts, then load it again."""
+    global _knowledge_base, _knowledge_base_version
+    _knowledge_base = None
+    _knowledge_base_version = None
+    invalidate_prompt_cache()
+    get_response_cache().clear()
+    return load_knowledge_base()
+
+
+def invalidate_prompt_cache() -> None:
+    """Clear all cached system prompts."""
+    _prompt_cache.clear()
+
+
+def get_prompt_cache_stats() -> Dict[str, int]:
+    """Get system prompt cache hit/miss counters."""
+    return {**_prompt_cache_stats, "size": len(_prompt_cache)}
+
+
+def _get_cached_prompt(mode: str) -> str:
+    """
+    Get a system prompt variant, building it at most once per knowledge
+    base version.
+    """
+    version = get_knowledge_base_version()
+    key = (version, mode)
+    
+    prompt = _prompt_cache.get(key)
+    if prompt is not None:
+        _prompt_cache_stats["hits"] += 1
+        return prompt
+    
+    _prompt_cache_stats["misses"] += 1
+    prompt = _build_system_prompt(retrieval=(mode == "retrieval"))
+    
+    # Prompts for earlier versions are never needed again
+    for stale in [k for k in _prompt_cache if k[0] != version]:
+        del _prompt_cache[stale]
+    _prompt_cache[key] = prompt
+    return prompt
+
+
+def get_retrieval_index() -> BM25Index:
+    """Get the BM25 index for the loaded knowledge base version."""
+    global _retrieval_index
+    version = get_knowledge_base_version()
+    if _retrieval_index is None or _retrieval_index[0] != version:
+        _retrieval_index = (version, BM25Index(chunk_knowledge_base(load_knowledge_base())))
+    return _retrieval_index[1]
+
+
+def get_system_prompt(query: Optional[str] = None) -> str:
+    """
+    Get the system prompt.
+    
+    With retrieval enabled and a query given, only the knowledge base
+    chunks most relevant to the query are included, within the configured
+    token budget. Otherwise the whole knowledge base is inlined.
+    
+    Args:
+        query: Text to retrieve relevant knowledge for
+        
+    Returns:
+        System prompt text
+    """
+    if query is None or not settings.prompt_retrieval_enabled:
+        return _get_cached_prompt("full")
+    
+    base = _get_cached_prompt("retrieval")
+    chunks = get_retrieval_index().search(query, settings.prompt_retrieval_top_k)
+    budget = settings.prompt_token_budget - estimate_tokens(base)
+    context = assemble_context(chunks, budget)
+    return base.replace(CONTEXT_SLOT, context or "-")
+
+
+def warm_up() -> None:
+    """Build the knowledge base, prompts and retrieval index ahead of traffic."""
+    _get_cached_prompt("full")
+    _get_cached_prompt("retrieval")
+    get_retrieval_index()
+
+
+def _build_system_prompt(retrieval: bool = False) -> str:
+    """
+    Generate system prompt with knowledge base.
+    
+    With ``retrieval`` set, detailed entries are left out and CONTEXT_SLOT
+    marks where the per-question chunks go.
+    """
     kb = load_knowledge_base()
     
     # Format projects with GitHub links
@@ -98,8 +309,25 @@ def get_system_prompt() -> str:
     
     about = kb.get('about', {})
     
-    from datetime import datetime
-    current_date = datetime.now().strftime("%d %B %Y")
+    if retrieval:
+        project_names = ', '.join(p['name'] for p in kb.get('projects', []))
+        details_text = f"""**Projeler ({len(kb.get('projects', []))} adet):** {project_names}
+
+**Soruyla İlgili Detaylar:**
+{CONTEXT_SLOT}
+"""
+    else:
+        details_text = f"""**Projeler ({len(kb.get('projects', []))} adet):**
+{projects_text}
+
+**Sertifikalar ({len(kb.get('certifications', []))} adet):**
+{certs_text}
+
+**Topluluk Aktiviteleri & Gönüllü Çalışmalar:**
+{community_text}
+
+**Üniversite Dersleri:** {', '.join(kb.get('courses', []))}
+"""
     
     return f"""Sen Duran Gezer'in portfolyo asistanısın. SADECE Duran hakkında soruları yanıtlarsın.
 
@@ -155,16 +383,7 @@ Kapsam dışı mesajlara SADECE şu formatta yanıt ver:
 - Framework'ler: {', '.join(skills.get('frameworks', []))}
 - Data: {', '.join(skills.get('data', []))}
 
-**Projeler ({len(kb.get('projects', []))} adet):**
-{projects_text}
-
-**Sertifikalar ({len(kb.get('certifications', []))} adet):**
-{certs_text}
-
-**Topluluk Aktiviteleri & Gönüllü Çalışmalar:**
-{community_text}
-
-**Üniversite Dersleri:** {', '.join(kb.get('courses', []))}
+{details_text}
 
 **Mühendislik Felsefesi:**
 {principles_text}
@@ -200,6 +419,53 @@ Ziyaretçinin Duran hakkındaki sorusunu yanıtla. Kapsam dışı HER ŞEYİ kib
 """
 
 
+def _build_messages(message: str, history: List[Dict], summary: str = "") -> List[Dict]:
+    """Build the message list for the Groq API."""
+    # Follow-ups like "tell me more" need the previous question's context
+    previous = [m["content"] for m in history if m["role"] == "user"][-1:]
+    query = " ".join(previous + [message])
+    
+    messages = [
+        {"role": "system", "content": get_system_prompt(query)}
+    ]
+    
+    # Add conversation history within the token budget, older turns summarized
+    summary, recent = fit_history(history, settings.chat_history_token_budget, summary)
+    if summary:
+        messages.append({
+            "role": "system",
+            "content": f"Önceki konuşmanın özeti:\n{summary}"
+        })
+    for msg in recent:
+        messages.append({
+            "role": msg["role"],
+            "content": msg["content"]
+        })
+    
+    # Add current user message
+    messages.append({"role": "user", "content": message})
+    
+    record_prompt_size(
+        sum(estimate_tokens(m["content"]) for m in messages),
+        summarized=bool(summary)
+    )
+    return messages
+
+
+def _get_cached_answer(message: str, history: List[Dict]) -> Optional[str]:
+    """Look up a cached answer; only first-turn questions are cacheable."""
+    if history or not settings.response_cache_enabled:
+        return None
+    return get_response_cache().get(message, get_knowledge_base_version())
+
+
+def _cache_answer(message: str, history: List[Dict], answer: str) -> None:
+    """Cache the answer to a first-turn question."""
+    if history or not settings.response_cache_enabled:
+        return
+    get_response_cache().set(message, get_knowledge_base_version(), answer)
+
+
 async def get_ai_response(message: str, session_id: str) -> str:
     """
     Get AI response for a chat message.
@@ -212,51 +478,79 @@ async def get_ai_response(message: str, session_id: str) -> str:
         AI assistant's response
     """
     if not settings.groq_api_key:
-        return "AI asistan şu anda yapılandırılmamış. Lütfen daha sonra tekrar deneyin."
+        return NOT_CONFIGURED_MESSAGE
     
     try:
-        client = get_client()
-        
-        # Get or create session history
-        if session_id not in _sessions:
-            _sessions[session_id] = []
-        
-        history = _sessions[session_id]
-        
-        # Build messages for Groq API
-        system_prompt = get_system_prompt()
+        store = get_session_store()
+        summary, history = await store.get_session(session_id)
         
-        messages = [
-            {"role": "system", "content": system_prompt}
-        ]
-        
-        # Add conversation history (last 10 messages)
-        for msg in history[-10:]:
-            messages.append({
-                "role": msg["role"],
-                "content": msg["content"]
-            })
-        
-        # Add current user message
-        messages.append({"role": "user", "content": message})
-        
-        # Generate response using Groq API
-        response = client.chat.completions.create(
-            model="llama-3.1-8b-instant",
-            messages=messages,
-            temperature=0.5,
-            max_tokens=1024,
-        )
-        
-        ai_response = response.choices[0].message.content.strip()
+        ai_response = _get_cached_answer(message, history)
+        if ai_response is None:
+            # Generate response using Groq API
+            messages = _build_messages(message, history, summary)
+            response = await create_completion(messages)
+            ai_response = response.choices[0].message.content.strip()
+            _cache_answer(message, history, ai_response)
         
         # Update session history
-        history.append({"role": "user", "content": message})
-        history.append({"role": "assistant", "content": ai_response})
-        _sessions[session_id] = history
+        await store.append(session_id, [
+            {"role": "user", "content": message},
+            {"role": "assistant", "content": ai_response}
+        ])
         
         return ai_response
         
     except Exception as e:
         print(f"AI service error: {e}")
-        return "Üzgünüm, bir hata oluştu. Lütfen daha sonra tekrar deneyin."
+        return ERROR_MESSAGE
+
+
+async def stream_ai_response(message: str, session_id: str) -> AsyncIterator[str]:
+    """
+    Stream AI response chunks for a chat message.
+    
+    Session history is updated once the stream finishes, fails or is
+    cancelled by the client, with whatever text was produced so far.
+    
+    Args:
+        message: User's message
+        session_id: Session ID for context
+        
+    Yields:
+        Response text chunks as they arrive from the model
+    """
+    if not settings.groq_api_key:
+        yield NOT_CONFIGURED_MESSAGE
+        return
+    
+    store = get_session_store()
+    summary, history = await store.get_session(session_id)
+    chunks: List[str] = []
+    
+    cached = _get_cached_answer(message, history)
+    if cached is not None:
+        await store.append(session_id, [
+            {"role": "user", "content": message},
+            {"role": "assistant", "content": cached}
+        ])
+        yield cached
+        return
+    
+    try:
+        messages = _build_messages(message, history, summary)
+        async for chunk in stream_completion(messages):
+            chunks.append(chunk)
+            yield chunk
+        _cache_answer(message, history, "".join(chunks).strip())
+    except Exception as e:
+        print(f"AI service error: {e}")
+        if not chunks:
+            yield ERROR_MESSAGE
+            return
+    finally:
+        ai_response = "".join(chunks).strip()
+        if ai_response:
+            await store.append(session_id, [
+                {"role": "user", "content": message},
+                {"role": "assistant", "content": ai_response}
+            ])
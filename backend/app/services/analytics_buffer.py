@@ -0,0 +1,222 @@
+"""
+Analytics Buffer - Batched page view ingestion
+"""
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.core.exceptions import ServiceUnavailableException
+from app.db.database import async_session_maker
+from app.db.models import PageView
+from app.services.analytics_dimensions import get_dimension_cache
+from app.services.analytics_rollups import apply_rollups
+from app.services.stats_cache import get_stats_cache
+
+
+logger = logging.getLogger(__name__)
+
+
+class PageViewBuffer:
+    """
+    In-process write buffer for page views.
+
+    Page views are accepted immediately and written in bulk, one
+    transaction per flush, when ``batch_size`` rows are waiting or every
+    ``flush_interval`` seconds. When ``max_size`` rows are waiting the
+    caller flushes inline, and if that fails the view is rejected.
+
+    A failed flush is retried as a whole up to ``max_attempts`` times
+    (the database may be briefly unavailable). After that the batch is
+    bisected into separate transactions so only the rows that fail on
+    their own are dropped.
+
+    Writes drop the stats cache at most once per its TTL; entries cached
+    before a write expire within the TTL anyway, so stats show new views
+    no later than ``ttl_seconds`` after they are written.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 200,
+        flush_interval: float = 1.0,
+        max_size: int = 10000,
+        max_attempts: int = 3
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_size = max_size
+        self.max_attempts = max_attempts
+
+        self._rows: List[Dict] = []
+        # Consecutive failed flushes of the rows at the front of the buffer
+        self._attempts = 0
+        self._lock = asyncio.Lock()
+        self._flush_event = asyncio.Event()
+        self._flusher: Optional[asyncio.Task] = None
+        self._stats = {
+            "accepted": 0,
+            "rejected": 0,
+            "written": 0,
+            "flushes": 0,
+            "flush_errors": 0,
+            "dropped": 0,
+        }
+
+    async def add(self, row: Dict) -> None:
+        """
+        Queue a page view for writing.
+
+        Raises:
+            ServiceUnavailableException: If the buffer is full and cannot be drained
+        """
+        await self.add_many([row])
+
+    async def add_many(self, rows: List[Dict]) -> None:
+        """
+        Queue several page views; they are written in the same flush.
+
+        Raises:
+            ServiceUnavailableException: If the buffer is full and cannot be drained
+        """
+        if len(self._rows) + len(rows) > self.max_size:
+            await self.flush()
+            if len(self._rows) + len(rows) > self.max_size:
+                self._stats["rejected"] += len(rows)
+                raise ServiceUnavailableException("Analytics buffer full")
+
+        now = datetime.utcnow()
+        for row in rows:
+            row.setdefault("created_at", now)
+        self._rows.extend(rows)
+        self._stats["accepted"] += len(rows)
+        if len(self._rows) >= self.batch_size:
+            self._flush_event.set()
+
+    async def _write_batch(self, db: AsyncSession, rows: List[Dict]) -> None:
+        """Write one batch of encoded page views and their rollups in an open transaction."""
+        await db.execute(insert(PageView), rows)
+        await apply_rollups(db, rows)
+
+    async def _write(self, rows: List[Dict]) -> None:
+        """Encode and write page views in a transaction of their own."""
+        encoded = await get_dimension_cache().encode(rows)
+        async with async_session_maker() as db:
+            await self._write_batch(db, encoded)
+            await db.commit()
+
+    async def _write_isolating(self, rows: List[Dict]) -> int:
+        """
+        Write rows, bisecting failed chunks down to single rows, which are
+        dropped.
+
+        Returns:
+            Number of rows written
+        """
+        written = 0
+        chunks = deque([rows])
+        while chunks:
+            chunk = chunks.popleft()
+            try:
+                await self._write(chunk)
+            except asyncio.CancelledError:
+                # Keep the rows not written yet, in order
+                self._rows = [row for c in (chunk, *chunks) for row in c] + self._rows
+                raise
+            except Exception as e:
+                if len(chunk) == 1:
+                    logger.warning("Dropped page view %r: %r", chunk[0], e)
+                    self._stats["dropped"] += 1
+                else:
+                    middle = len(chunk) // 2
+                    chunks.extendleft([chunk[middle:], chunk[:middle]])
+                continue
+            written += len(chunk)
+        return written
+
+    def _requeue(self, rows: List[Dict]) -> None:
+        """Put rows back in front of newer ones, dropping the oldest beyond ``max_size``."""
+        self._rows = rows + self._rows
+        overflow = len(self._rows) - self.max_size
+        if overflow > 0:
+            logger.warning("Analytics buffer full, dropped %d page views", overflow)
+            self._stats["dropped"] += overflow
+            self._rows = self._rows[overflow:]
+
+    async def flush(self) -> None:
+        """Write all buffered page views in one transaction."""
+        async with self._lock:
+            if not self._rows:
+                return
+            rows, self._rows = self._rows, []
+            if self._attempts >= self.max_attempts:
+                # Retries are used up: isolate and drop the rows that keep failing
+                written = await self._write_isolating(rows)
+                self._attempts = 0
+            else:
+                try:
+                    await self._write(rows)
+                except asyncio.CancelledError:
+                    self._rows = rows + self._rows
+                    raise
+                except Exception as e:
+                    logger.warning("Analytics flush failed: %r", e)
+                    self._stats["flush_errors"] += 1
+                    self._attempts += 1
+                    self._requeue(rows)
+                    return
+                written = len(rows)
+                self._attempts = 0
+            self._stats["flushes"] += 1
+            self._stats["written"] += written
+            if written:
+                get_stats_cache().invalidate(throttled=True)
+
+    async def _flush_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_event.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_event.clear()
+            await self.flush()
+
+    def start(self) -> None:
+        """Start the background flush task."""
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def close(self) -> None:
+        """Stop the background task and write whatever is left."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        await self.flush()
+
+    def stats(self) -> Dict[str, int]:
+        return {**self._stats, "buffered": len(self._rows)}
+
+
+_buffer: Optional[PageViewBuffer] = None
+
+
+def get_pageview_buffer() -> PageViewBuffer:
+    """Get or create the page view buffer."""
+    global _buffer
+    if _buffer is None:
+        _buffer = PageViewBuffer(
+            batch_size=settings.analytics_flush_batch_size,
+            flush_interval=settings.analytics_flush_interval_seconds,
+            max_size=settings.analytics_buffer_max_size,
+            max_attempts=settings.analytics_flush_max_attempts
+        )
+    return _buffer
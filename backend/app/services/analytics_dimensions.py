@@ -0,0 +1,257 @@
+"""
+Analytics Dimensions - Dictionary-encoded user agents and referrer hosts
+"""
+import re
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from sqlalchemy import bindparam, or_, select, update
+
+from app.db.database import async_session_maker, dialect_insert
+from app.db.models import PageView, ReferrerHost, UserAgent
+
+
+# Longer User-Agent headers are truncated before lookup
+USER_AGENT_MAX_LENGTH = 512
+
+# Legacy rows encoded per backfill transaction
+BACKFILL_BATCH_SIZE = 5000
+
+_BOT = re.compile(r"bot|crawl|spider|slurp|curl|wget|python|httpx|headless|lighthouse", re.I)
+
+# First match wins, so more specific tokens come first
+_BROWSERS = [
+    ("Edge", re.compile(r"Edg(e|A|iOS)?/")),
+    ("Opera", re.compile(r"OPR/|Opera")),
+    ("Samsung Internet", re.compile(r"SamsungBrowser/")),
+    ("Firefox", re.compile(r"Firefox/|FxiOS/")),
+    ("Chrome", re.compile(r"Chrome/|CriOS/")),
+    ("Safari", re.compile(r"Safari/")),
+]
+
+_OPERATING_SYSTEMS = [
+    ("iOS", re.compile(r"iPhone|iPad|iPod")),
+    ("Android", re.compile(r"Android")),
+    ("Windows", re.compile(r"Windows")),
+    ("macOS", re.compile(r"Mac OS X|Macintosh")),
+    ("ChromeOS", re.compile(r"CrOS")),
+    ("Linux", re.compile(r"Linux")),
+]
+
+
+def parse_user_agent(user_agent: str) -> Tuple[str, str, str]:
+    """
+    Classify a User-Agent header.
+
+    Returns:
+        Tuple of (browser, os, device) where device is one of
+        ``bot``, ``mobile``, ``tablet`` or ``desktop``
+    """
+    browser = next((name for name, pattern in _BROWSERS if pattern.search(user_agent)), "Other")
+    os = next((name for name, pattern in _OPERATING_SYSTEMS if pattern.search(user_agent)), "Other")
+
+    if _BOT.search(user_agent):
+        device = "bot"
+    elif "iPad" in user_agent or "Tablet" in user_agent or (os == "Android" and "Mobile" not in user_agent):
+        device = "tablet"
+    elif "Mobi" in user_agent or os in ("iOS", "Android"):
+        device = "mobile"
+    else:
+        device = "desktop"
+    return browser, os, device
+
+
+def referrer_host(referrer: Optional[str]) -> Optional[str]:
+    """Lower-cased host of a referrer URL (scheme optional), or None."""
+    if not referrer:
+        return None
+    try:
+        parts = urlsplit(referrer if "//" in referrer else f"//{referrer}")
+        host = parts.hostname
+    except ValueError:
+        return None
+    return host[:255] if host else None
+
+
+class DimensionCache:
+    """
+    Maps user agents and referrer hosts to lookup-table IDs.
+
+    Recently used strings are kept in an in-process LRU. Misses are
+    inserted (ON CONFLICT DO NOTHING) and read back in a short transaction
+    of their own, so a failed page view batch never leaves cached IDs
+    pointing at rolled-back rows.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+
+        # string -> lookup id; oldest first
+        self._user_agents: "OrderedDict[str, int]" = OrderedDict()
+        self._hosts: "OrderedDict[str, int]" = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0}
+
+    def _remember(self, cache: "OrderedDict[str, int]", key: str, value: int) -> None:
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > self.max_entries:
+            cache.popitem(last=False)
+
+    def _cached(self, cache: "OrderedDict[str, int]", keys: Iterable[str]) -> Tuple[Dict[str, int], List[str]]:
+        found: Dict[str, int] = {}
+        missing: List[str] = []
+        for key in keys:
+            if key in cache:
+                cache.move_to_end(key)
+                found[key] = cache[key]
+            else:
+                missing.append(key)
+        self._stats["hits"] += len(found)
+        self._stats["misses"] += len(missing)
+        return found, missing
+
+    async def _resolve_missing(
+        self,
+        user_agents: List[str],
+        hosts: List[str]
+    ) -> Tuple[Dict[str, int], Dict[str, int]]:
+        ua_ids: Dict[str, int] = {}
+        host_ids: Dict[str, int] = {}
+        async with async_session_maker() as db:
+            if user_agents:
+                values = [
+                    dict(zip(("value", "browser", "os", "device"), (ua, *parse_user_agent(ua))))
+                    for ua in user_agents
+                ]
+                await db.execute(dialect_insert(UserAgent).values(values).on_conflict_do_nothing(
+                    index_elements=["value"]
+                ))
+                result = await db.execute(
+                    select(UserAgent.value, UserAgent.id).where(UserAgent.value.in_(user_agents))
+                )
+                ua_ids = dict(result.all())
+            if hosts:
+                await db.execute(dialect_insert(ReferrerHost).values(
+                    [{"host": host} for host in hosts]
+                ).on_conflict_do_nothing(index_elements=["host"]))
+                result = await db.execute(
+                    select(ReferrerHost.host, ReferrerHost.id).where(ReferrerHost.host.in_(hosts))
+                )
+                host_ids = dict(result.all())
+            await db.commit()
+        return ua_ids, host_ids
+
+    async def lookup(
+        self,
+        user_agents: Iterable[str],
+        hosts: Iterable[str]
+    ) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """
+        Get lookup IDs for user agents and referrer hosts, creating rows
+        for unseen values.
+
+        Returns:
+            Tuple of ({user agent: id}, {host: id})
+        """
+        ua_ids, missing_uas = self._cached(self._user_agents, set(user_agents))
+        host_ids, missing_hosts = self._cached(self._hosts, set(hosts))
+        if missing_uas or missing_hosts:
+            new_uas, new_hosts = await self._resolve_missing(missing_uas, missing_hosts)
+            for ua, ua_id in new_uas.items():
+                self._remember(self._user_agents, ua, ua_id)
+            for host, host_id in new_hosts.items():
+                self._remember(self._hosts, host, host_id)
+            ua_ids.update(new_uas)
+            host_ids.update(new_hosts)
+        return ua_ids, host_ids
+
+    async def encode(self, rows: List[Dict]) -> List[Dict]:
+        """
+        Replace raw ``user_agent`` and ``referrer`` values with lookup IDs.
+
+        Returns new row dicts; the input rows are left untouched so a
+        failed write can be retried.
+        """
+        user_agents = [(row.get("user_agent") or "")[:USER_AGENT_MAX_LENGTH] for row in rows]
+        hosts = [referrer_host(row.get("referrer")) for row in rows]
+        ua_ids, host_ids = await self.lookup(
+            filter(None, user_agents), filter(None, hosts)
+        )
+
+        encoded = []
+        for row, ua, host in zip(rows, user_agents, hosts):
+            row = {k: v for k, v in row.items() if k not in ("user_agent", "referrer")}
+            row["user_agent_id"] = ua_ids.get(ua) if ua else None
+            row["referrer_host_id"] = host_ids.get(host) if host else None
+            encoded.append(row)
+        return encoded
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            **self._stats,
+            "user_agents": len(self._user_agents),
+            "referrer_hosts": len(self._hosts),
+        }
+
+
+_dimension_cache: Optional[DimensionCache] = None
+
+
+def get_dimension_cache() -> DimensionCache:
+    """Get or create the dimension cache."""
+    global _dimension_cache
+    if _dimension_cache is None:
+        _dimension_cache = DimensionCache()
+    return _dimension_cache
+
+
+async def backfill_dimensions() -> int:
+    """
+    Move raw user agents and referrers of rows written before the lookup
+    tables existed into them, one short transaction per batch.
+
+    Returns:
+        Number of page views encoded
+    """
+    cache = get_dimension_cache()
+    stmt = (
+        update(PageView.__table__)
+        .where(PageView.__table__.c.id == bindparam("row_id"))
+        .values(
+            user_agent_id=bindparam("ua_id"),
+            referrer_host_id=bindparam("host_id"),
+            user_agent=None,
+            referrer=None
+        )
+    )
+    total = 0
+    last_id = 0
+    while True:
+        async with async_session_maker() as db:
+            result = await db.execute(
+                select(PageView.id, PageView.user_agent, PageView.referrer)
+                .where(
+                    PageView.id > last_id,
+                    or_(PageView.user_agent.isnot(None), PageView.referrer.isnot(None))
+                )
+                .order_by(PageView.id)
+                .limit(BACKFILL_BATCH_SIZE)
+            )
+            rows = result.all()
+        if not rows:
+            return total
+        # Lookup rows are written in their own transaction; the read above
+        # must be finished first so SQLite can take the write lock
+        encoded = await cache.encode(
+            [{"user_agent": ua, "referrer": referrer} for _, ua, referrer in rows]
+        )
+        async with async_session_maker() as db:
+            await db.execute(stmt, [
+                {"row_id": row_id, "ua_id": row["user_agent_id"], "host_id": row["referrer_host_id"]}
+                for (row_id, _, _), row in zip(rows, encoded)
+            ])
+            await db.commit()
+        total += len(rows)
+        last_id = rows[-1][0]
+
@@ -0,0 +1,172 @@
+"""
+Analytics Retention - Delete old raw page views in small batches
+"""
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import delete, select, text
+
+from app.config import settings
+from app.db.database import async_session_maker, get_engine
+from app.db.models import PageView, PageViewHourly
+from app.services.stats_cache import get_stats_cache
+
+
+# Hourly rollups only serve the partial first day of a window (max 365 days)
+HOURLY_ROLLUP_RETENTION_DAYS = 366
+
+# Pages released per incremental vacuum step
+VACUUM_PAGES_PER_STEP = 1000
+
+
+class RetentionJob:
+    """
+    Periodically deletes raw page views older than ``retention_days``.
+
+    Views are already counted in the rollup tables and visitor sketches at
+    ingest, so only raw-event features (exports, exact or filtered unique
+    counts) lose history. Deletes run in batches of ``batch_size`` rows,
+    each in its own short transaction with a pause in between, so ingest
+    never waits long for the write lock. Freed SQLite pages are returned
+    with incremental vacuum when the database uses it.
+    """
+
+    def __init__(
+        self,
+        retention_days: int,
+        interval_seconds: float = 3600,
+        batch_size: int = 2000,
+        pause_seconds: float = 0.05
+    ):
+        self.retention_days = retention_days
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.pause_seconds = pause_seconds
+
+        self._task: Optional[asyncio.Task] = None
+        self._stats: Dict[str, Any] = {
+            "runs": 0,
+            "running": False,
+            "rows_deleted": 0,
+            "rollup_rows_deleted": 0,
+            "batches": 0,
+            "vacuum_steps": 0,
+            "errors": 0,
+            "last_run_at": None,
+            "last_run_seconds": None,
+            "last_run_rows": 0,
+        }
+
+    async def _delete_batches(self, model, cutoff_column, cutoff: datetime) -> int:
+        deleted = 0
+        while True:
+            # Walk the cutoff column's index; ordering by id would sort every match
+            ids = (
+                select(model.id)
+                .where(cutoff_column < cutoff)
+                .order_by(cutoff_column)
+                .limit(self.batch_size)
+            )
+            async with async_session_maker() as db:
+                result = await db.execute(delete(model).where(model.id.in_(ids)))
+                await db.commit()
+            count = result.rowcount or 0
+            deleted += count
+            self._stats["batches"] += 1
+            if count < self.batch_size:
+                return deleted
+            await asyncio.sleep(self.pause_seconds)
+
+    async def _incremental_vacuum(self) -> None:
+        engine = get_engine()
+        if engine.dialect.name != "sqlite":
+            return
+        async with engine.connect() as conn:
+            if await conn.scalar(text("PRAGMA auto_vacuum")) != 2:
+                return
+            # The sqlite3 module steps this pragma only once (freeing a single
+            # page) per execute(); executescript runs it to completion
+            raw = await conn.get_raw_connection()
+            while await conn.scalar(text("PRAGMA freelist_count")):
+                await raw.driver_connection.executescript(
+                    f"PRAGMA incremental_vacuum({VACUUM_PAGES_PER_STEP})"
+                )
+                self._stats["vacuum_steps"] += 1
+                await asyncio.sleep(self.pause_seconds)
+
+    async def run_once(self) -> int:
+        """
+        Apply the retention policy once.
+
+        Returns:
+            Number of raw page views deleted
+        """
+        started = time.monotonic()
+        self._stats["running"] = True
+        try:
+            now = datetime.utcnow()
+            deleted = await self._delete_batches(
+                PageView, PageView.created_at, now - timedelta(days=self.retention_days)
+            )
+            self._stats["rollup_rows_deleted"] += await self._delete_batches(
+                PageViewHourly, PageViewHourly.bucket,
+                now - timedelta(days=HOURLY_ROLLUP_RETENTION_DAYS)
+            )
+            await self._incremental_vacuum()
+        finally:
+            self._stats["running"] = False
+
+        self._stats["runs"] += 1
+        self._stats["rows_deleted"] += deleted
+        self._stats["last_run_at"] = datetime.utcnow().isoformat()
+        self._stats["last_run_seconds"] = round(time.monotonic() - started, 3)
+        self._stats["last_run_rows"] = deleted
+        if deleted:
+            get_stats_cache().invalidate()
+        return deleted
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                print(f"Analytics retention failed: {e!r}")
+                self._stats["errors"] += 1
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        """Start the background task (no-op when retention is disabled)."""
+        if self.retention_days <= 0:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+
+    async def close(self) -> None:
+        """Stop the background task; a half-done run resumes next start."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._stats, "retention_days": self.retention_days}
+
+
+_job: Optional[RetentionJob] = None
+
+
+def get_retention_job() -> RetentionJob:
+    """Get or create the retention job."""
+    global _job
+    if _job is None:
+        _job = RetentionJob(
+            retention_days=settings.analytics_retention_days,
+            interval_seconds=settings.analytics_retention_interval_seconds,
+            batch_size=settings.analytics_retention_batch_size
+        )
+    return _job
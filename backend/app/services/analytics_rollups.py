@@ -0,0 +1,416 @@
+"""
+Analytics Rollups - Hourly and daily page view aggregates
+"""
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import func, insert, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import dialect_insert, get_engine
+from app.db.models import (
+    PageView,
+    PageViewDaily,
+    PageViewHourly,
+    PageViewReferrerDaily,
+    PageViewUserAgentDaily,
+    ReferrerHost,
+    UserAgent,
+    VisitorSketch
+)
+from app.services.hyperloglog import HyperLogLog
+
+
+# Rows per upsert statement, well under SQLite's bound-parameter limit
+UPSERT_CHUNK = 500
+
+
+def hour_bucket(ts: datetime) -> datetime:
+    """Truncate a timestamp to the hour."""
+    return ts.replace(minute=0, second=0, microsecond=0)
+
+
+def day_bucket(ts: datetime) -> datetime:
+    """Truncate a timestamp to the day."""
+    return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+# Key columns of each rollup table, matching its unique constraint
+_PAGE_KEYS = ("bucket", "page_path", "project_slug")
+_USER_AGENT_KEYS = ("bucket", "user_agent_id")
+_REFERRER_KEYS = ("bucket", "referrer_host_id")
+
+
+async def _upsert_counts(db: AsyncSession, model, keys: Tuple[str, ...], counts: Counter) -> None:
+    """Add view counts, keyed by tuples of ``keys`` values, to a rollup table."""
+    values = [{**dict(zip(keys, key)), "views": views} for key, views in counts.items()]
+    for i in range(0, len(values), UPSERT_CHUNK):
+        stmt = dialect_insert(model).values(values[i:i + UPSERT_CHUNK])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={"views": model.views + stmt.excluded.views}
+        )
+        await db.execute(stmt)
+
+
+async def apply_rollups(db: AsyncSession, rows: List[Dict]) -> None:
+    """
+    Add a batch of page view rows to the rollup tables.
+
+    Must run in the same transaction as the raw insert so the rollups
+    never drift from ``page_views``.
+    """
+    hourly: Counter = Counter()
+    daily: Counter = Counter()
+    user_agents: Counter = Counter()
+    referrers: Counter = Counter()
+    for row in rows:
+        day = day_bucket(row["created_at"])
+        key = (row["page_path"], row.get("project_slug") or "")
+        hourly[(hour_bucket(row["created_at"]), *key)] += 1
+        daily[(day, *key)] += 1
+        if row.get("user_agent_id"):
+            user_agents[(day, row["user_agent_id"])] += 1
+        if row.get("referrer_host_id"):
+            referrers[(day, row["referrer_host_id"])] += 1
+    await _upsert_counts(db, PageViewHourly, _PAGE_KEYS, hourly)
+    await _upsert_counts(db, PageViewDaily, _PAGE_KEYS, daily)
+    await _upsert_counts(db, PageViewUserAgentDaily, _USER_AGENT_KEYS, user_agents)
+    await _upsert_counts(db, PageViewReferrerDaily, _REFERRER_KEYS, referrers)
+
+    visitors: Dict[datetime, Set[str]] = defaultdict(set)
+    for row in rows:
+        if row.get("visitor_id"):
+            visitors[day_bucket(row["created_at"])].add(row["visitor_id"])
+    await _merge_visitor_sketches(db, visitors)
+
+
+async def _merge_visitor_sketches(db: AsyncSession, visitors: Dict[datetime, Set[str]]) -> None:
+    """Add visitor IDs to the per-day sketches (read-modify-write)."""
+    if not visitors:
+        return
+    result = await db.execute(
+        select(VisitorSketch)
+        .where(VisitorSketch.bucket.in_(list(visitors)))
+        .with_for_update()
+    )
+    existing = {row.bucket: row for row in result.scalars()}
+    for bucket, ids in visitors.items():
+        row = existing.get(bucket)
+        sketch = HyperLogLog(registers=row.registers if row else None)
+        sketch.update(ids)
+        if row:
+            row.registers = sketch.to_bytes()
+        else:
+            db.add(VisitorSketch(bucket=bucket, registers=sketch.to_bytes()))
+    await db.flush()
+
+
+def _truncate(column, unit: str):
+    """SQL expression truncating a DateTime column to an hour, day or week (Monday)."""
+    if get_engine().dialect.name == "postgresql":
+        return func.date_trunc(unit, column)
+    # SQLite stores DateTime as text; match SQLAlchemy's storage format
+    if unit == "hour":
+        return func.strftime("%Y-%m-%d %H:00:00.000000", column)
+    if unit == "week":
+        return func.strftime("%Y-%m-%d 00:00:00.000000", column, "-6 days", "weekday 1")
+    return func.strftime("%Y-%m-%d 00:00:00.000000", column)
+
+
+def _as_datetime(value) -> datetime:
+    """Bucket values come back as text on SQLite."""
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+
+async def backfill_rollups(db: AsyncSession) -> int:
+    """
+    Build rollup tables and visitor sketches from ``page_views`` if they
+    are empty.
+
+    Used once for databases created before they existed; the view counts
+    are aggregated entirely in SQL.
+
+    Returns:
+        Number of page views rolled up
+    """
+    total = await db.scalar(select(func.count(PageView.id))) or 0
+    if not total:
+        return 0
+
+    if await db.scalar(select(VisitorSketch.id).limit(1)) is None:
+        await backfill_visitor_sketches(db)
+
+    if await db.scalar(select(PageViewDaily.id).limit(1)) is not None:
+        return 0
+
+    project_slug = func.coalesce(PageView.project_slug, "")
+    for model, unit in ((PageViewHourly, "hour"), (PageViewDaily, "day")):
+        bucket = _truncate(PageView.created_at, unit)
+        await db.execute(
+            insert(model).from_select(
+                ["bucket", "page_path", "project_slug", "views"],
+                select(bucket, PageView.page_path, project_slug, func.count())
+                .group_by(bucket, PageView.page_path, project_slug)
+            )
+        )
+    return total
+
+
+async def backfill_visitor_sketches(db: AsyncSession) -> None:
+    """Build per-day visitor sketches from ``page_views``."""
+    bucket = _truncate(PageView.created_at, "day")
+    result = await db.stream(
+        select(bucket, PageView.visitor_id)
+        .where(PageView.visitor_id.isnot(None))
+        .distinct()
+        .order_by(bucket)
+    )
+    sketches: Dict[str, HyperLogLog] = defaultdict(HyperLogLog)
+    async for day, visitor_id in result:
+        sketches[day].add(visitor_id)
+    for day, sketch in sketches.items():
+        db.add(VisitorSketch(bucket=_as_datetime(day), registers=sketch.to_bytes()))
+    await db.flush()
+
+
+async def backfill_dimension_rollups(db: AsyncSession) -> int:
+    """
+    Build the per-day user agent and referrer rollups from ``page_views``
+    if they are empty, entirely in SQL.
+
+    Must run after ``backfill_dimensions`` has encoded legacy rows.
+
+    Returns:
+        Number of rollup rows created
+    """
+    if (
+        await db.scalar(select(PageViewUserAgentDaily.id).limit(1)) is not None
+        or await db.scalar(select(PageViewReferrerDaily.id).limit(1)) is not None
+    ):
+        return 0
+
+    created = 0
+    bucket = _truncate(PageView.created_at, "day")
+    for model, column in (
+        (PageViewUserAgentDaily, "user_agent_id"),
+        (PageViewReferrerDaily, "referrer_host_id"),
+    ):
+        dimension = getattr(PageView, column)
+        result = await db.execute(
+            insert(model).from_select(
+                ["bucket", column, "views"],
+                select(bucket, dimension, func.count())
+                .where(dimension.isnot(None))
+                .group_by(bucket, dimension)
+            )
+        )
+        created += result.rowcount
+    return created
+
+
+def _day_boundary(start: datetime) -> datetime:
+    """First midnight at or after an hour bucket."""
+    return start if start.hour == 0 else day_bucket(start) + timedelta(days=1)
+
+
+async def query_unique_visitors(db: AsyncSession, since: datetime) -> int:
+    """
+    Estimate distinct visitors since a point in time (~1.6% standard error).
+
+    Uses the same hour-precision window as ``query_view_stats``: whole days
+    come from the per-day sketches and the partial first day is sketched
+    from ``page_views`` (at most one day of rows), then both are merged.
+    """
+    start = hour_bucket(since)
+    boundary = _day_boundary(start)
+    result = await db.execute(
+        select(VisitorSketch.registers).where(VisitorSketch.bucket >= boundary)
+    )
+    registers = list(result.scalars())
+
+    if start < boundary:
+        first_day = HyperLogLog()
+        result = await db.stream(
+            select(PageView.visitor_id)
+            .where(
+                PageView.created_at >= start,
+                PageView.created_at < boundary,
+                PageView.visitor_id.isnot(None)
+            )
+            .distinct()
+        )
+        async for (visitor_id,) in result:
+            first_day.add(visitor_id)
+        registers.append(first_day.to_bytes())
+
+    return HyperLogLog.union(registers).count()
+
+
+def _window(since: datetime):
+    """
+    Rollup rows covering ``since`` until now, at hour precision.
+
+    Whole days come from the daily table and the partial first day from
+    the hourly table, so the row count depends only on the number of
+    days and distinct pages, never on raw event volume.
+    """
+    start = hour_bucket(since)
+    boundary = _day_boundary(start)
+    hourly = select(
+        PageViewHourly.page_path, PageViewHourly.project_slug, PageViewHourly.views
+    ).where(PageViewHourly.bucket >= start, PageViewHourly.bucket < boundary)
+    daily = select(
+        PageViewDaily.page_path, PageViewDaily.project_slug, PageViewDaily.views
+    ).where(PageViewDaily.bucket >= boundary)
+    return union_all(hourly, daily).subquery()
+
+
+async def query_view_stats(
+    db: AsyncSession,
+    since: datetime,
+    limit: int = 10
+) -> Tuple[int, List[Tuple[str, int]], List[Tuple[str, int]]]:
+    """
+    Get total views, top pages and top projects since a point in time.
+
+    Returns:
+        Tuple of (total views, [(page_path, views)], [(project_slug, views)])
+    """
+    window = _window(since)
+    views = func.sum(window.c.views)
+
+    total = await db.scalar(select(views)) or 0
+
+    top_pages = await db.execute(
+        select(window.c.page_path, views)
+        .group_by(window.c.page_path)
+        .order_by(views.desc())
+        .limit(limit)
+    )
+    top_projects = await db.execute(
+        select(window.c.project_slug, views)
+        .where(window.c.project_slug != "")
+        .group_by(window.c.project_slug)
+        .order_by(views.desc())
+        .limit(limit)
+    )
+    return int(total), [tuple(r) for r in top_pages], [tuple(r) for r in top_projects]
+
+
+def _dimension_window(since: datetime, model, column: str):
+    """
+    Per-dimension view counts covering ``since`` until now, at hour
+    precision: whole days from a daily dimension rollup and the partial
+    first day from ``page_views`` (at most one day of rows).
+    """
+    start = hour_bucket(since)
+    boundary = _day_boundary(start)
+    raw_id = getattr(PageView, column)
+    raw = (
+        select(raw_id.label("dimension_id"), func.count().label("views"))
+        .where(PageView.created_at >= start, PageView.created_at < boundary, raw_id.isnot(None))
+        .group_by(raw_id)
+    )
+    daily = select(
+        getattr(model, column).label("dimension_id"), model.views
+    ).where(model.bucket >= boundary)
+    return union_all(raw, daily).subquery()
+
+
+async def query_top_dimensions(
+    db: AsyncSession,
+    since: datetime,
+    limit: int = 10
+) -> Tuple[List[Tuple[str, int]], List[Tuple[str, int]]]:
+    """
+    Get the most common browsers and referrer hosts since a point in time.
+
+    Answered from the daily dimension rollups, so the cost does not grow
+    with raw event volume and days past raw retention are still covered.
+
+    Returns:
+        Tuple of ([(browser, views)], [(referrer host, views)])
+    """
+    window = _dimension_window(since, PageViewUserAgentDaily, "user_agent_id")
+    views = func.sum(window.c.views)
+    browsers = await db.execute(
+        select(UserAgent.browser, views)
+        .join(window, UserAgent.id == window.c.dimension_id)
+        .group_by(UserAgent.browser)
+        .order_by(views.desc())
+        .limit(limit)
+    )
+
+    window = _dimension_window(since, PageViewReferrerDaily, "referrer_host_id")
+    views = func.sum(window.c.views)
+    referrers = await db.execute(
+        select(ReferrerHost.host, views)
+        .join(window, ReferrerHost.id == window.c.dimension_id)
+        .group_by(ReferrerHost.host)
+        .order_by(views.desc())
+        .limit(limit)
+    )
+    return (
+        [(browser, int(count)) for browser, count in browsers],
+        [(host, int(count)) for host, count in referrers]
+    )
+
+
+async def query_timeseries(
+    db: AsyncSession,
+    since: datetime,
+    unit: str,
+    page_path: Optional[str] = None,
+    project_slug: Optional[str] = None
+) -> List[Tuple[datetime, int, int]]:
+    """
+    Views and unique visitors per hour, day or week since a point in time.
+
+    Buckets are aligned in SQL. Views come from the rollups; unique
+    visitors come from the per-day sketches for unfiltered day/week series
+    and from ``page_views`` otherwise (hourly or per-page uniques cannot be
+    derived from daily sketches). Buckets without views are omitted.
+
+    Returns:
+        List of (bucket start, views, unique visitors), oldest first
+    """
+    model = PageViewHourly if unit == "hour" else PageViewDaily
+    start = hour_bucket(since) if unit == "hour" else day_bucket(since)
+    bucket = _truncate(model.bucket, unit)
+    query = (
+        select(bucket, func.sum(model.views))
+        .where(model.bucket >= start)
+        .group_by(bucket)
+    )
+    if page_path is not None:
+        query = query.where(model.page_path == page_path)
+    if project_slug is not None:
+        query = query.where(model.project_slug == project_slug)
+    views = {_as_datetime(b): int(v) for b, v in await db.execute(query)}
+
+    uniques: Dict[datetime, int] = {}
+    if unit != "hour" and page_path is None and project_slug is None:
+        bucket = _truncate(VisitorSketch.bucket, unit)
+        grouped: Dict[datetime, List[bytes]] = defaultdict(list)
+        result = await db.execute(
+            select(bucket, VisitorSketch.registers).where(VisitorSketch.bucket >= start)
+        )
+        for b, registers in result:
+            grouped[_as_datetime(b)].append(registers)
+        uniques = {b: HyperLogLog.union(r).count() for b, r in grouped.items()}
+    else:
+        bucket = _truncate(PageView.created_at, unit)
+        query = (
+            select(bucket, func.count(func.distinct(PageView.visitor_id)))
+            .where(PageView.created_at >= start)
+            .group_by(bucket)
+        )
+        if page_path is not None:
+            query = query.where(PageView.page_path == page_path)
+        if project_slug is not None:
+            query = query.where(PageView.project_slug == project_slug)
+        uniques = {_as_datetime(b): int(n) for b, n in await db.execute(query)}
+
+    return [(b, views[b], uniques.get(b, 0)) for b in sorted(views)]
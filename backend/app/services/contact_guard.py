@@ -0,0 +1,173 @@
+"""
+Contact Guard - Duplicate and flood detection for contact submissions
+"""
+import hashlib
+import time
+import unicodedata
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta, timezone
+from typing import Deque, Dict, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.db.models import Contact
+
+
+def contact_fingerprint(email: str, message: str) -> str:
+    """Hash of the sender email and the message with case and whitespace normalized."""
+    normalized = " ".join(unicodedata.normalize("NFKC", message).casefold().split())
+    return hashlib.sha256(f"{email.strip().lower()}\0{normalized}".encode("utf-8")).hexdigest()
+
+
+class ContactGuard:
+    """
+    Suppresses repeated and flooding contact submissions.
+
+    Fingerprints seen within ``duplicate_window`` seconds are kept in a
+    bounded in-memory index; misses fall back to the indexed
+    ``contacts.fingerprint`` column, so restarts and other instances are
+    covered. Floods are more than ``max_per_email`` / ``max_per_ip``
+    accepted submissions within ``flood_window`` seconds, tracked in
+    memory only.
+    """
+
+    def __init__(
+        self,
+        duplicate_window: float = 86400,
+        flood_window: float = 600,
+        max_per_email: int = 3,
+        max_per_ip: int = 5,
+        max_entries: int = 10000
+    ):
+        self.duplicate_window = duplicate_window
+        self.flood_window = flood_window
+        self.max_per_email = max_per_email
+        self.max_per_ip = max_per_ip
+        self.max_entries = max_entries
+
+        # fingerprint -> time accepted; oldest first
+        self._fingerprints: "OrderedDict[str, float]" = OrderedDict()
+        # "email:..." / "ip:..." -> recent acceptance times; least recently used first
+        self._submissions: "OrderedDict[str, Deque[float]]" = OrderedDict()
+        self._stats = {"accepted": 0, "duplicates": 0, "db_duplicates": 0, "floods": 0}
+
+    def _prune(self, now: float) -> None:
+        while self._fingerprints:
+            seen_at = next(iter(self._fingerprints.values()))
+            if now - seen_at < self.duplicate_window and len(self._fingerprints) <= self.max_entries:
+                break
+            self._fingerprints.popitem(last=False)
+        while len(self._submissions) > self.max_entries:
+            self._submissions.popitem(last=False)
+
+    def _recent_count(self, key: str, now: float) -> int:
+        times = self._submissions.get(key)
+        if not times:
+            return 0
+        while times and now - times[0] >= self.flood_window:
+            times.popleft()
+        return len(times)
+
+    def _is_flood(self, email: str, ip: str, now: float) -> bool:
+        return (
+            self._recent_count(f"email:{email.strip().lower()}", now) >= self.max_per_email
+            or self._recent_count(f"ip:{ip}", now) >= self.max_per_ip
+        )
+
+    def _remember(self, fingerprint: str, email: str, ip: str, now: float) -> None:
+        self._fingerprints[fingerprint] = now
+        self._fingerprints.move_to_end(fingerprint)
+        keys = ((f"email:{email.strip().lower()}", self.max_per_email), (f"ip:{ip}", self.max_per_ip))
+        for key, limit in keys:
+            times = self._submissions.setdefault(key, deque(maxlen=limit))
+            times.append(now)
+            self._submissions.move_to_end(key)
+        self._prune(now)
+
+    def check(self, fingerprint: str, email: str, ip: str) -> Optional[str]:
+        """
+        Check a submission against the in-memory index.
+
+        Returns:
+            ``"duplicate"``, ``"flood"`` or None if it may be accepted
+        """
+        now = time.time()
+        self._prune(now)
+        if fingerprint in self._fingerprints:
+            self._stats["duplicates"] += 1
+            return "duplicate"
+        if self._is_flood(email, ip, now):
+            self._stats["floods"] += 1
+            return "flood"
+        return None
+
+    async def seen_in_db(self, db: AsyncSession, fingerprint: str) -> bool:
+        """Check for a stored submission with the same fingerprint in the window."""
+        since = datetime.utcnow() - timedelta(seconds=self.duplicate_window)
+        found = await db.scalar(
+            select(Contact.id)
+            .where(Contact.fingerprint == fingerprint, Contact.created_at >= since)
+            .limit(1)
+        )
+        if found is not None:
+            self._stats["db_duplicates"] += 1
+            return True
+        return False
+
+    def record(self, fingerprint: str, email: str, ip: str) -> bool:
+        """
+        Reserve a fingerprint for a submission about to be stored.
+
+        Returns:
+            False if a concurrent identical submission reserved it first
+        """
+        if fingerprint in self._fingerprints:
+            self._stats["duplicates"] += 1
+            return False
+        self._remember(fingerprint, email, ip, time.time())
+        self._stats["accepted"] += 1
+        return True
+
+    def release(self, fingerprint: str) -> None:
+        """Forget a reservation whose submission could not be stored."""
+        self._fingerprints.pop(fingerprint, None)
+
+    async def warm_up(self, db: AsyncSession) -> None:
+        """Load recent submissions so limits survive a restart."""
+        since = datetime.utcnow() - timedelta(seconds=max(self.duplicate_window, self.flood_window))
+        result = await db.execute(
+            select(Contact.fingerprint, Contact.email, Contact.ip_address, Contact.created_at)
+            .where(Contact.created_at >= since, Contact.fingerprint.isnot(None))
+            .order_by(Contact.created_at)
+        )
+        for fingerprint, email, ip, created_at in result:
+            self._remember(
+                fingerprint, email, ip or "unknown",
+                created_at.replace(tzinfo=timezone.utc).timestamp()
+            )
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            **self._stats,
+            "suppressed": self._stats["duplicates"] + self._stats["db_duplicates"] + self._stats["floods"],
+            "fingerprints": len(self._fingerprints),
+        }
+
+
+_guard: Optional[ContactGuard] = None
+
+
+def get_contact_guard() -> ContactGuard:
+    """Get or create the contact guard."""
+    global _guard
+    if _guard is None:
+        _guard = ContactGuard(
+            duplicate_window=settings.contact_duplicate_window_seconds,
+            flood_window=settings.contact_flood_window_seconds,
+            max_per_email=settings.contact_flood_max_per_email,
+            max_per_ip=settings.contact_flood_max_per_ip,
+            max_entries=settings.contact_guard_max_entries
+        )
+    return _guard
@@ -0,0 +1,228 @@
+"""
+Email Outbox - Durable, retried delivery of contact notifications
+"""
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+import resend
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.db.database import async_session_maker
+from app.db.models import Contact, EmailOutbox
+from app.services.email_service import build_contact_email, is_email_configured, send_emails
+
+
+# A claimed email is retried after this long if the worker dies mid-send
+CLAIM_LEASE_SECONDS = 300
+
+
+def enqueue_contact_email(db: AsyncSession, contact: Contact) -> None:
+    """
+    Queue the notification for a contact in the caller's transaction.
+
+    The contact must be flushed so it has an id.
+    """
+    db.add(EmailOutbox(contact_id=contact.id, next_attempt_at=datetime.utcnow()))
+
+
+def _is_rejected(error: Exception) -> bool:
+    """Whether Resend refused the request's content (rather than failing)."""
+    return isinstance(error, (resend.exceptions.ValidationError, resend.exceptions.MissingRequiredFieldsError))
+
+
+def _deliver(emails: List[Dict]) -> List[Optional[Exception]]:
+    """
+    Send emails as one batch; if Resend rejects the batch, send them one
+    by one so a single bad email cannot hold back the others. Outages,
+    timeouts and rate limits fail the whole batch, to be retried later.
+
+    Returns:
+        Per-email exception, or None if it was sent
+    """
+    if len(emails) > 1:
+        try:
+            send_emails(emails)
+            return [None] * len(emails)
+        except Exception as e:
+            if not _is_rejected(e):
+                return [e] * len(emails)
+    results: List[Optional[Exception]] = []
+    for email in emails:
+        try:
+            send_emails([email])
+            results.append(None)
+        except Exception as e:
+            results.append(e)
+    return results
+
+
+class EmailOutboxWorker:
+    """
+    Drains the email outbox in the background.
+
+    Due rows are claimed in a short transaction (attempt counted, next
+    attempt pushed out by a lease), sent off the event loop, and then
+    marked sent or rescheduled with exponential backoff. After
+    ``max_attempts`` failures a row is marked dead and left for
+    inspection. Delivery is at-least-once.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 20,
+        poll_interval: float = 5.0,
+        max_attempts: int = 8,
+        backoff_base: float = 30.0,
+        backoff_max: float = 3600.0
+    ):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stats: Dict[str, Any] = {
+            "sent": 0,
+            "failed_attempts": 0,
+            "dead": 0,
+            "batches": 0,
+            "errors": 0,
+            "last_error": None,
+        }
+
+    def backoff(self, attempts: int) -> float:
+        """Delay before the next attempt after ``attempts`` failures."""
+        return min(self.backoff_base * 2 ** (attempts - 1), self.backoff_max)
+
+    def notify(self) -> None:
+        """Wake the worker after queueing an email."""
+        self._wake.set()
+
+    async def _claim(self) -> List[EmailOutbox]:
+        now = datetime.utcnow()
+        async with async_session_maker() as db:
+            result = await db.execute(
+                select(EmailOutbox)
+                .where(EmailOutbox.status == "pending", EmailOutbox.next_attempt_at <= now)
+                .order_by(EmailOutbox.next_attempt_at)
+                .limit(self.batch_size)
+                # Lets several app instances share the outbox on PostgreSQL
+                .with_for_update(skip_locked=True)
+            )
+            rows = list(result.scalars())
+            for row in rows:
+                row.attempts += 1
+                row.next_attempt_at = now + timedelta(seconds=CLAIM_LEASE_SECONDS)
+            await db.commit()
+        return rows
+
+    async def process_batch(self) -> int:
+        """
+        Send one batch of due emails.
+
+        Returns:
+            Number of emails claimed
+        """
+        rows = await self._claim()
+        if not rows:
+            return 0
+
+        async with async_session_maker() as db:
+            result = await db.execute(
+                select(Contact).where(Contact.id.in_([row.contact_id for row in rows]))
+            )
+            contacts = {contact.id: contact for contact in result.scalars()}
+        # The contact may have been deleted since its email was queued
+        sendable = [row for row in rows if row.contact_id in contacts]
+        emails = [build_contact_email(contacts[row.contact_id]) for row in sendable]
+
+        results: Dict[int, Optional[Exception]] = {}
+        if emails:
+            results = dict(zip(
+                [row.id for row in sendable],
+                await asyncio.to_thread(_deliver, emails)
+            ))
+
+        now = datetime.utcnow()
+        async with async_session_maker() as db:
+            for row in rows:
+                error = results.get(row.id, LookupError("Contact no longer exists"))
+                if row.id not in results:
+                    values = {"status": "dead", "last_error": repr(error)}
+                    self._stats["dead"] += 1
+                    print(f"Email {row.id} for contact {row.contact_id} dead: {values['last_error']}")
+                elif error is None:
+                    values = {"status": "sent", "sent_at": now, "last_error": None}
+                    self._stats["sent"] += 1
+                else:
+                    values = {"last_error": repr(error)[:1000]}
+                    self._stats["failed_attempts"] += 1
+                    self._stats["last_error"] = values["last_error"]
+                    if row.attempts >= self.max_attempts:
+                        values["status"] = "dead"
+                        self._stats["dead"] += 1
+                        print(f"Email {row.id} for contact {row.contact_id} dead: {values['last_error']}")
+                    else:
+                        values["next_attempt_at"] = now + timedelta(seconds=self.backoff(row.attempts))
+                await db.execute(
+                    update(EmailOutbox).where(EmailOutbox.id == row.id).values(**values)
+                )
+            await db.commit()
+        self._stats["batches"] += 1
+        return len(rows)
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                while await self.process_batch() == self.batch_size:
+                    pass
+            except Exception as e:
+                print(f"Email outbox failed: {e!r}")
+                self._stats["errors"] += 1
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    def start(self) -> None:
+        """Start the background task (no-op when email is not configured)."""
+        if not is_email_configured():
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+
+    async def close(self) -> None:
+        """Stop the background task; unsent emails stay in the outbox."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(self._stats)
+
+
+_worker: Optional[EmailOutboxWorker] = None
+
+
+def get_email_outbox() -> EmailOutboxWorker:
+    """Get or create the email outbox worker."""
+    global _worker
+    if _worker is None:
+        _worker = EmailOutboxWorker(
+            batch_size=settings.email_outbox_batch_size,
+            poll_interval=settings.email_outbox_poll_interval_seconds,
+            max_attempts=settings.email_outbox_max_attempts,
+            backoff_base=settings.email_outbox_backoff_base_seconds,
+            backoff_max=settings.email_outbox_backoff_max_seconds
+        )
+    return _worker
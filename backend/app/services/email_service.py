@@ -1,28 +1,28 @@
 """
 Email Service - Send notifications via Resend
 """
+from typing import Dict, List
+
 import resend
 
 from app.config import settings
-from app.api.v1.schemas.contact import ContactCreate
 
 
-async def send_contact_notification(contact: ContactCreate) -> bool:
+def is_email_configured() -> bool:
+    """Whether notification emails can be sent."""
+    return bool(settings.resend_api_key and settings.contact_email)
+
+
+def build_contact_email(contact) -> Dict:
     """
-    Send email notification for new contact form submission.
+    Build the notification email for a contact form submission.
     
     Args:
-        contact: Contact form data
+        contact: Contact row or form data (name, email, subject, message)
         
     Returns:
-        True if email sent successfully
+        Resend email parameters
     """
-    if not settings.resend_api_key or not settings.contact_email:
-        print("Email service not configured - skipping notification")
-        return False
-    
-    resend.api_key = settings.resend_api_key
-    
     subject = f"[Portfolio] Yeni Mesaj: {contact.subject or 'Konu Belirtilmemiş'}"
     
     html_content = f"""
@@ -48,15 +48,28 @@ async def send_contact_notification(contact: ContactCreate) -> bool:
     </div>
     """
     
-    try:
-        resend.Emails.send({
-            "from": "Portfolio <onboarding@resend.dev>",
-            "to": settings.contact_email,
-            "subject": subject,
-            "html": html_content,
-            "reply_to": contact.email
-        })
-        return True
-    except Exception as e:
-        print(f"Failed to send email: {e}")
-        return False
+    return {
+        "from": "Portfolio <onboarding@resend.dev>",
+        "to": settings.contact_email,
+        "subject": subject,
+        "html": html_content,
+        "reply_to": contact.email
+    }
+
+
+def send_emails(emails: List[Dict]) -> None:
+    """
+    Send emails through Resend, several in one batch request.
+    
+    Blocking HTTP call; run it off the event loop.
+    
+    Raises:
+        Exception: If Resend rejects the request
+    """
+    resend.api_key = settings.resend_api_key
+    if settings.resend_api_url:
+        resend.api_url = settings.resend_api_url
+    if len(emails) == 1:
+        resend.Emails.send(emails[0])
+    else:
+        resend.Batch.send(emails)
@@ -0,0 +1,137 @@
+"""
+Conversation History - Token budgeting, rolling summaries and prompt metrics
+"""
+import re
+from bisect import bisect_left
+from typing import Dict, List, Tuple
+
+from app.services.tokenizer import estimate_tokens
+
+
+# Per-turn summary line length; keeps the summary a fraction of the budget
+SUMMARY_LINE_CHARS = 160
+
+# Lines kept in a session's running summary; the oldest are dropped first
+SUMMARY_MAX_LINES = 24
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+
+# Prompt size histogram (upper bounds in tokens)
+PROMPT_SIZE_BUCKETS = [500, 1000, 1500, 2000, 3000, 4000, 6000, 8000]
+_prompt_sizes = {
+    "count": 0,
+    "sum": 0,
+    "max": 0,
+    "summarized": 0,
+    "buckets": [0] * (len(PROMPT_SIZE_BUCKETS) + 1),
+}
+
+
+def _first_sentence(text: str) -> str:
+    text = " ".join(text.split())
+    sentence = _SENTENCE_END.split(text, 1)[0]
+    if len(sentence) > SUMMARY_LINE_CHARS:
+        sentence = sentence[:SUMMARY_LINE_CHARS - 1].rstrip() + "…"
+    return sentence
+
+
+def summarize_turns(messages: List[Dict]) -> str:
+    """Collapse messages into a short extractive summary, one line each."""
+    labels = {"user": "Kullanıcı", "assistant": "Asistan"}
+    return "\n".join(
+        f"- {labels.get(m['role'], m['role'])}: {_first_sentence(m['content'])}"
+        for m in messages
+    )
+
+
+def fold_summary(summary: str, messages: List[Dict]) -> str:
+    """
+    Add messages to a running summary.
+
+    Only the new messages are summarized; the summary keeps the newest
+    ``SUMMARY_MAX_LINES`` lines.
+    """
+    lines = summary.split("\n") if summary else []
+    if messages:
+        lines += summarize_turns(messages).split("\n")
+    return "\n".join(lines[-SUMMARY_MAX_LINES:])
+
+
+def history_overflow(history: List[Dict], token_budget: int) -> int:
+    """
+    Count the oldest messages that do not fit into a token budget.
+
+    The newest messages are kept while they fit, and user/assistant pairs
+    are kept together.
+    """
+    used = 0
+    start = len(history)
+    while start > 0:
+        cost = estimate_tokens(history[start - 1]["content"])
+        if used + cost > token_budget:
+            break
+        used += cost
+        start -= 1
+
+    # Keep user/assistant pairs together
+    if start < len(history) and history[start]["role"] == "assistant":
+        start += 1
+    return start
+
+
+def fit_history(
+    history: List[Dict],
+    token_budget: int,
+    summary: str = ""
+) -> Tuple[str, List[Dict]]:
+    """
+    Fit conversation history into a token budget.
+
+    The newest messages are kept verbatim while they fit; everything
+    older is folded into the session's running summary, which is dropped
+    from the oldest end if it would not fit either. Session stores trim
+    with the same budget when saving, so stored history normally fits and
+    only the summary is cut here.
+
+    Args:
+        history: Messages, oldest first
+        token_budget: Maximum tokens for summary plus kept messages
+        summary: Running summary of turns no longer in ``history``
+
+    Returns:
+        Tuple of (summary text, possibly empty; messages kept verbatim)
+    """
+    start = history_overflow(history, token_budget)
+    used = sum(estimate_tokens(m["content"]) for m in history[start:])
+
+    combined = fold_summary(summary, history[:start])
+    if not combined:
+        return "", history[start:]
+
+    lines = combined.split("\n")
+    while lines and estimate_tokens("\n".join(lines)) > token_budget - used:
+        lines.pop(0)
+    return "\n".join(lines), history[start:]
+
+
+def record_prompt_size(tokens: int, summarized: bool) -> None:
+    """Record the estimated size of a prompt sent upstream."""
+    _prompt_sizes["count"] += 1
+    _prompt_sizes["sum"] += tokens
+    _prompt_sizes["max"] = max(_prompt_sizes["max"], tokens)
+    if summarized:
+        _prompt_sizes["summarized"] += 1
+    _prompt_sizes["buckets"][bisect_left(PROMPT_SIZE_BUCKETS, tokens)] += 1
+
+
+def get_prompt_size_stats() -> Dict:
+    """Get prompt size distribution metrics."""
+    count = _prompt_sizes["count"]
+    labels = [f"le_{b}" for b in PROMPT_SIZE_BUCKETS] + ["inf"]
+    return {
+        "count": count,
+        "avg_tokens": round(_prompt_sizes["sum"] / count, 1) if count else 0,
+        "max_tokens": _prompt_sizes["max"],
+        "summarized": _prompt_sizes["summarized"],
+        "buckets": dict(zip(labels, _prompt_sizes["buckets"])),
+    }
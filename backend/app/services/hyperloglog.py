@@ -0,0 +1,72 @@
+"""
+HyperLogLog - Mergeable approximate distinct counting
+"""
+import hashlib
+import math
+from typing import Iterable, List, Optional
+
+
+class HyperLogLog:
+    """
+    HyperLogLog sketch with 2**p one-byte registers.
+
+    The relative standard error is about 1.04 / sqrt(2**p): 1.6% for the
+    default p=12, which serializes to 4 KB. Sketches with the same p merge
+    by taking the register-wise maximum, so per-day sketches can be
+    combined into any range of days.
+    """
+
+    def __init__(self, p: int = 12, registers: Optional[bytes] = None):
+        self.p = p
+        self.m = 1 << p
+        self.registers = bytearray(registers) if registers else bytearray(self.m)
+        if len(self.registers) != self.m:
+            raise ValueError(f"Expected {self.m} registers, got {len(self.registers)}")
+
+    @property
+    def standard_error(self) -> float:
+        return 1.04 / math.sqrt(self.m)
+
+    def add(self, value: str) -> None:
+        """Add a value to the sketch."""
+        x = int.from_bytes(
+            hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big"
+        )
+        index = x >> (64 - self.p)
+        rest = x & ((1 << (64 - self.p)) - 1)
+        rank = (64 - self.p) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, values: Iterable[str]) -> None:
+        """Add many values to the sketch."""
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: "HyperLogLog") -> None:
+        """Merge another sketch into this one."""
+        if other.p != self.p:
+            raise ValueError("Cannot merge sketches with different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    @classmethod
+    def union(cls, registers: List[bytes], p: int = 12) -> "HyperLogLog":
+        """Merge many serialized sketches in a single pass."""
+        if not registers:
+            return cls(p)
+        if len(registers) == 1:
+            return cls(p, registers[0])
+        return cls(p, bytes(map(max, *registers)))
+
+    def count(self) -> int:
+        """Estimate the number of distinct values added."""
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        estimate = alpha * self.m * self.m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * self.m and zeros:
+            # Small-range correction: linear counting
+            estimate = self.m * math.log(self.m / zeros)
+        return int(round(estimate))
+
+    def to_bytes(self) -> bytes:
+        return bytes(self.registers)
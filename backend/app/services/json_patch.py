@@ -0,0 +1,156 @@
+"""
+JSON Patch - RFC 6902 operations and dot-path field updates
+"""
+import copy
+from typing import Any, Dict, List, Tuple, Union
+
+
+class JsonPatchError(ValueError):
+    """A patch operation is malformed or cannot be applied."""
+
+
+Container = Union[Dict[str, Any], List[Any]]
+
+
+def parse_pointer(pointer: str) -> List[str]:
+    """Split an RFC 6901 JSON Pointer into unescaped reference tokens."""
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise JsonPatchError(f"Invalid JSON pointer: {pointer!r}")
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+
+def _index(container: List[Any], token: str, allow_end: bool = False) -> int:
+    if allow_end and token == "-":
+        return len(container)
+    if not token.isdigit() or (token != "0" and token.startswith("0")):
+        raise JsonPatchError(f"Invalid array index: {token!r}")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise JsonPatchError(f"Array index out of range: {token}")
+    return index
+
+
+def _resolve(doc: Any, tokens: List[str]) -> Any:
+    for token in tokens:
+        if isinstance(doc, dict):
+            if token not in doc:
+                raise JsonPatchError(f"Path not found: /{'/'.join(tokens)}")
+            doc = doc[token]
+        elif isinstance(doc, list):
+            doc = doc[_index(doc, token)]
+        else:
+            raise JsonPatchError(f"Path not found: /{'/'.join(tokens)}")
+    return doc
+
+
+def _parent(doc: Any, pointer: str) -> Tuple[Container, str]:
+    tokens = parse_pointer(pointer)
+    if not tokens:
+        raise JsonPatchError("Operation on the document root is not supported")
+    parent = _resolve(doc, tokens[:-1])
+    if not isinstance(parent, (dict, list)):
+        raise JsonPatchError(f"Path not found: {pointer}")
+    return parent, tokens[-1]
+
+
+def _get(doc: Any, pointer: str) -> Any:
+    return _resolve(doc, parse_pointer(pointer))
+
+
+def _add(doc: Any, pointer: str, value: Any) -> None:
+    parent, token = _parent(doc, pointer)
+    if isinstance(parent, dict):
+        parent[token] = value
+    else:
+        parent.insert(_index(parent, token, allow_end=True), value)
+
+
+def _remove(doc: Any, pointer: str) -> Any:
+    parent, token = _parent(doc, pointer)
+    if isinstance(parent, dict):
+        if token not in parent:
+            raise JsonPatchError(f"Path not found: {pointer}")
+        return parent.pop(token)
+    return parent.pop(_index(parent, token))
+
+
+def _replace(doc: Any, pointer: str, value: Any) -> None:
+    parent, token = _parent(doc, pointer)
+    if isinstance(parent, dict):
+        if token not in parent:
+            raise JsonPatchError(f"Path not found: {pointer}")
+        parent[token] = value
+    else:
+        parent[_index(parent, token)] = value
+
+
+def _apply_operation(doc: Any, operation: Dict[str, Any]) -> None:
+    op = operation.get("op")
+    path = operation.get("path")
+    if not isinstance(path, str):
+        raise JsonPatchError(f"Operation is missing 'path': {operation!r}")
+
+    if op in ("add", "replace", "test") and "value" not in operation:
+        raise JsonPatchError(f"'{op}' operation is missing 'value'")
+    if op in ("move", "copy") and not isinstance(operation.get("from"), str):
+        raise JsonPatchError(f"'{op}' operation is missing 'from'")
+
+    if op == "add":
+        _add(doc, path, copy.deepcopy(operation["value"]))
+    elif op == "remove":
+        _remove(doc, path)
+    elif op == "replace":
+        _replace(doc, path, copy.deepcopy(operation["value"]))
+    elif op == "move":
+        source = operation["from"]
+        if path.startswith(source + "/"):
+            raise JsonPatchError(f"Cannot move {source} into itself")
+        _add(doc, path, _remove(doc, source))
+    elif op == "copy":
+        _add(doc, path, copy.deepcopy(_get(doc, operation["from"])))
+    elif op == "test":
+        if _get(doc, path) != operation["value"]:
+            raise JsonPatchError(f"Test failed at {path}")
+    else:
+        raise JsonPatchError(f"Unknown operation: {op!r}")
+
+
+def _set_field(doc: Dict[str, Any], path: str, value: Any) -> None:
+    """Set a dot-notation path, creating intermediate objects as needed."""
+    keys = path.split(".")
+    if not all(keys):
+        raise JsonPatchError(f"Invalid field path: {path!r}")
+    current = doc
+    for key in keys[:-1]:
+        if key not in current:
+            current[key] = {}
+        current = current[key]
+        if not isinstance(current, dict):
+            raise JsonPatchError(f"Field path crosses a non-object value: {path!r}")
+    current[keys[-1]] = copy.deepcopy(value)
+
+
+def apply_patch(doc: Dict[str, Any], operations: List[Dict[str, Any]]) -> None:
+    """
+    Apply operations to a document in place, in order.
+
+    Each operation is either an RFC 6902 operation (has an ``op`` key) or
+    a ``{"path": "hero.title", "value": ...}`` dot-path field update. The
+    document may be left partially modified if an operation fails, so
+    callers should patch a copy.
+
+    Raises:
+        JsonPatchError: If an operation is malformed or cannot be applied
+    """
+    for operation in operations:
+        if not isinstance(operation, dict):
+            raise JsonPatchError(f"Operation must be an object: {operation!r}")
+        if "op" in operation:
+            _apply_operation(doc, operation)
+        else:
+            path = operation.get("path")
+            if not isinstance(path, str) or "value" not in operation:
+                raise JsonPatchError(f"Field update needs 'path' and 'value': {operation!r}")
+            _set_field(doc, path, operation["value"])
@@ -0,0 +1,190 @@
+"""
+Public Content - Precomputed, pre-compressed JSON documents for conditional GET
+"""
+import asyncio
+import gzip
+import hashlib
+import json
+from collections import defaultdict
+from dataclasses import dataclass
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.services.translation_store import get_translation_store
+
+try:
+    import brotli
+except ImportError:  # optional; gzip is always available
+    brotli = None
+
+
+CONTENT_FILE = Path(__file__).parent.parent / "data" / "content.json"
+
+# Preferred first when the client accepts several
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+@dataclass
+class Representation:
+    """Serialized bytes of one document, in every supported encoding."""
+    source_version: str
+    version: str
+    last_modified: str
+    modified_at: float
+    bodies: Dict[str, bytes]
+
+    def etag(self, encoding: str) -> str:
+        """Strong ETag; each content coding is a different representation."""
+        if encoding == "identity":
+            return f'"{self.version}"'
+        return f'"{self.version}-{encoding}"'
+
+
+def _build(source_version: str, data: Any, modified_at: float) -> Representation:
+    body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    bodies = {"identity": body, "gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        bodies["br"] = brotli.compress(body, quality=11)
+    return Representation(
+        source_version=source_version,
+        version=hashlib.sha256(body).hexdigest()[:32],
+        last_modified=formatdate(modified_at, usegmt=True),
+        modified_at=modified_at,
+        bodies=bodies
+    )
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> str:
+    """Pick the best pre-compressed variant allowed by an Accept-Encoding header."""
+    if not accept_encoding:
+        return "identity"
+    qualities: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        qualities[coding.strip().lower()] = q
+    wildcard = qualities.get("*", 0.0)
+    best = max(ENCODINGS, key=lambda coding: qualities.get(coding, wildcard))
+    if qualities.get(best, wildcard) > 0:
+        return best
+    return "identity"
+
+
+def is_not_modified(
+    representation: Representation,
+    encoding: str,
+    if_none_match: Optional[str],
+    if_modified_since: Optional[str]
+) -> bool:
+    """
+    Evaluate conditional request headers against the variant that would
+    be sent in ``encoding``.
+
+    A cached copy in another encoding does not match: answering 304 would
+    leave the client with the wrong Content-Encoding for its new request.
+    """
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        # If-None-Match uses the weak comparison
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return representation.etag(encoding) in tags
+    if if_modified_since is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        # Last-Modified has whole-second precision
+        return int(representation.modified_at) <= since
+    return False
+
+
+class PublicContent:
+    """
+    Serves public JSON documents from precomputed bytes.
+
+    Each document is kept serialized and compressed (gzip, plus brotli
+    when installed) alongside its ETag and Last-Modified. Sources are
+    revalidated on every request by mtime/size (content.json) or
+    translation store version, and the variants are rebuilt only when
+    the content actually changed.
+    """
+
+    def __init__(self, content_file: Path):
+        self.content_file = content_file
+
+        self._representations: Dict[str, Representation] = {}
+        self._content_stat: Optional[Tuple[int, int]] = None
+        self._content_version: Optional[str] = None
+        self._content_raw = b""
+        self._locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self._stats = {"responses": 0, "not_modified": 0, "rebuilds": 0}
+
+    async def _refresh(
+        self,
+        key: str,
+        source_version: str,
+        load: Callable[[], Tuple[Any, float]]
+    ) -> Representation:
+        cached = self._representations.get(key)
+        if cached and cached.source_version == source_version:
+            return cached
+        async with self._locks[key]:
+            cached = self._representations.get(key)
+            if cached and cached.source_version == source_version:
+                return cached
+            data, modified_at = load()
+            representation = await asyncio.to_thread(_build, source_version, data, modified_at)
+            self._representations[key] = representation
+            self._stats["rebuilds"] += 1
+            return representation
+
+    async def content(self) -> Representation:
+        """Representation of app/data/content.json."""
+        stat = self.content_file.stat()
+        if self._content_stat != (stat.st_mtime_ns, stat.st_size):
+            raw = self.content_file.read_bytes()
+            self._content_version = hashlib.sha256(raw).hexdigest()
+            self._content_stat = (stat.st_mtime_ns, stat.st_size)
+            self._content_raw = raw
+        return await self._refresh(
+            "content",
+            self._content_version,
+            lambda: (json.loads(self._content_raw), stat.st_mtime)
+        )
+
+    async def translations(self, lang: str) -> Representation:
+        """Representation of a language's translations."""
+        document = await get_translation_store().document(lang)
+        return await self._refresh(
+            f"translations:{lang}",
+            document.version,
+            lambda: (document.data, document.mtime_ns / 1e9)
+        )
+
+    def record(self, not_modified: bool) -> None:
+        self._stats["responses"] += 1
+        if not_modified:
+            self._stats["not_modified"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._stats, "encodings": list(ENCODINGS), "cached": len(self._representations)}
+
+
+_public_content: Optional[PublicContent] = None
+
+
+def get_public_content() -> PublicContent:
+    """Get or create the public content cache."""
+    global _public_content
+    if _public_content is None:
+        _public_content = PublicContent(CONTENT_FILE)
+    return _public_content
+
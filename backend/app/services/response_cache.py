@@ -0,0 +1,152 @@
+"""
+Response Cache - Reuse assistant answers for repeated first-turn questions
+"""
+import math
+import re
+import time
+import unicodedata
+from collections import Counter, OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+from app.config import settings
+
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_question(text: str) -> str:
+    """Normalize a question for cache lookups (case, accents, punctuation)."""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    text = _PUNCTUATION.sub(" ", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def _terms(normalized: str) -> Counter:
+    """Word and character-trigram terms, robust to small typos."""
+    terms = Counter(normalized.split())
+    for word in normalized.split():
+        padded = f" {word} "
+        terms.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return terms
+
+
+class ResponseCache:
+    """
+    LRU + TTL cache of answers keyed by (knowledge base version, question).
+
+    Exact lookups match the normalized question. When ``similarity`` is
+    above zero, misses fall back to a TF-IDF cosine search over cached
+    questions of the same knowledge base version.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl_seconds: float = 86400,
+        similarity: float = 0
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity = similarity
+
+        # (kb_version, question) -> (stored at, answer); oldest first
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, str]]" = OrderedDict()
+        self._terms: Dict[Tuple[str, str], Counter] = {}
+        self._index: Dict[str, Set[Tuple[str, str]]] = {}
+        self._stats = {"hits": 0, "similar_hits": 0, "misses": 0, "evictions": 0}
+
+    def _remove(self, key: Tuple[str, str]) -> None:
+        self._entries.pop(key, None)
+        for term in self._terms.pop(key, ()):
+            keys = self._index[term]
+            keys.discard(key)
+            if not keys:
+                del self._index[term]
+
+    def _idf(self, term: str) -> float:
+        return math.log((1 + len(self._entries)) / (1 + len(self._index.get(term, ())))) + 1
+
+    def _vector(self, terms: Counter) -> Dict[str, float]:
+        return {term: count * self._idf(term) for term, count in terms.items()}
+
+    def _find_similar(self, kb_version: str, terms: Counter) -> Optional[Tuple[str, str]]:
+        candidates = set()
+        for term in terms:
+            candidates.update(k for k in self._index.get(term, ()) if k[0] == kb_version)
+        if not candidates:
+            return None
+
+        query = self._vector(terms)
+        query_norm = math.sqrt(sum(w * w for w in query.values()))
+        best_key, best_score = None, self.similarity
+        for key in candidates:
+            vector = self._vector(self._terms[key])
+            norm = math.sqrt(sum(w * w for w in vector.values()))
+            dot = sum(w * vector.get(term, 0) for term, w in query.items())
+            score = dot / (query_norm * norm) if query_norm and norm else 0
+            if score >= best_score:
+                best_key, best_score = key, score
+        return best_key
+
+    def get(self, question: str, kb_version: str) -> Optional[str]:
+        """Look up a cached answer for a first-turn question."""
+        normalized = normalize_question(question)
+        key = (kb_version, normalized)
+        exact = key in self._entries
+        if not exact and self.similarity > 0:
+            key = self._find_similar(kb_version, _terms(normalized))
+
+        entry = self._entries.get(key) if key else None
+        if entry is None or time.monotonic() - entry[0] >= self.ttl_seconds:
+            if entry is not None:
+                self._remove(key)
+                self._stats["evictions"] += 1
+            self._stats["misses"] += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self._stats["hits" if exact else "similar_hits"] += 1
+        return entry[1]
+
+    def set(self, question: str, kb_version: str, answer: str) -> None:
+        """Store an answer for a first-turn question."""
+        normalized = normalize_question(question)
+        if not normalized:
+            return
+        key = (kb_version, normalized)
+        self._remove(key)
+
+        self._entries[key] = (time.monotonic(), answer)
+        terms = _terms(normalized)
+        self._terms[key] = terms
+        for term in terms:
+            self._index.setdefault(term, set()).add(key)
+
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self._stats["evictions"] += 1
+
+    def clear(self) -> None:
+        """Drop all cached answers."""
+        self._entries.clear()
+        self._terms.clear()
+        self._index.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {**self._stats, "size": len(self._entries)}
+
+
+_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Get or create the response cache."""
+    global _cache
+    if _cache is None:
+        _cache = ResponseCache(
+            max_entries=settings.response_cache_max_entries,
+            ttl_seconds=settings.response_cache_ttl_seconds,
+            similarity=settings.response_cache_similarity
+        )
+    return _cache
@@ -0,0 +1,121 @@
+"""
+Retrieval Service - BM25 index over knowledge base chunks
+"""
+import math
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List
+
+from app.services.tokenizer import estimate_tokens, tokenize
+
+
+@dataclass
+class Chunk:
+    """A self-contained piece of the knowledge base."""
+    section: str
+    text: str
+    # Extra searchable words that are not shown in the prompt
+    keywords: str = ""
+
+
+def chunk_knowledge_base(kb: Dict) -> List[Chunk]:
+    """Split the knowledge base into prompt-ready chunks."""
+    chunks: List[Chunk] = []
+
+    for p in kb.get('projects', []):
+        text = f"- **{p['name']}** ({p.get('year', '')}): {p['description']}\n"
+        text += f"  Teknolojiler: {', '.join(p['tech'])}\n"
+        if p.get('github'):
+            text += f"  GitHub: {p['github']}\n"
+        chunks.append(Chunk("projects", text, "proje project projects"))
+
+    for c in kb.get('certifications', []):
+        text = f"- {c['title']} ({c['organization']}, {c['year']}): {c['description']}\n"
+        chunks.append(Chunk("certifications", text, "sertifika certificate certification"))
+
+    for ca in kb.get('community_activities', []):
+        text = f"- **{ca['title']}** - {ca['organization']} ({ca['period']})\n"
+        text += f"  {ca['description']}\n"
+        if ca.get('skills_gained'):
+            text += f"  Kazanılan yetenekler: {', '.join(ca['skills_gained'])}\n"
+        chunks.append(Chunk(
+            "community_activities", text,
+            "topluluk gönüllü deneyim staj community volunteer experience"
+        ))
+
+    if kb.get('courses'):
+        chunks.append(Chunk(
+            "courses",
+            f"- Üniversite Dersleri: {', '.join(kb['courses'])}\n",
+            "ders kurs eğitim üniversite course education"
+        ))
+
+    education = kb.get('education', {})
+    if education:
+        chunks.append(Chunk(
+            "education",
+            f"- Eğitim: {education.get('degree', '')}, {education.get('university', '')} "
+            f"({education.get('period', '')}), GPA {education.get('gpa', '')}\n",
+            "eğitim okul üniversite mezuniyet not education school"
+        ))
+
+    if kb.get('highlights'):
+        chunks.append(Chunk(
+            "highlights",
+            "".join(f"- {h}\n" for h in kb['highlights']),
+            "öne çıkan fark güçlü highlights different strengths"
+        ))
+
+    return chunks
+
+
+class BM25Index:
+    """Okapi BM25 over a small, static set of chunks."""
+
+    def __init__(self, chunks: List[Chunk], k1: float = 1.5, b: float = 0.75):
+        self.chunks = chunks
+        self.k1 = k1
+        self.b = b
+
+        self._docs = [Counter(tokenize(f"{c.text} {c.keywords}")) for c in chunks]
+        self._lengths = [sum(d.values()) for d in self._docs]
+        self._avg_length = sum(self._lengths) / len(self._docs) if self._docs else 0
+        df = Counter(term for doc in self._docs for term in doc)
+        n = len(self._docs)
+        self._idf = {
+            term: math.log(1 + (n - freq + 0.5) / (freq + 0.5))
+            for term, freq in df.items()
+        }
+
+    def search(self, query: str, k: int) -> List[Chunk]:
+        """Get the top-k chunks for a query, best first."""
+        terms = [t for t in set(tokenize(query)) if t in self._idf]
+        if not terms:
+            return []
+
+        scored = []
+        for i, doc in enumerate(self._docs):
+            score = 0.0
+            norm = self.k1 * (1 - self.b + self.b * self._lengths[i] / self._avg_length)
+            for term in terms:
+                tf = doc.get(term)
+                if tf:
+                    score += self._idf[term] * tf * (self.k1 + 1) / (tf + norm)
+            if score > 0:
+                scored.append((score, i))
+
+        scored.sort(reverse=True)
+        return [self.chunks[i] for _, i in scored[:k]]
+
+
+def assemble_context(chunks: List[Chunk], token_budget: int) -> str:
+    """Join chunks in rank order until the token budget is used up."""
+    parts: List[str] = []
+    used = 0
+    for chunk in chunks:
+        cost = estimate_tokens(chunk.text)
+        if used + cost > token_budget:
+            continue
+        parts.append(chunk.text)
+        used += cost
+    return "\n".join(parts)
@@ -0,0 +1,398 @@
+"""
+Chat Session Store - Bounded storage for conversation history
+"""
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from app.config import settings
+from app.db.database import async_session_maker, dialect_insert
+from app.db.models import ChatSession
+from app.services.history import fold_summary, history_overflow
+
+
+class SessionStore(ABC):
+    """Interface for chat session history backends."""
+
+    @abstractmethod
+    async def get_session(self, session_id: str) -> Tuple[str, List[Dict]]:
+        """
+        Get a session's running summary and stored messages.
+
+        Returns:
+            Tuple of (summary of trimmed turns, messages); empty if unknown
+        """
+
+    async def get_history(self, session_id: str) -> List[Dict]:
+        """Get the stored messages for a session (empty if unknown)."""
+        _, messages = await self.get_session(session_id)
+        return messages
+
+    @abstractmethod
+    async def append(self, session_id: str, messages: List[Dict]) -> None:
+        """
+        Append messages to a session, creating it if needed.
+
+        Messages trimmed to stay within the history limit are folded into
+        the session's running summary.
+        """
+
+    @abstractmethod
+    async def delete(self, session_id: str) -> None:
+        """Remove a session."""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, int]:
+        """Get store metrics."""
+
+    async def close(self) -> None:
+        """Release resources held by the store."""
+
+
+class InMemorySessionStore(SessionStore):
+    """
+    Process-local session store with LRU and TTL eviction.
+
+    Each session keeps at most ``max_history`` messages, and no more than
+    fit into ``token_budget`` tokens, plus a running summary of older
+    ones; each trimmed message is summarized once, when it is trimmed.
+    The store keeps at most ``max_sessions`` sessions. Sessions idle for longer than
+    ``ttl_seconds`` are dropped on access and during inserts.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 1000,
+        ttl_seconds: float = 3600,
+        max_history: int = 20,
+        token_budget: Optional[int] = None
+    ):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.max_history = max_history
+        self.token_budget = token_budget
+
+        # session_id -> (last access time, summary, messages); oldest first
+        self._sessions: "OrderedDict[str, Tuple[float, str, List[Dict]]]" = OrderedDict()
+        self._bytes = 0
+        self._lru_evictions = 0
+        self._ttl_evictions = 0
+        self._folded_messages = 0
+
+    @staticmethod
+    def _size(summary: str, messages: List[Dict]) -> int:
+        """Approximate payload size of a session in bytes."""
+        return len(summary.encode("utf-8")) + sum(len(m["content"].encode("utf-8")) for m in messages)
+
+    def _remove(self, session_id: str) -> None:
+        _, summary, messages = self._sessions.pop(session_id)
+        self._bytes -= self._size(summary, messages)
+
+    def _evict_expired(self, now: float) -> None:
+        """Drop idle sessions, oldest first."""
+        while self._sessions:
+            session_id, (accessed_at, _, _) = next(iter(self._sessions.items()))
+            if now - accessed_at < self.ttl_seconds:
+                break
+            self._remove(session_id)
+            self._ttl_evictions += 1
+
+    def _lookup(self, session_id: str, now: float) -> Optional[Tuple[str, List[Dict]]]:
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            return None
+        if now - entry[0] >= self.ttl_seconds:
+            self._remove(session_id)
+            self._ttl_evictions += 1
+            return None
+        return entry[1], entry[2]
+
+    async def get_session(self, session_id: str) -> Tuple[str, List[Dict]]:
+        now = time.monotonic()
+        found = self._lookup(session_id, now)
+        if found is None:
+            return "", []
+        summary, messages = found
+        self._sessions[session_id] = (now, summary, messages)
+        self._sessions.move_to_end(session_id)
+        return summary, list(messages)
+
+    def fold_overflow(self, summary: str, messages: List[Dict]) -> Tuple[str, List[Dict]]:
+        """Fold messages beyond the history or token limit into the summary."""
+        overflow = len(messages) - self.max_history
+        if self.token_budget is not None:
+            overflow = max(overflow, history_overflow(messages, self.token_budget))
+        if overflow <= 0:
+            return summary, messages
+        self._folded_messages += overflow
+        return fold_summary(summary, messages[:overflow]), messages[overflow:]
+
+    def _store(self, session_id: str, summary: str, messages: List[Dict], now: float) -> None:
+        """Save a session, folding messages beyond the limit into its summary."""
+        summary, messages = self.fold_overflow(summary, messages)
+        self._bytes += self._size(summary, messages)
+        self._sessions[session_id] = (now, summary, messages)
+        self._sessions.move_to_end(session_id)
+
+        while len(self._sessions) > self.max_sessions:
+            self._remove(next(iter(self._sessions)))
+            self._lru_evictions += 1
+
+    async def append(self, session_id: str, messages: List[Dict]) -> None:
+        now = time.monotonic()
+        self._evict_expired(now)
+
+        found = self._lookup(session_id, now)
+        if found is None:
+            summary, history = "", []
+        else:
+            summary, history = found
+            self._bytes -= self._size(summary, history)
+
+        self._store(session_id, summary, history + messages, now)
+
+    async def replace(self, session_id: str, summary: str, messages: List[Dict]) -> None:
+        """Overwrite a session with a copy loaded from elsewhere."""
+        await self.delete(session_id)
+        self._store(session_id, summary, list(messages), time.monotonic())
+
+    async def delete(self, session_id: str) -> None:
+        if session_id in self._sessions:
+            self._remove(session_id)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "sessions": len(self._sessions),
+            "messages": sum(len(m) for _, _, m in self._sessions.values()),
+            "content_bytes": self._bytes,
+            "folded_messages": self._folded_messages,
+            "lru_evictions": self._lru_evictions,
+            "ttl_evictions": self._ttl_evictions,
+        }
+
+
+class DatabaseSessionStore(SessionStore):
+    """
+    Session store backed by the ``chat_sessions`` table, shared by all
+    workers and surviving restarts.
+
+    Reads go to the database (bounded by ``read_timeout``) and populate an
+    in-process cache; on timeout or error the cached history is served
+    instead. Writes land in the cache immediately and only the new
+    messages are queued; a background task appends them, in batches, to
+    the stored rows under a row lock. Workers therefore never overwrite
+    each other's turns, and writes never add latency to a turn.
+    """
+
+    def __init__(
+        self,
+        cache: InMemorySessionStore,
+        read_timeout: float = 0.2,
+        cache_ttl: float = 0,
+        flush_interval: float = 0.5,
+        batch_size: int = 50
+    ):
+        self.cache = cache
+        self.read_timeout = read_timeout
+        self.cache_ttl = cache_ttl
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+
+        # session_id -> messages appended here but not yet written
+        self._pending: Dict[str, List[Dict]] = {}
+        # session_id -> time the cached copy was last known fresh; oldest first
+        self._fresh_at: "OrderedDict[str, float]" = OrderedDict()
+        self._flush_event = asyncio.Event()
+        self._flusher: Optional[asyncio.Task] = None
+        self._db_reads = 0
+        self._cache_reads = 0
+        self._read_fallbacks = 0
+        self._flushes = 0
+        self._rows_written = 0
+        self._flush_errors = 0
+
+    def _mark_fresh(self, session_id: str, now: float) -> None:
+        self._fresh_at[session_id] = now
+        self._fresh_at.move_to_end(session_id)
+        while len(self._fresh_at) > self.cache.max_sessions:
+            self._fresh_at.popitem(last=False)
+
+    async def _read(self, session_id: str) -> Optional[Tuple[Optional[str], List[Dict]]]:
+        async with async_session_maker() as db:
+            result = await db.execute(
+                select(ChatSession.summary, ChatSession.messages)
+                .where(ChatSession.session_id == session_id)
+            )
+            return result.one_or_none()
+
+    async def get_session(self, session_id: str) -> Tuple[str, List[Dict]]:
+        now = time.monotonic()
+        fresh_at = self._fresh_at.get(session_id)
+        if fresh_at is not None and now - fresh_at < self.cache_ttl:
+            self._cache_reads += 1
+            return await self.cache.get_session(session_id)
+
+        try:
+            row = await asyncio.wait_for(self._read(session_id), self.read_timeout)
+        except Exception as e:
+            # Slow or failing database: answer from whatever we have
+            print(f"Chat session read failed: {e!r}")
+            self._read_fallbacks += 1
+            return await self.cache.get_session(session_id)
+
+        self._db_reads += 1
+        summary, messages = (row[0] or "", row[1] or []) if row is not None else ("", [])
+        # Messages appended here but not flushed yet come after the stored ones
+        messages = messages + self._pending.get(session_id, [])
+        if messages or summary:
+            await self.cache.replace(session_id, summary, messages)
+        else:
+            await self.cache.delete(session_id)
+        self._mark_fresh(session_id, now)
+        return await self.cache.get_session(session_id)
+
+    async def append(self, session_id: str, messages: List[Dict]) -> None:
+        await self.cache.append(session_id, messages)
+        self._pending.setdefault(session_id, []).extend(messages)
+        self._mark_fresh(session_id, time.monotonic())
+
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_loop())
+        if len(self._pending) >= self.batch_size:
+            self._flush_event.set()
+
+    async def delete(self, session_id: str) -> None:
+        self._pending.pop(session_id, None)
+        self._fresh_at.pop(session_id, None)
+        await self.cache.delete(session_id)
+        async with async_session_maker() as db:
+            row = await db.scalar(
+                select(ChatSession).where(ChatSession.session_id == session_id)
+            )
+            if row is not None:
+                await db.delete(row)
+                await db.commit()
+
+    async def _lock_rows(self, db, session_ids: List[str]) -> Dict[str, ChatSession]:
+        """Create missing session rows and lock all of them for update."""
+        await db.execute(
+            dialect_insert(ChatSession)
+            .values([{"session_id": sid, "messages": []} for sid in session_ids])
+            .on_conflict_do_nothing(index_elements=[ChatSession.session_id])
+        )
+        result = await db.execute(
+            select(ChatSession)
+            .where(ChatSession.session_id.in_(session_ids))
+            .order_by(ChatSession.session_id)
+            .with_for_update()
+        )
+        return {row.session_id: row for row in result.scalars()}
+
+    async def flush(self) -> None:
+        """Append all pending messages to their sessions in one transaction."""
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, {}
+        now = datetime.utcnow()
+        merged: Dict[str, Tuple[str, List[Dict]]] = {}
+        try:
+            async with async_session_maker() as db:
+                rows = await self._lock_rows(db, sorted(batch))
+                for session_id, messages in batch.items():
+                    row = rows[session_id]
+                    summary, stored = self.cache.fold_overflow(
+                        row.summary or "", (row.messages or []) + messages
+                    )
+                    row.summary = summary or None
+                    row.messages = stored
+                    row.updated_at = now
+                    merged[session_id] = (summary, stored)
+                await db.commit()
+        except asyncio.CancelledError:
+            self._requeue(batch)
+            raise
+        except Exception as e:
+            print(f"Chat session flush failed: {e!r}")
+            self._flush_errors += 1
+            self._requeue(batch)
+            return
+        self._flushes += 1
+        self._rows_written += len(batch)
+
+        # Pick up turns other workers wrote, unless more were appended here since
+        for session_id, (summary, messages) in merged.items():
+            if session_id not in self._pending:
+                await self.cache.replace(session_id, summary, messages)
+
+    def _requeue(self, batch: Dict[str, List[Dict]]) -> None:
+        """Put unwritten messages back in front of ones appended since."""
+        for session_id, messages in batch.items():
+            self._pending[session_id] = messages + self._pending.get(session_id, [])
+
+    async def _flush_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_event.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_event.clear()
+            await self.flush()
+
+    async def close(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        await self.flush()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            **self.cache.stats(),
+            "pending_writes": len(self._pending),
+            "db_reads": self._db_reads,
+            "cache_reads": self._cache_reads,
+            "read_fallbacks": self._read_fallbacks,
+            "flushes": self._flushes,
+            "rows_written": self._rows_written,
+            "flush_errors": self._flush_errors,
+        }
+
+
+_store: Optional[SessionStore] = None
+
+
+def get_session_store() -> SessionStore:
+    """Get or create the configured session store."""
+    global _store
+    if _store is None:
+        memory_store = InMemorySessionStore(
+            max_sessions=settings.chat_max_sessions,
+            ttl_seconds=settings.chat_session_ttl_seconds,
+            max_history=settings.chat_history_max_messages,
+            token_budget=settings.chat_history_token_budget
+        )
+        if settings.chat_session_backend == "database":
+            _store = DatabaseSessionStore(
+                cache=memory_store,
+                read_timeout=settings.chat_session_read_timeout_seconds,
+                cache_ttl=settings.chat_session_cache_ttl_seconds,
+                flush_interval=settings.chat_session_flush_interval_seconds,
+                batch_size=settings.chat_session_flush_batch_size
+            )
+        else:
+            _store = memory_store
+    return _store
+
+
+def set_session_store(store: SessionStore) -> None:
+    """Replace the session store (e.g. with a shared backend)."""
+    global _store
+    _store = store
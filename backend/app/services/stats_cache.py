@@ -0,0 +1,121 @@
+"""
+Stats Cache - Short-lived, single-flight cache for computed results
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from app.config import settings
+
+
+class SingleFlightCache:
+    """
+    TTL cache where concurrent misses for the same key share one
+    computation.
+
+    The computation runs in its own task, so cancelling the request that
+    started it does not fail the others waiting on it. ``invalidate()``
+    bumps a generation counter: entries from an older generation are
+    treated as misses, and computations started before the bump are
+    returned to their waiters but not stored.
+    """
+
+    def __init__(self, ttl_seconds: float = 30):
+        self.ttl_seconds = ttl_seconds
+
+        # key -> (stored at, generation, value)
+        self._entries: Dict[Hashable, Tuple[float, int, Any]] = {}
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self._generation = 0
+        self._invalidated_at: Optional[float] = None
+        self._stats = {
+            "hits": 0, "misses": 0, "shared": 0, "invalidations": 0, "throttled_invalidations": 0
+        }
+
+    async def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, float]:
+        """
+        Get a cached value or compute it.
+
+        Returns:
+            Tuple of (value, age of the value in seconds)
+        """
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None:
+            stored_at, generation, value = entry
+            if generation == self._generation and now - stored_at < self.ttl_seconds:
+                self._stats["hits"] += 1
+                return value, now - stored_at
+            del self._entries[key]
+
+        task = self._in_flight.get(key)
+        if task is not None:
+            self._stats["shared"] += 1
+        else:
+            self._stats["misses"] += 1
+            task = asyncio.create_task(self._compute(key, compute, self._generation))
+            task.add_done_callback(_retrieve_exception)
+            self._in_flight[key] = task
+        return await asyncio.shield(task), 0.0
+
+    async def _compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[Any]],
+        generation: int
+    ) -> Any:
+        try:
+            value = await compute()
+            if generation == self._generation:
+                self._entries[key] = (time.monotonic(), generation, value)
+            return value
+        finally:
+            self._in_flight.pop(key, None)
+
+    def invalidate(self, throttled: bool = False) -> None:
+        """
+        Mark every cached value as stale.
+
+        Args:
+            throttled: Skip the invalidation if the last one was less than
+                ``ttl_seconds`` ago. For frequent writers, where entries
+                expiring on their own already bound staleness to the TTL.
+        """
+        now = time.monotonic()
+        if (
+            throttled
+            and self._invalidated_at is not None
+            and now - self._invalidated_at < self.ttl_seconds
+        ):
+            self._stats["throttled_invalidations"] += 1
+            return
+        self._invalidated_at = now
+        self._generation += 1
+        self._entries.clear()
+        self._stats["invalidations"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._stats["hits"] + self._stats["misses"] + self._stats["shared"]
+        hit_rate = (self._stats["hits"] + self._stats["shared"]) / lookups if lookups else 0
+        return {**self._stats, "size": len(self._entries), "hit_rate": round(hit_rate, 3)}
+
+
+def _retrieve_exception(task: asyncio.Task) -> None:
+    """Mark a failure as retrieved so one nobody awaited is not logged."""
+    if not task.cancelled():
+        task.exception()
+
+
+_stats_cache: Optional[SingleFlightCache] = None
+
+
+def get_stats_cache() -> SingleFlightCache:
+    """Get or create the analytics stats cache."""
+    global _stats_cache
+    if _stats_cache is None:
+        _stats_cache = SingleFlightCache(ttl_seconds=settings.analytics_stats_cache_ttl_seconds)
+    return _stats_cache
@@ -0,0 +1,30 @@
+"""
+Tokenizer Utilities - Local approximations, no model download required
+"""
+import re
+import unicodedata
+from typing import List
+
+
+_WORD = re.compile(r"\w+")
+
+# Turkish is agglutinative ("projeleri", "projelerin", "proje"); keeping a
+# fixed-length prefix is a cheap, well-known stand-in for a real stemmer.
+STEM_LENGTH = 5
+
+# Llama-family tokenizers average roughly 3-4 characters per token on
+# mixed Turkish/English text; err on the high side.
+CHARS_PER_TOKEN = 3.5
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase, prefix-stemmed terms for retrieval."""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return [word[:STEM_LENGTH] for word in _WORD.findall(text)]
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the LLM token count of a piece of text."""
+    if not text:
+        return 0
+    return int(len(text) / CHARS_PER_TOKEN) + 1
@@ -0,0 +1,192 @@
+"""
+Translation Store - Cached, atomically written translation files
+"""
+import asyncio
+import copy
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.config import settings
+
+
+# backend/app/services -> repository root
+DEFAULT_MESSAGES_DIR = Path(__file__).resolve().parents[3] / "frontend" / "messages"
+
+LANGUAGES = ("tr", "en")
+
+
+class VersionConflictError(Exception):
+    """The document changed since the version the caller based its update on."""
+
+    def __init__(self, current_version: str):
+        super().__init__(f"Translations are at version {current_version}")
+        self.current_version = current_version
+
+
+@dataclass
+class TranslationDocument:
+    """A parsed translation file and what it was parsed from."""
+    data: Dict[str, Any]
+    version: str
+    mtime_ns: int
+    size: int
+
+
+def _serialize(data: Dict[str, Any]) -> bytes:
+    return json.dumps(data, ensure_ascii=False, indent=4).encode("utf-8")
+
+
+def _version(raw: bytes) -> str:
+    return hashlib.sha256(raw).hexdigest()
+
+
+def _atomic_write(path: Path, raw: bytes) -> None:
+    """Write via a temp file in the same directory, fsync, then rename over the target."""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(raw)
+            f.flush()
+            os.fsync(f.fileno())
+        if path.exists():
+            os.chmod(tmp_path, path.stat().st_mode & 0o777)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    # Make the rename itself durable
+    dir_fd = os.open(path.parent, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+class TranslationStore:
+    """
+    Per-language translation documents served from memory.
+
+    A cached document is revalidated against the file's mtime and size on
+    every read; when they change, the file is re-read and only re-parsed
+    if its content hash differs. Writes hold a per-language lock, apply the
+    change to a copy of the current document and replace the file
+    atomically, so concurrent updates never lose each other's changes and
+    a crash never leaves a partial file.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+
+        self._documents: Dict[str, TranslationDocument] = {}
+        self._locks: Dict[str, asyncio.Lock] = {lang: asyncio.Lock() for lang in LANGUAGES}
+        self._stats = {"hits": 0, "loads": 0, "writes": 0}
+
+    def path(self, lang: str) -> Path:
+        return self.directory / f"{lang}.json"
+
+    def _load(self, lang: str) -> TranslationDocument:
+        """Return the cached document, reloading it if the file changed."""
+        path = self.path(lang)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return TranslationDocument(data={}, version=_version(b""), mtime_ns=0, size=0)
+
+        cached = self._documents.get(lang)
+        if cached and (cached.mtime_ns, cached.size) == (stat.st_mtime_ns, stat.st_size):
+            self._stats["hits"] += 1
+            return cached
+
+        raw = path.read_bytes()
+        version = _version(raw)
+        if cached and cached.version == version:
+            document = TranslationDocument(cached.data, version, stat.st_mtime_ns, stat.st_size)
+        else:
+            document = TranslationDocument(json.loads(raw), version, stat.st_mtime_ns, stat.st_size)
+            self._stats["loads"] += 1
+        self._documents[lang] = document
+        return document
+
+    async def document(self, lang: str) -> TranslationDocument:
+        """
+        Get a language's cached document with its version and file mtime.
+
+        The document's data is shared with the cache and must not be mutated.
+        """
+        return self._load(lang)
+
+    async def get(self, lang: str) -> Tuple[Dict[str, Any], str]:
+        """
+        Get a language's translations.
+
+        The returned dict is shared with the cache and must not be mutated.
+
+        Returns:
+            Tuple of (translations, version)
+        """
+        document = self._load(lang)
+        return document.data, document.version
+
+    async def update(
+        self,
+        lang: str,
+        change: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]],
+        expected_version: Optional[str] = None
+    ) -> str:
+        """
+        Apply a change to a language's translations and persist it.
+
+        ``change`` receives a private copy of the current document and may
+        modify it in place or return a replacement. If it raises, nothing
+        is written. A change that leaves the document as it was is not
+        written either.
+
+        Raises:
+            VersionConflictError: If ``expected_version`` is given and the
+                document is at a different version
+
+        Returns:
+            The new version
+        """
+        async with self._locks[lang]:
+            current = self._load(lang)
+            if expected_version is not None and expected_version != current.version:
+                raise VersionConflictError(current.version)
+            data = copy.deepcopy(current.data)
+            result = change(data)
+            if result is not None:
+                data = result
+
+            raw = _serialize(data)
+            if _version(raw) == current.version:
+                return current.version
+            path = self.path(lang)
+            await asyncio.to_thread(_atomic_write, path, raw)
+            stat = path.stat()
+            document = TranslationDocument(data, _version(raw), stat.st_mtime_ns, stat.st_size)
+            self._documents[lang] = document
+            self._stats["writes"] += 1
+            return document.version
+
+    def stats(self) -> Dict[str, int]:
+        return {**self._stats, "cached": len(self._documents)}
+
+
+_store: Optional[TranslationStore] = None
+
+
+def get_translation_store() -> TranslationStore:
+    """Get or create the translation store."""
+    global _store
+    if _store is None:
+        directory = Path(settings.translations_dir) if settings.translations_dir else DEFAULT_MESSAGES_DIR
+        _store = TranslationStore(directory)
+    return _store
@@ -0,0 +1,52 @@
+"""
+Shared benchmark setup
+"""
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.db import database
+from app.db.database import Base, create_engine, use_engine
+
+
+def database_url(name: str) -> str:
+    """
+    ``BENCH_DATABASE_URL`` (a database the benchmark may wipe), or a new
+    SQLite file in a temporary directory.
+    """
+    if os.environ.get("BENCH_DATABASE_URL"):
+        return os.environ["BENCH_DATABASE_URL"]
+    return f"sqlite+aiosqlite:///{tempfile.mkdtemp(prefix='bench-')}/{name}.db"
+
+
+async def fresh_database(url: str) -> AsyncEngine:
+    """Bind the app to an emptied database with all tables created."""
+    engine = create_engine(url)
+    use_engine(engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await database.create_tables()
+    return engine
+
+
+@contextmanager
+def timer() -> Iterator[List[float]]:
+    """Measure the block's wall time in seconds (read ``[0]`` after it exits)."""
+    elapsed = [0.0]
+    started = time.perf_counter()
+    try:
+        yield elapsed
+    finally:
+        elapsed[0] = time.perf_counter() - started
+
+
+def percentile(samples: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile, in milliseconds."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))] * 1000
@@ -0,0 +1,96 @@
+"""
+Concurrent analytics ingest and stats reads on SQLite, with the default
+rollback journal vs the configured performance profile (WAL).
+
+A writer flushes a batch of page views every 50 ms while readers run
+exact /stats computations (scans of page_views) back to back.
+
+    python -m benchmarks.concurrency [--rows 100000] [--seconds 10] [--readers 2]
+"""
+import argparse
+import asyncio
+import time
+
+from app.api.v1.endpoints.analytics import _compute_stats
+from app.config import settings
+from app.services.analytics_buffer import PageViewBuffer
+from benchmarks.common import database_url, fresh_database, percentile, timer
+from benchmarks.stats import seed
+
+
+# SQLite's own defaults, as the engine ran before the profile existed
+DEFAULT_PROFILE = {
+    "sqlite_journal_mode": "DELETE",
+    "sqlite_synchronous": "FULL",
+    "sqlite_busy_timeout_ms": 0,
+}
+
+BATCH_ROWS = 200
+
+
+async def run(seconds: float, readers: int) -> None:
+    buffer = PageViewBuffer(max_size=1000000)
+    deadline = time.perf_counter() + seconds
+    flushes = []
+    reads = []
+    read_errors = 0
+
+    async def writer() -> None:
+        i = 0
+        while time.perf_counter() < deadline:
+            await buffer.add_many([
+                {"page_path": f"/page-{n % 40}", "visitor_id": f"new-{n}", "user_agent": "bench"}
+                for n in range(i, i + BATCH_ROWS)
+            ])
+            i += BATCH_ROWS
+            with timer() as elapsed:
+                await buffer.flush()
+            flushes.append(elapsed[0])
+            await asyncio.sleep(0.05)
+
+    async def reader() -> None:
+        nonlocal read_errors
+        while time.perf_counter() < deadline:
+            with timer() as elapsed:
+                try:
+                    await _compute_stats(365, exact=True)
+                except Exception:
+                    read_errors += 1
+            reads.append(elapsed[0])
+
+    await asyncio.gather(writer(), *(reader() for _ in range(readers)))
+    stats = buffer.stats()
+    print(
+        f"  writes: {len(flushes)} flushes, {stats['written']} rows, "
+        f"{stats['flush_errors']} failed; p50 {percentile(flushes, 0.5):.0f} ms, "
+        f"p99 {percentile(flushes, 0.99):.0f} ms, max {max(flushes) * 1000:.0f} ms"
+    )
+    print(
+        f"  reads:  {len(reads)} stats, {read_errors} failed; "
+        f"p50 {percentile(reads, 0.5):.0f} ms, max {max(reads) * 1000:.0f} ms"
+    )
+
+
+async def main(rows: int, seconds: float, readers: int) -> None:
+    if not database_url("concurrency").startswith("sqlite"):
+        raise SystemExit("This benchmark compares SQLite journal modes; unset BENCH_DATABASE_URL")
+    configured = {name: getattr(settings, name) for name in DEFAULT_PROFILE}
+    for label, profile in (("default (rollback journal)", DEFAULT_PROFILE), ("configured", configured)):
+        for name, value in profile.items():
+            setattr(settings, name, value)
+        print(f"{label}: {', '.join(f'{k[7:]}={v}' for k, v in profile.items())}")
+        engine = await fresh_database(database_url("concurrency"))
+        await seed(rows)
+        await run(seconds, readers)
+        await engine.dispose()
+    for name, value in configured.items():
+        setattr(settings, name, value)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--readers", type=int, default=2)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.seconds, args.readers))
@@ -0,0 +1,64 @@
+"""
+Page view ingest rate: one INSERT and commit per view (as before the
+write buffer) vs the buffered, batched writer.
+
+    python -m benchmarks.ingest [--rows 5000]
+"""
+import argparse
+import asyncio
+
+from sqlalchemy import func, select
+
+from app.db.database import async_session_maker
+from app.db.models import PageView
+from app.services.analytics_buffer import PageViewBuffer
+from benchmarks.common import database_url, fresh_database, timer
+
+
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64; rv:120.0) Gecko/20100101 Firefox/120.0"
+
+
+def _row(i: int) -> dict:
+    return {
+        "page_path": f"/page-{i % 20}",
+        "visitor_id": f"v{i % 1000}",
+        "user_agent": USER_AGENT,
+        "referrer": "https://github.com/" if i % 4 == 0 else None,
+    }
+
+
+async def per_row(rows: int) -> float:
+    """Rows per second with a transaction per page view."""
+    with timer() as elapsed:
+        for i in range(rows):
+            async with async_session_maker() as db:
+                db.add(PageView(**_row(i)))
+                await db.commit()
+    return rows / elapsed[0]
+
+
+async def buffered(rows: int) -> float:
+    """Rows per second through the write buffer, including the final flush."""
+    buffer = PageViewBuffer(max_size=rows)
+    buffer.start()
+    with timer() as elapsed:
+        for i in range(rows):
+            await buffer.add(_row(i))
+        await buffer.close()
+    return rows / elapsed[0]
+
+
+async def main(rows: int) -> None:
+    for name, run in (("per-row commit", per_row), ("buffered", buffered)):
+        engine = await fresh_database(database_url("ingest"))
+        rate = await run(rows)
+        async with async_session_maker() as db:
+            written = await db.scalar(select(func.count(PageView.id)))
+        await engine.dispose()
+        print(f"{name:>15}: {rate:8.0f} rows/s ({written} rows written)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    asyncio.run(main(parser.parse_args().rows))
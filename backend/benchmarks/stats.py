@@ -0,0 +1,110 @@
+"""
+/analytics/stats cost over a large page_views table: the original raw
+scans vs the rollup-backed computation.
+
+    python -m benchmarks.stats [--rows 1000000] [--days 365 30 1]
+"""
+import argparse
+import asyncio
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, insert, select
+
+from app.api.v1.endpoints.analytics import _compute_stats
+from app.db.database import async_session_maker
+from app.db.models import PageView, ReferrerHost, UserAgent
+from app.services.analytics_rollups import backfill_dimension_rollups, backfill_rollups
+from benchmarks.common import database_url, fresh_database, timer
+
+
+SEED_CHUNK = 50000
+
+
+async def seed(rows: int) -> None:
+    """Spread ``rows`` page views over the past year, then build the rollups."""
+    now = datetime.utcnow()
+    rng = random.Random(0)
+    async with async_session_maker() as db:
+        await db.execute(insert(UserAgent), [
+            {"value": f"agent-{i}", "browser": browser, "os": "Linux", "device": "desktop"}
+            for i, browser in enumerate(["Firefox", "Chrome", "Safari", "Edge"])
+        ])
+        await db.execute(insert(ReferrerHost), [{"host": f"site{i}.example"} for i in range(20)])
+        ua_ids = list((await db.scalars(select(UserAgent.id))).all())
+        host_ids = list((await db.scalars(select(ReferrerHost.id))).all())
+        for start in range(0, rows, SEED_CHUNK):
+            await db.execute(insert(PageView), [
+                {
+                    "page_path": f"/page-{i % 40}",
+                    "project_slug": f"project-{i % 15}" if i % 3 else None,
+                    "visitor_id": f"v{rng.randrange(max(1, rows // 5))}",
+                    "user_agent_id": rng.choice(ua_ids),
+                    "referrer_host_id": rng.choice(host_ids) if i % 4 == 0 else None,
+                    "created_at": now - timedelta(seconds=rng.randrange(365 * 86400)),
+                }
+                for i in range(start, min(rows, start + SEED_CHUNK))
+            ])
+        await db.commit()
+
+    async with async_session_maker() as db:
+        with timer() as elapsed:
+            await backfill_rollups(db)
+            await backfill_dimension_rollups(db)
+            await db.commit()
+    print(f"rollups built from {rows} rows in {elapsed[0]:.1f}s")
+
+
+async def raw_stats(days: int) -> None:
+    """The stats queries as they ran before the rollups: scans of page_views."""
+    since = datetime.utcnow() - timedelta(days=days)
+    views = func.count(PageView.id)
+    async with async_session_maker() as db:
+        await db.scalar(select(views).where(PageView.created_at >= since))
+        await db.scalar(
+            select(func.count(func.distinct(PageView.visitor_id)))
+            .where(PageView.created_at >= since, PageView.visitor_id.isnot(None))
+        )
+        for column in (PageView.page_path, PageView.project_slug):
+            await db.execute(
+                select(column, views)
+                .where(PageView.created_at >= since, column.isnot(None))
+                .group_by(column)
+                .order_by(views.desc())
+                .limit(10)
+            )
+        for model, column in (
+            (UserAgent.browser, PageView.user_agent_id),
+            (ReferrerHost.host, PageView.referrer_host_id),
+        ):
+            await db.execute(
+                select(model, views)
+                .join(model.class_, column == model.class_.id)
+                .where(PageView.created_at >= since)
+                .group_by(model)
+                .order_by(views.desc())
+                .limit(10)
+            )
+
+
+async def main(rows: int, days_list) -> None:
+    engine = await fresh_database(database_url("stats"))
+    await seed(rows)
+    for days in days_list:
+        with timer() as raw:
+            await raw_stats(days)
+        with timer() as rollups:
+            await _compute_stats(days, exact=False)
+        print(
+            f"days={days:<3}  raw scans: {raw[0] * 1000:7.0f} ms"
+            f"   rollups: {rollups[0] * 1000:7.0f} ms"
+        )
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--days", type=int, nargs="+", default=[365, 30, 1])
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.days))
@@ -0,0 +1,142 @@
+"""
+Local fake upstream services, served over real HTTP on a free port
+"""
+import asyncio
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import AsyncIterator, Iterator, List, Optional, Set
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+
+@contextmanager
+def serve(app) -> Iterator[str]:
+    """Run an ASGI app with uvicorn in a background thread; yields its base URL."""
+    server = uvicorn.Server(uvicorn.Config(
+        app, host="127.0.0.1", port=0, log_level="warning", lifespan="off"
+    ))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not server.started:
+        if time.monotonic() > deadline:
+            raise RuntimeError("Fake server did not start")
+        time.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
+
+
+class FakeLLM:
+    """
+    OpenAI-compatible chat completions endpoint that answers after
+    ``delay`` seconds; streamed answers come one word per chunk.
+    """
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.app = Starlette(routes=[
+            Route("/openai/v1/chat/completions", self.completions, methods=["POST"]),
+        ])
+
+    async def completions(self, request: Request) -> JSONResponse:
+        body = await request.json()
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        question = body["messages"][-1]["content"]
+        if body.get("stream"):
+            return StreamingResponse(
+                self._chunks(body["model"], f"Yanıt: {question}"),
+                media_type="text/event-stream"
+            )
+        return JSONResponse({
+            "id": f"chatcmpl-{self.requests}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body["model"],
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": f"Yanıt: {question}"},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+        })
+
+
+    async def _chunks(self, model: str, answer: str) -> AsyncIterator[str]:
+        words = answer.split(" ")
+        for i, word in enumerate(words):
+            chunk = {
+                "id": f"chatcmpl-{self.requests}",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "delta": {"content": word if i == 0 else " " + word},
+                    "finish_reason": "stop" if i == len(words) - 1 else None,
+                }],
+            }
+            yield f"data: {json.dumps(chunk)}\n\n"
+        yield "data: [DONE]\n\n"
+
+
+class FakeResend:
+    """
+    Resend email API. Requests fail with 500 while ``down`` is set, and
+    emails replying to an address in ``rejected`` fail validation (422),
+    which fails the whole batch they are sent in.
+    """
+
+    def __init__(self):
+        self.down = False
+        self.rejected: Set[str] = set()
+        # reply_to addresses of each request, in order
+        self.batches: List[List[str]] = []
+        self.singles: List[str] = []
+        self.app = Starlette(routes=[
+            Route("/emails", self.send, methods=["POST"]),
+            Route("/emails/batch", self.send_batch, methods=["POST"]),
+        ])
+
+    def _error(self, emails: List[dict]) -> Optional[JSONResponse]:
+        if self.down:
+            return JSONResponse(
+                {"statusCode": 500, "name": "application_error", "message": "Unavailable"},
+                status_code=500
+            )
+        if any(email["reply_to"] in self.rejected for email in emails):
+            return JSONResponse(
+                {"statusCode": 422, "name": "validation_error", "message": "Invalid email"},
+                status_code=422
+            )
+        return None
+
+    async def send(self, request: Request) -> JSONResponse:
+        email = await request.json()
+        self.singles.append(email["reply_to"])
+        return self._error([email]) or JSONResponse({"id": f"email-{len(self.singles)}"})
+
+    async def send_batch(self, request: Request) -> JSONResponse:
+        emails = await request.json()
+        self.batches.append([email["reply_to"] for email in emails])
+        return self._error(emails) or JSONResponse(
+            {"data": [{"id": f"batch-{i}"} for i in range(len(emails))]}
+        )
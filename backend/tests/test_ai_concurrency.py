@@ -0,0 +1,108 @@
+"""
+Chat completions against a slow fake LLM server
+"""
+import asyncio
+import json
+import time
+
+import pytest
+
+from app.config import settings
+from app.services import response_cache
+from app.services.ai_service import create_completion
+from app.services.session_store import get_session_store
+from tests.fake_servers import FakeLLM, serve
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    llm = FakeLLM(delay=1.0)
+    with serve(llm.app) as url:
+        monkeypatch.setattr(settings, "groq_api_key", "test-key")
+        monkeypatch.setattr(settings, "groq_base_url", url)
+        monkeypatch.setattr(settings, "groq_max_retries", 0)
+        monkeypatch.setattr(settings, "response_cache_enabled", False)
+        yield llm
+
+
+async def test_other_endpoints_respond_while_completions_are_slow(fake_llm, client, monkeypatch):
+    monkeypatch.setattr(settings, "groq_max_concurrency", 4)
+    chats = [
+        asyncio.create_task(client.post("/api/v1/chat", json={"message": f"Soru {i}?"}))
+        for i in range(8)
+    ]
+    await asyncio.sleep(0.3)
+
+    latencies = []
+    for _ in range(10):
+        started = time.perf_counter()
+        r = await client.get("/api/v1/chat/suggestions")
+        latencies.append(time.perf_counter() - started)
+        assert r.status_code == 200
+    assert not any(task.done() for task in chats)
+    assert max(latencies) < 0.2
+
+    responses = await asyncio.gather(*chats)
+    assert [r.json()["response"] for r in responses] == [f"Yanıt: Soru {i}?" for i in range(8)]
+    # The semaphore caps upstream concurrency
+    assert fake_llm.max_in_flight == 4
+
+
+async def test_timeout_covers_waiting_for_a_slot(fake_llm, monkeypatch):
+    monkeypatch.setattr(settings, "groq_max_concurrency", 1)
+    monkeypatch.setattr(settings, "groq_timeout_seconds", 1.5)
+    messages = [{"role": "user", "content": "merhaba"}]
+
+    started = time.perf_counter()
+    first, second = await asyncio.gather(
+        create_completion(messages), create_completion(messages), return_exceptions=True
+    )
+    elapsed = time.perf_counter() - started
+
+    assert first.choices[0].message.content == "Yanıt: merhaba"
+    # Queued behind a 1 s call, the second one cannot finish within 1.5 s
+    assert isinstance(second, asyncio.TimeoutError)
+    assert elapsed < 1.8
+
+
+def _sse_events(text):
+    """Parse a server-sent event stream into (event, data) pairs."""
+    events = []
+    for block in text.strip().split("\n\n"):
+        event, data = block.split("\n")
+        events.append((event.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return events
+
+
+async def test_stream_sends_tokens_as_events_and_saves_the_turn(fake_llm, client, monkeypatch):
+    monkeypatch.setattr(settings, "groq_max_concurrency", 4)
+    fake_llm.delay = 0
+
+    r = await client.post("/api/v1/chat/stream", json={"message": "Nasılsın?", "session_id": "s1"})
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/event-stream")
+    events = _sse_events(r.text)
+    assert events[0] == ("session", {"session_id": "s1"})
+    assert events[-1] == ("done", {})
+    tokens = [data["content"] for event, data in events[1:-1]]
+    assert tokens == ["Yanıt:", " Nasılsın?"]
+
+    assert await get_session_store().get_history("s1") == [
+        {"role": "user", "content": "Nasılsın?"},
+        {"role": "assistant", "content": "Yanıt: Nasılsın?"},
+    ]
+
+
+async def test_repeated_first_turn_questions_are_answered_from_cache(fake_llm, client, monkeypatch):
+    monkeypatch.setattr(settings, "response_cache_enabled", True)
+    monkeypatch.setattr(response_cache, "_cache", None)
+    fake_llm.delay = 0
+
+    first = await client.post("/api/v1/chat", json={"message": "Kariyer hedeflerin neler?", "session_id": "a"})
+    again = await client.post("/api/v1/chat", json={"message": "kariyer hedeflerin neler", "session_id": "b"})
+    assert again.json()["response"] == first.json()["response"] == "Yanıt: Kariyer hedeflerin neler?"
+    assert fake_llm.requests == 1
+
+    # Mid-conversation turns depend on the history and always go upstream
+    await client.post("/api/v1/chat", json={"message": "Kariyer hedeflerin neler?", "session_id": "a"})
+    assert fake_llm.requests == 2
@@ -0,0 +1,34 @@
+"""
+System prompt caching and retrieval
+"""
+from app.config import settings
+from app.services import ai_service
+from app.services.tokenizer import estimate_tokens
+
+
+def test_system_prompt_built_once_per_knowledge_base_version():
+    ai_service.reload_knowledge_base()
+    before = dict(ai_service.get_prompt_cache_stats())
+
+    first = ai_service.get_system_prompt()
+    second = ai_service.get_system_prompt()
+
+    stats = ai_service.get_prompt_cache_stats()
+    assert first is second
+    assert stats["misses"] == before["misses"] + 1
+    assert stats["hits"] == before["hits"] + 1
+
+    ai_service.reload_knowledge_base()
+    assert ai_service.get_prompt_cache_stats()["size"] == 0
+    assert ai_service.get_system_prompt() == first
+
+
+def test_retrieval_prompt_includes_relevant_chunks_within_budget(monkeypatch):
+    monkeypatch.setattr(settings, "prompt_retrieval_enabled", True)
+    monkeypatch.setattr(settings, "prompt_token_budget", 1500)
+    full = ai_service.get_system_prompt()
+
+    prompt = ai_service.get_system_prompt("Diyabet tahmin projesinde hangi teknolojileri kullandın?")
+    assert "**Diyabet Tahmin Sistemi**" in prompt
+    assert "**Otobüs Bilet Rezervasyon Sistemi**" not in prompt
+    assert estimate_tokens(prompt) <= 1500 < estimate_tokens(full)
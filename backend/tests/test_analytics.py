@@ -0,0 +1,251 @@
+"""
+Analytics ingest, stats, time series and export, on every database backend
+"""
+import asyncio
+import csv
+import gzip
+import io
+import json
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, func, select
+
+from app.db.database import async_session_maker
+from app.db.models import (
+    PageView,
+    PageViewDaily,
+    PageViewHourly,
+    PageViewReferrerDaily,
+    PageViewUserAgentDaily
+)
+from app.services.analytics_buffer import PageViewBuffer, get_pageview_buffer
+from app.services import stats_cache
+from app.services.analytics_rollups import backfill_dimension_rollups
+from app.services.stats_cache import SingleFlightCache
+from tests.conftest import ADMIN_HEADERS
+
+
+FIREFOX = "Mozilla/5.0 (X11; Linux x86_64; rv:120.0) Gecko/20100101 Firefox/120.0"
+
+
+async def _seed(rows):
+    """Write page views through the buffer, as ingest does."""
+    buffer = get_pageview_buffer()
+    await buffer.add_many([dict(row) for row in rows])
+    await buffer.flush()
+
+
+def _views(count, page_path="/", visitor="v", hours_ago=0, **extra):
+    created_at = datetime.utcnow() - timedelta(hours=hours_ago)
+    return [
+        {
+            "page_path": page_path,
+            "project_slug": extra.get("project_slug"),
+            "visitor_id": f"{visitor}{i}",
+            "user_agent": extra.get("user_agent", FIREFOX),
+            "referrer": extra.get("referrer"),
+            "created_at": created_at,
+        }
+        for i in range(count)
+    ]
+
+
+async def test_ingest_single_and_batch(db_engine, client):
+    r = await client.post(
+        "/api/v1/analytics/pageview",
+        json={"page_path": "/", "visitor_id": "a", "referrer": "https://github.com/x"},
+        headers={"User-Agent": FIREFOX}
+    )
+    assert r.status_code == 200
+    r = await client.post("/api/v1/analytics/pageview/batch", json={"items": [
+        {"page_path": "/projects", "project_slug": "bot", "visitor_id": "b"},
+        {"page_path": "/about", "visitor_id": "c"},
+    ]})
+    assert r.json() == {"success": True, "accepted": 2, "rejected": 0, "errors": []}
+
+    await get_pageview_buffer().flush()
+    async with async_session_maker() as db:
+        assert await db.scalar(select(func.count(PageView.id))) == 3
+        assert await db.scalar(select(func.sum(PageViewHourly.views))) == 3
+        assert await db.scalar(select(func.sum(PageViewDaily.views))) == 3
+        row = (await db.execute(
+            select(PageView.user_agent_id, PageView.referrer_host_id, PageView.user_agent)
+            .where(PageView.visitor_id == "a")
+        )).one()
+    assert row.user_agent_id is not None
+    assert row.referrer_host_id is not None
+    assert row.user_agent is None
+
+
+async def test_batch_validation_and_beacon_body(db_engine, client):
+    # sendBeacon posts the JSON as text/plain
+    r = await client.post(
+        "/api/v1/analytics/pageview/batch",
+        content=json.dumps({"items": [{"page_path": "/"}, "oops", {"page_path": None}]}),
+        headers={"Content-Type": "text/plain;charset=UTF-8"}
+    )
+    assert r.status_code == 200
+    body = r.json()
+    assert (body["accepted"], body["rejected"]) == (1, 2)
+    assert body["errors"][0] == {
+        "index": 1, "errors": ["Input should be a valid dictionary or instance of PageViewCreate"]
+    }
+    assert body["errors"][1]["index"] == 2
+
+    r = await client.post("/api/v1/analytics/pageview/batch", json={"items": [{"page_path": "/"}] * 101})
+    assert r.status_code == 422
+    r = await client.post("/api/v1/analytics/pageview/batch", content="{not json")
+    assert r.status_code == 422
+
+
+async def test_flush_isolates_bad_rows_after_retries(db_engine):
+    buffer = PageViewBuffer(max_attempts=2)
+    bad = {"page_path": None, "visitor_id": "bad"}
+    await buffer.add_many(_views(3, "/", "a") + [bad] + _views(3, "/", "b"))
+
+    # The batch is retried as a whole first
+    for _ in range(2):
+        await buffer.flush()
+        assert buffer.stats()["buffered"] == 7
+    assert buffer.stats()["flush_errors"] == 2
+
+    await buffer.add_many(_views(1, "/", "c"))
+    await buffer.flush()
+    stats = buffer.stats()
+    assert (stats["written"], stats["dropped"], stats["buffered"]) == (7, 1, 0)
+    async with async_session_maker() as db:
+        assert await db.scalar(select(func.count(PageView.id))) == 7
+        assert await db.scalar(select(func.sum(PageViewDaily.views))) == 7
+
+    # Retries start over for the next failure
+    await buffer.add_many([dict(bad)])
+    await buffer.flush()
+    assert buffer.stats()["buffered"] == 1
+
+
+async def test_stats_approximate_and_exact(db_engine, client):
+    await _seed(
+        _views(6, "/", "home", referrer="https://github.com/x")
+        + _views(3, "/projects", "proj", project_slug="bot")
+        # Outside a one-day window
+        + _views(4, "/old", "old", hours_ago=72)
+    )
+
+    for exact in ("false", "true"):
+        r = await client.get(
+            f"/api/v1/analytics/stats?days=1&exact={exact}", headers=ADMIN_HEADERS
+        )
+        assert r.status_code == 200
+        stats = r.json()
+        assert stats["total_views"] == 9
+        assert stats["unique_visitors"] == 9
+        assert stats["top_pages"][0] == {"page_path": "/", "view_count": 6}
+        assert stats["top_projects"] == [{"project_slug": "bot", "view_count": 3}]
+        assert stats["top_browsers"] == [{"browser": "Firefox", "view_count": 9}]
+        assert stats["top_referrers"] == [{"referrer_host": "github.com", "view_count": 6}]
+
+    r = await client.get("/api/v1/analytics/stats?days=7&exact=true", headers=ADMIN_HEADERS)
+    assert r.json()["total_views"] == 13
+
+
+async def test_approximate_uniques_use_the_same_window_as_views(db_engine, client):
+    # The older visitors share a day sketch with the first hours of the window
+    await _seed(_views(50, "/", "early", hours_ago=30) + _views(10, "/", "late"))
+
+    r = await client.get("/api/v1/analytics/stats?days=1", headers=ADMIN_HEADERS)
+    stats = r.json()
+    assert stats["total_views"] == 10
+    assert stats["unique_visitors"] == 10
+
+
+async def test_top_dimensions_come_from_daily_rollups(db_engine, client):
+    chrome = "Mozilla/5.0 (Windows NT 10.0) AppleWebKit/537.36 Chrome/120.0 Safari/537.36"
+    await _seed(
+        _views(3, "/", "a", hours_ago=72, referrer="https://github.com/x")
+        + _views(2, "/", "b", user_agent=chrome)
+    )
+    # Raw rows past retention are gone; the rollups still cover them
+    async with async_session_maker() as db:
+        await db.execute(delete(PageView).where(PageView.visitor_id.like("a%")))
+        await db.commit()
+
+    r = await client.get("/api/v1/analytics/stats?days=7", headers=ADMIN_HEADERS)
+    stats = r.json()
+    assert stats["top_browsers"] == [
+        {"browser": "Firefox", "view_count": 3}, {"browser": "Chrome", "view_count": 2}
+    ]
+    assert stats["top_referrers"] == [{"referrer_host": "github.com", "view_count": 3}]
+
+
+async def test_backfill_dimension_rollups(db_engine):
+    await _seed(_views(4, "/", "a", hours_ago=48, referrer="https://github.com/x") + _views(1, "/"))
+    async with async_session_maker() as db:
+        await db.execute(delete(PageViewUserAgentDaily))
+        await db.execute(delete(PageViewReferrerDaily))
+        assert await backfill_dimension_rollups(db) == 3
+        await db.commit()
+        assert await db.scalar(select(func.sum(PageViewUserAgentDaily.views))) == 5
+        assert await db.scalar(select(func.sum(PageViewReferrerDaily.views))) == 4
+        # Already populated: nothing to do
+        assert await backfill_dimension_rollups(db) == 0
+
+
+async def test_timeseries(db_engine, client):
+    await _seed(_views(2, "/", "a") + _views(5, "/", "b", hours_ago=48))
+
+    r = await client.get("/api/v1/analytics/timeseries?days=7&bucket=day", headers=ADMIN_HEADERS)
+    assert r.status_code == 200
+    points = r.json()["points"]
+    assert [p["views"] for p in points] == [5, 2]
+    assert [p["unique_visitors"] for p in points] == [5, 2]
+
+    r = await client.get(
+        "/api/v1/analytics/timeseries?days=7&bucket=hour&page_path=/", headers=ADMIN_HEADERS
+    )
+    assert sum(p["views"] for p in r.json()["points"]) == 7
+
+
+async def test_stats_show_new_views_within_the_cache_ttl(db_engine, client):
+    stats_cache._stats_cache = SingleFlightCache(ttl_seconds=1)
+    await _seed(_views(2))
+    r = await client.get("/api/v1/analytics/stats", headers=ADMIN_HEADERS)
+    assert r.json()["total_views"] == 2
+
+    # Throttled: this flush does not drop the cached result
+    await _seed(_views(3))
+    r = await client.get("/api/v1/analytics/stats", headers=ADMIN_HEADERS)
+    assert r.json()["total_views"] == 2
+
+    await asyncio.sleep(1)
+    r = await client.get("/api/v1/analytics/stats", headers=ADMIN_HEADERS)
+    assert r.json()["total_views"] == 5
+
+
+async def test_export(db_engine, client):
+    await _seed(_views(3, "/", "a", referrer="https://example.com/page"))
+
+    r = await client.get("/api/v1/analytics/export?format=ndjson", headers=ADMIN_HEADERS)
+    assert r.status_code == 200
+    rows = [json.loads(line) for line in r.text.splitlines()]
+    assert len(rows) == 3
+    assert rows[0]["browser"] == "Firefox"
+    assert rows[0]["referrer_host"] == "example.com"
+
+    r = await client.get("/api/v1/analytics/export?format=csv&gzip=true", headers=ADMIN_HEADERS)
+    records = list(csv.reader(io.StringIO(gzip.decompress(r.content).decode("utf-8"))))
+    assert records[0][:3] == ["id", "page_path", "project_slug"]
+    assert len(records) == 4
+
+
+async def test_export_accepts_offset_aware_range(db_engine, client):
+    await _seed(_views(2, "/old", "a", hours_ago=5) + _views(1, "/new", "b"))
+
+    # Two hours ago, written in UTC+03:00
+    since = datetime.now(timezone(timedelta(hours=3))) - timedelta(hours=2)
+    r = await client.get(
+        "/api/v1/analytics/export",
+        params={"since": since.isoformat()},
+        headers=ADMIN_HEADERS
+    )
+    assert r.status_code == 200
+    assert [json.loads(line)["page_path"] for line in r.text.splitlines()] == ["/new"]
@@ -0,0 +1,34 @@
+"""
+Retention of raw page views
+"""
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+
+from app.db.database import async_session_maker
+from app.db.models import PageView, PageViewDaily
+from app.services.analytics_buffer import get_pageview_buffer
+from app.services.analytics_retention import RetentionJob
+
+
+async def test_retention_deletes_old_views_and_keeps_rollups(db_engine):
+    now = datetime.utcnow()
+    rows = [
+        {"page_path": "/", "visitor_id": f"v{i}", "user_agent": "", "referrer": None,
+         "created_at": now - timedelta(days=days)}
+        for i, days in enumerate([0, 1, 10, 10, 40, 40, 40])
+    ]
+    buffer = get_pageview_buffer()
+    await buffer.add_many(rows)
+    await buffer.flush()
+
+    job = RetentionJob(retention_days=7, batch_size=2, pause_seconds=0)
+    assert await job.run_once() == 5
+    assert job.stats()["batches"] >= 3
+
+    async with async_session_maker() as db:
+        assert await db.scalar(select(func.count(PageView.id))) == 2
+        # Aggregates outlive the raw events
+        assert await db.scalar(select(func.sum(PageViewDaily.views))) == 7
+
+    assert await job.run_once() == 0
@@ -0,0 +1,49 @@
+"""
+Contact submissions: duplicate and flood suppression, on every database backend
+"""
+from sqlalchemy import func, select
+
+from app.db.database import async_session_maker
+from app.db.models import Contact
+from app.services import contact_guard
+
+
+def _contact(email="a@example.com", message="Merhaba, bir proje hakkında konuşalım."):
+    return {"name": "Ziyaretçi", "email": email, "message": message}
+
+
+async def _count_contacts():
+    async with async_session_maker() as db:
+        return await db.scalar(select(func.count(Contact.id)))
+
+
+async def test_duplicates_are_acknowledged_but_stored_once(db_engine, client):
+    r = await client.post("/api/v1/contact", json=_contact())
+    assert r.json()["success"] is True
+    # Case and whitespace changes are still the same message
+    r = await client.post(
+        "/api/v1/contact",
+        json=_contact("A@example.com", "  merhaba,  bir proje hakkında konuşalım. ")
+    )
+    assert r.json()["success"] is True
+    assert await _count_contacts() == 1
+    assert contact_guard.get_contact_guard().stats()["duplicates"] == 1
+
+    # After a restart the stored fingerprint still catches it
+    contact_guard._guard = None
+    r = await client.post("/api/v1/contact", json=_contact())
+    assert r.status_code == 200
+    assert await _count_contacts() == 1
+    assert contact_guard.get_contact_guard().stats()["db_duplicates"] == 1
+
+
+async def test_flood_from_one_email_is_rejected(db_engine, client):
+    limit = contact_guard.get_contact_guard().max_per_email
+    for i in range(limit):
+        r = await client.post("/api/v1/contact", json=_contact(message=f"Mesaj numarası {i}, merhaba"))
+        assert r.status_code == 200
+
+    r = await client.post("/api/v1/contact", json=_contact(message="Bir mesaj daha, merhaba"))
+    assert r.status_code == 429
+    assert await _count_contacts() == limit
+    assert contact_guard.get_contact_guard().stats()["suppressed"] == 1
@@ -0,0 +1,153 @@
+"""
+Email outbox delivery against a fake Resend server, on every database backend
+"""
+from datetime import datetime, timedelta
+
+import pytest
+import resend
+from sqlalchemy import select, update
+
+from app.config import settings
+from app.db.database import async_session_maker
+from app.db.models import Contact, EmailOutbox
+from app.services.email_outbox import EmailOutboxWorker, enqueue_contact_email
+from tests.fake_servers import FakeResend, serve
+
+
+@pytest.fixture
+def fake_resend(monkeypatch):
+    server = FakeResend()
+    with serve(server.app) as url:
+        monkeypatch.setattr(settings, "resend_api_key", "re_test")
+        monkeypatch.setattr(settings, "resend_api_url", url)
+        monkeypatch.setattr(settings, "contact_email", "owner@example.com")
+        # send_emails points the SDK at the fake server; restore it afterwards
+        monkeypatch.setattr(resend, "api_url", resend.api_url)
+        yield server
+
+
+async def _submit(*emails):
+    """Store contacts with their queued notifications."""
+    async with async_session_maker() as db:
+        for email in emails:
+            contact = Contact(name="Ziyaretçi", email=email, message="Merhaba")
+            db.add(contact)
+            await db.flush()
+            enqueue_contact_email(db, contact)
+        await db.commit()
+
+
+async def _outbox():
+    async with async_session_maker() as db:
+        result = await db.execute(
+            select(Contact.email, EmailOutbox)
+            .join(Contact, EmailOutbox.contact_id == Contact.id)
+            .order_by(EmailOutbox.id)
+        )
+        return {email: row for email, row in result}
+
+
+async def _make_due():
+    async with async_session_maker() as db:
+        await db.execute(update(EmailOutbox).values(next_attempt_at=datetime.utcnow()))
+        await db.commit()
+
+
+async def test_failed_sends_are_retried_with_backoff(db_engine, fake_resend):
+    worker = EmailOutboxWorker(backoff_base=60, max_attempts=5)
+    await _submit("a@example.com")
+    fake_resend.down = True
+
+    started = datetime.utcnow()
+    assert await worker.process_batch() == 1
+    row = (await _outbox())["a@example.com"]
+    assert (row.status, row.attempts) == ("pending", 1)
+    assert "Unavailable" in row.last_error
+    assert timedelta(seconds=59) < row.next_attempt_at - started < timedelta(seconds=62)
+    # Not due yet
+    assert await worker.process_batch() == 0
+
+    await _make_due()
+    started = datetime.utcnow()
+    assert await worker.process_batch() == 1
+    row = (await _outbox())["a@example.com"]
+    assert row.attempts == 2
+    assert timedelta(seconds=119) < row.next_attempt_at - started < timedelta(seconds=122)
+
+    fake_resend.down = False
+    await _make_due()
+    assert await worker.process_batch() == 1
+    row = (await _outbox())["a@example.com"]
+    assert (row.status, row.last_error) == ("sent", None)
+    assert row.sent_at is not None
+    assert fake_resend.singles == ["a@example.com"] * 3
+
+
+async def test_email_is_dead_after_max_attempts(db_engine, fake_resend):
+    worker = EmailOutboxWorker(backoff_base=60, max_attempts=2)
+    await _submit("a@example.com")
+    fake_resend.down = True
+
+    assert await worker.process_batch() == 1
+    await _make_due()
+    assert await worker.process_batch() == 1
+    row = (await _outbox())["a@example.com"]
+    assert (row.status, row.attempts) == ("dead", 2)
+    assert worker.stats()["dead"] == 1
+
+    # Dead rows are left alone
+    fake_resend.down = False
+    await _make_due()
+    assert await worker.process_batch() == 0
+    assert len(fake_resend.singles) == 2
+
+
+async def test_failed_batch_falls_back_to_single_sends(db_engine, fake_resend):
+    worker = EmailOutboxWorker(backoff_base=60)
+    await _submit("a@example.com", "bad@example.com", "c@example.com")
+    fake_resend.rejected.add("bad@example.com")
+
+    assert await worker.process_batch() == 3
+    assert fake_resend.batches == [["a@example.com", "bad@example.com", "c@example.com"]]
+    assert fake_resend.singles == ["a@example.com", "bad@example.com", "c@example.com"]
+
+    outbox = await _outbox()
+    assert outbox["a@example.com"].status == "sent"
+    assert outbox["c@example.com"].status == "sent"
+    assert outbox["bad@example.com"].status == "pending"
+    assert "Invalid email" in outbox["bad@example.com"].last_error
+    assert worker.stats()["sent"] == 2
+
+
+async def test_outage_fails_the_batch_without_single_sends(db_engine, fake_resend):
+    worker = EmailOutboxWorker(backoff_base=60)
+    await _submit("a@example.com", "b@example.com")
+    fake_resend.down = True
+
+    assert await worker.process_batch() == 2
+    assert fake_resend.batches == [["a@example.com", "b@example.com"]]
+    assert fake_resend.singles == []
+
+    outbox = await _outbox()
+    assert [row.status for row in outbox.values()] == ["pending", "pending"]
+    assert all("Unavailable" in row.last_error for row in outbox.values())
+
+
+async def test_email_for_deleted_contact_is_dead(db_engine, fake_resend):
+    if db_engine.dialect.name == "postgresql":
+        pytest.skip("the foreign key keeps contacts with queued emails")
+    worker = EmailOutboxWorker(backoff_base=60)
+    await _submit("a@example.com", "gone@example.com")
+    async with async_session_maker() as db:
+        gone = await db.scalar(select(Contact).where(Contact.email == "gone@example.com"))
+        outbox_id = await db.scalar(select(EmailOutbox.id).where(EmailOutbox.contact_id == gone.id))
+        await db.delete(gone)
+        await db.commit()
+
+    assert await worker.process_batch() == 2
+    assert fake_resend.singles == ["a@example.com"]
+    async with async_session_maker() as db:
+        row = await db.get(EmailOutbox, outbox_id)
+    assert (row.status, row.last_error) == ("dead", "LookupError('Contact no longer exists')")
+    assert worker.stats()["dead"] == 1
+    assert worker.stats()["sent"] == 1
@@ -0,0 +1,36 @@
+"""
+History budgeting and rolling summaries
+"""
+from app.services.history import SUMMARY_MAX_LINES, fit_history, fold_summary
+
+
+def _turn(i):
+    return [
+        {"role": "user", "content": f"question {i}. " + "More detail. " * 20},
+        {"role": "assistant", "content": f"answer {i}"},
+    ]
+
+
+def test_fold_summary_only_appends_new_lines():
+    summary = fold_summary("", _turn(0))
+    assert summary == "- Kullanıcı: question 0.\n- Asistan: answer 0"
+    assert fold_summary(summary, _turn(1)).startswith(summary + "\n")
+
+    for i in range(SUMMARY_MAX_LINES):
+        summary = fold_summary(summary, _turn(i + 2))
+    lines = summary.split("\n")
+    assert len(lines) == SUMMARY_MAX_LINES
+    assert lines[-1] == f"- Asistan: answer {SUMMARY_MAX_LINES + 1}"
+
+
+def test_fit_history_includes_stored_summary():
+    stored = fold_summary("", _turn(0))
+
+    summary, recent = fit_history(_turn(1), token_budget=1000, summary=stored)
+    assert summary == stored
+    assert recent == _turn(1)
+
+    # Messages that do not fit are folded in after the stored summary
+    summary, recent = fit_history(_turn(1) + _turn(2), token_budget=120, summary=stored)
+    assert recent == _turn(2)
+    assert summary == stored + "\n- Kullanıcı: question 1.\n- Asistan: answer 1"
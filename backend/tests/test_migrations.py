@@ -0,0 +1,44 @@
+"""
+Alembic migrations, on every database backend
+"""
+import asyncio
+from pathlib import Path
+
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import text
+
+from app.db.database import Base
+
+
+def _config(engine) -> Config:
+    config = Config(str(Path(__file__).parents[1] / "alembic.ini"))
+    # Percent signs would be read as config interpolation
+    url = engine.url.render_as_string(hide_password=False).replace("%", "%%")
+    config.set_main_option("sqlalchemy.url", url)
+    return config
+
+
+async def test_migrations_upgrade_baseline_database_to_models(db_engine):
+    async with db_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.execute(text("DROP TABLE IF EXISTS alembic_version"))
+    config = _config(db_engine)
+
+    # A database created before the migrations existed
+    await asyncio.to_thread(command.upgrade, config, "0001")
+    async with db_engine.begin() as conn:
+        await conn.execute(text(
+            "INSERT INTO page_views (page_path, user_agent) VALUES ('/', 'Mozilla/5.0')"
+        ))
+
+    await asyncio.to_thread(command.upgrade, config, "head")
+    async with db_engine.connect() as conn:
+        diff = await conn.run_sync(
+            lambda sync_conn: compare_metadata(MigrationContext.configure(sync_conn), Base.metadata)
+        )
+        rows = (await conn.execute(text("SELECT page_path, user_agent_id FROM page_views"))).all()
+    assert diff == []
+    assert rows == [("/", None)]
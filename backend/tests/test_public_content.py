@@ -0,0 +1,33 @@
+"""
+Public content conditional GET and pre-compressed variants
+"""
+import json
+
+from app.services.public_content import CONTENT_FILE
+
+
+async def test_content_revalidates_per_encoding(client):
+    r = await client.get("/api/v1/content", headers={"Accept-Encoding": "gzip"})
+    assert r.status_code == 200
+    assert r.headers["content-encoding"] == "gzip"
+    assert r.json() == json.loads(CONTENT_FILE.read_bytes())
+    gzip_etag = r.headers["etag"]
+    assert gzip_etag.endswith('-gzip"')
+
+    r = await client.get(
+        "/api/v1/content",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": gzip_etag}
+    )
+    assert r.status_code == 304
+    assert r.headers["etag"] == gzip_etag
+    assert r.content == b""
+
+    # A client that no longer accepts gzip must get the identity body
+    r = await client.get(
+        "/api/v1/content",
+        headers={"Accept-Encoding": "identity", "If-None-Match": gzip_etag}
+    )
+    assert r.status_code == 200
+    assert "content-encoding" not in r.headers
+    assert r.headers["etag"] != gzip_etag
+    assert r.json() == json.loads(CONTENT_FILE.read_bytes())
@@ -0,0 +1,93 @@
+"""
+Hot queries use indexes (SQLite query plans)
+"""
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Iterator, List, Tuple
+
+import pytest
+from sqlalchemy import event
+
+from app.api.v1.endpoints.analytics import _compute_stats, _compute_timeseries, _export_pages
+from app.db.database import Base, async_session_maker
+from app.db.models import Contact
+from app.services.contact_guard import contact_fingerprint, get_contact_guard
+from tests.test_analytics import _seed, _views
+
+
+@contextmanager
+def _captured_statements(engine) -> Iterator[List[Tuple[str, tuple]]]:
+    """Record the SQL (with parameters) the engine runs inside the block."""
+    statements: List[Tuple[str, tuple]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+
+async def _full_scans(engine, statements) -> List[str]:
+    """Plan lines that read a whole table without an index."""
+    tables = set(Base.metadata.tables)
+    scans = []
+    async with engine.connect() as conn:
+        for statement, parameters in statements:
+            plan = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            for row in plan:
+                detail = row[-1]
+                # Older SQLite versions print "SCAN TABLE <name>"
+                words = [w for w in detail.split() if w != "TABLE"]
+                if (
+                    words[0] == "SCAN"
+                    and words[1] in tables
+                    and "INDEX" not in detail
+                    and "INTEGER PRIMARY KEY" not in detail
+                ):
+                    scans.append(f"{detail}\n  in: {statement}")
+    return scans
+
+
+@pytest.mark.parametrize("db_engine", ["sqlite"], indirect=True)
+async def test_stats_timeseries_and_export_use_indexes(db_engine):
+    await _seed(
+        _views(5, "/", "a", referrer="https://github.com/x")
+        + _views(5, "/projects", "b", hours_ago=30, project_slug="bot")
+    )
+
+    with _captured_statements(db_engine) as statements:
+        await _compute_stats(1, exact=False)
+        await _compute_stats(1, exact=True)
+        await _compute_timeseries(7, "day", None, None)
+        await _compute_timeseries(7, "week", None, None)
+        await _compute_timeseries(7, "hour", "/", None)
+        await _compute_timeseries(7, "day", None, "bot")
+        async for _ in _export_pages(datetime.utcnow() - timedelta(days=7), None):
+            pass
+
+    assert statements
+    assert await _full_scans(db_engine, statements) == []
+
+
+@pytest.mark.parametrize("db_engine", ["sqlite"], indirect=True)
+async def test_contact_guard_queries_use_indexes(db_engine):
+    fingerprint = contact_fingerprint("a@example.com", "Merhaba")
+    async with async_session_maker() as db:
+        db.add(Contact(
+            name="A", email="a@example.com", message="Merhaba",
+            fingerprint=fingerprint, ip_address="127.0.0.1"
+        ))
+        await db.commit()
+
+    guard = get_contact_guard()
+    with _captured_statements(db_engine) as statements:
+        async with async_session_maker() as db:
+            assert await guard.seen_in_db(db, fingerprint)
+            await guard.warm_up(db)
+
+    assert len(statements) == 2
+    assert await _full_scans(db_engine, statements) == []
@@ -0,0 +1,106 @@
+"""
+Chat session stores
+"""
+from app.services.history import fit_history
+from app.services.session_store import DatabaseSessionStore, InMemorySessionStore
+
+
+def _turn(i):
+    return [
+        {"role": "user", "content": f"question {i}"},
+        {"role": "assistant", "content": f"answer {i}"},
+    ]
+
+
+async def test_memory_store_bounds_history_and_sessions():
+    store = InMemorySessionStore(max_sessions=2, max_history=4)
+    for i in range(3):
+        await store.append("a", _turn(i))
+    assert [m["content"] for m in await store.get_history("a")] == [
+        "question 1", "answer 1", "question 2", "answer 2"
+    ]
+
+    await store.append("b", _turn(0))
+    await store.append("c", _turn(0))
+    assert await store.get_history("a") == []
+    assert store.stats()["lru_evictions"] == 1
+
+
+async def test_memory_store_folds_trimmed_turns_into_summary():
+    store = InMemorySessionStore(max_history=4)
+    await store.append("a", _turn(0))
+    await store.append("a", _turn(1))
+    assert (await store.get_session("a"))[0] == ""
+
+    await store.append("a", _turn(2))
+    await store.append("a", _turn(3))
+    summary, messages = await store.get_session("a")
+    assert summary == (
+        "- Kullanıcı: question 0\n- Asistan: answer 0\n"
+        "- Kullanıcı: question 1\n- Asistan: answer 1"
+    )
+    assert [m["content"] for m in messages] == ["question 2", "answer 2", "question 3", "answer 3"]
+    assert store.stats()["folded_messages"] == 4
+
+
+async def test_memory_store_trims_to_token_budget_once():
+    long_turn = [
+        {"role": "user", "content": "question. " + "More detail. " * 20},
+        {"role": "assistant", "content": "answer"},
+    ]
+    store = InMemorySessionStore(max_history=20, token_budget=120)
+    await store.append("a", long_turn + _turn(1))
+    await store.append("a", long_turn)
+
+    summary, messages = await store.get_session("a")
+    assert summary == "- Kullanıcı: question.\n- Asistan: answer"
+    assert messages == _turn(1) + long_turn
+
+    # Stored history already fits, so the prompt adds nothing to the summary
+    assert fit_history(messages, 120, summary) == (summary, messages)
+    assert store.stats()["folded_messages"] == 2
+
+
+async def test_database_store_round_trip(db_engine):
+    store = DatabaseSessionStore(InMemorySessionStore(max_history=4), read_timeout=5)
+    await store.append("s1", _turn(0))
+    await store.append("s1", _turn(1))
+    await store.append("s1", _turn(2))
+    await store.close()
+    assert store.stats()["rows_written"] == 1
+
+    # Another worker sees the session through the database
+    other = DatabaseSessionStore(InMemorySessionStore(), read_timeout=5)
+    summary, history = await other.get_session("s1")
+    assert summary == "- Kullanıcı: question 0\n- Asistan: answer 0"
+    assert [m["content"] for m in history] == ["question 1", "answer 1", "question 2", "answer 2"]
+    assert other.stats()["db_reads"] == 1
+
+    await other.delete("s1")
+    assert await DatabaseSessionStore(InMemorySessionStore(), read_timeout=5).get_history("s1") == []
+
+
+async def test_database_store_merges_appends_from_several_workers(db_engine):
+    first = DatabaseSessionStore(InMemorySessionStore(max_history=4), read_timeout=5)
+    second = DatabaseSessionStore(InMemorySessionStore(max_history=4), read_timeout=5)
+    await first.append("s1", _turn(0))
+    await first.flush()
+
+    # The second worker's view is stale: it has not seen turn 0
+    await second.append("s1", _turn(1))
+    await first.append("s1", _turn(2))
+    await second.flush()
+    await first.flush()
+
+    summary, history = await DatabaseSessionStore(
+        InMemorySessionStore(max_history=4), read_timeout=5
+    ).get_session("s1")
+    assert summary == "- Kullanıcı: question 0\n- Asistan: answer 0"
+    assert [m["content"] for m in history] == ["question 1", "answer 1", "question 2", "answer 2"]
+
+    # After flushing, a worker's cache includes the other worker's turns
+    assert [m["content"] for m in (await second.cache.get_session("s1"))[1]] == [
+        "question 0", "answer 0", "question 1", "answer 1"
+    ]
+    await first.close()
+    await second.close()
@@ -0,0 +1,71 @@
+"""
+Single-flight stats cache
+"""
+import asyncio
+
+import pytest
+
+from app.services.stats_cache import SingleFlightCache
+
+
+async def test_cancelling_the_first_caller_does_not_fail_waiters():
+    cache = SingleFlightCache(ttl_seconds=30)
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "stats"
+
+    leader = asyncio.create_task(cache.get_or_compute("k", compute))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(cache.get_or_compute("k", compute))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await waiter == ("stats", 0.0)
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    assert calls == 1
+    # The computation still completed and was stored
+    value, _ = await cache.get_or_compute("k", compute)
+    assert value == "stats"
+    assert cache.stats()["hits"] == 1
+
+
+async def test_failures_reach_every_waiter():
+    cache = SingleFlightCache(ttl_seconds=30)
+
+    async def compute():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("database down")
+
+    results = await asyncio.gather(
+        cache.get_or_compute("k", compute), cache.get_or_compute("k", compute),
+        return_exceptions=True
+    )
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert cache.stats()["size"] == 0
+
+
+async def test_throttled_invalidation_runs_at_most_once_per_ttl():
+    cache = SingleFlightCache(ttl_seconds=30)
+
+    async def compute():
+        return "stats"
+
+    await cache.get_or_compute("k", compute)
+    cache.invalidate(throttled=True)
+    assert cache.stats()["size"] == 0
+
+    await cache.get_or_compute("k", compute)
+    for _ in range(5):
+        cache.invalidate(throttled=True)
+    assert cache.stats()["size"] == 1
+    assert cache.stats()["throttled_invalidations"] == 5
+
+    # Unthrottled invalidation (e.g. deletes) always applies
+    cache.invalidate()
+    assert cache.stats()["size"] == 0
+    assert cache.stats()["invalidations"] == 2
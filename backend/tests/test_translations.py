@@ -0,0 +1,93 @@
+"""
+Translation store and endpoints, against a temporary messages directory
+"""
+import asyncio
+import json
+
+import pytest
+
+from app.config import settings
+from app.services import translation_store
+from tests.conftest import ADMIN_HEADERS
+
+
+@pytest.fixture
+def messages_dir(tmp_path, monkeypatch):
+    (tmp_path / "tr.json").write_text(
+        json.dumps({"hero": {"title": "Merhaba", "subtitle": "AI Mühendisi"}}, ensure_ascii=False),
+        encoding="utf-8"
+    )
+    monkeypatch.setattr(settings, "translations_dir", str(tmp_path))
+    monkeypatch.setattr(translation_store, "_store", None)
+    return tmp_path
+
+
+async def test_concurrent_field_updates_are_all_saved(messages_dir, client):
+    responses = await asyncio.gather(*(
+        client.put(
+            "/api/v1/translations/tr/field",
+            json={"path": f"items.item{i}", "value": f"Öğe {i}"},
+            headers=ADMIN_HEADERS
+        )
+        for i in range(10)
+    ))
+    assert all(r.status_code == 200 for r in responses)
+
+    saved = json.loads((messages_dir / "tr.json").read_text(encoding="utf-8"))
+    assert saved["items"] == {f"item{i}": f"Öğe {i}" for i in range(10)}
+    assert saved["hero"]["title"] == "Merhaba"
+    # Written through a temp file and renamed; nothing is left behind
+    assert sorted(p.name for p in messages_dir.iterdir()) == ["tr.json"]
+
+    # Reads are served from memory until the file changes
+    store = translation_store.get_translation_store()
+    loads = store.stats()["loads"]
+    r = await client.get("/api/v1/translations/tr", headers=ADMIN_HEADERS)
+    assert r.json()["content"] == saved
+    assert store.stats()["loads"] == loads
+
+    (messages_dir / "tr.json").write_text(json.dumps({"hero": {"title": "Selam"}}), encoding="utf-8")
+    r = await client.get("/api/v1/translations/tr", headers=ADMIN_HEADERS)
+    assert r.json()["content"] == {"hero": {"title": "Selam"}}
+    assert store.stats()["loads"] == loads + 1
+
+
+async def test_patch_applies_all_operations_or_none(messages_dir, client):
+    r = await client.get("/api/v1/translations/tr", headers=ADMIN_HEADERS)
+    etag = r.headers["etag"]
+
+    r = await client.patch(
+        "/api/v1/translations/tr",
+        json=[
+            {"op": "replace", "path": "/hero/title", "value": "Selam"},
+            {"path": "hero.cta", "value": "İletişim"},
+            {"op": "remove", "path": "/hero/subtitle"},
+        ],
+        headers={**ADMIN_HEADERS, "If-Match": etag}
+    )
+    assert r.status_code == 200
+    new_etag = r.headers["etag"]
+    assert new_etag == f'"{r.json()["version"]}"' != etag
+    saved = json.loads((messages_dir / "tr.json").read_text(encoding="utf-8"))
+    assert saved == {"hero": {"title": "Selam", "cta": "İletişim"}}
+
+    # A stale version is refused with the current ETag
+    r = await client.patch(
+        "/api/v1/translations/tr",
+        json=[{"path": "hero.title", "value": "Eski"}],
+        headers={**ADMIN_HEADERS, "If-Match": etag}
+    )
+    assert r.status_code == 412
+    assert r.headers["etag"] == new_etag
+
+    # One bad operation leaves the file untouched
+    r = await client.patch(
+        "/api/v1/translations/tr",
+        json=[
+            {"op": "replace", "path": "/hero/title", "value": "Yeni"},
+            {"op": "remove", "path": "/missing"},
+        ],
+        headers=ADMIN_HEADERS
+    )
+    assert r.status_code == 400
+    assert json.loads((messages_dir / "tr.json").read_text(encoding="utf-8")) == saved
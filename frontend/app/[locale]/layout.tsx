@@ -13,6 +13,7 @@ import CommandPalette from '@/components/widgets/CommandPalette';
 import KonamiListener from '@/components/widgets/EasterEggs/KonamiListener';
 import PageTransition from '@/components/transitions/PageTransition';
 import WebVitalsInit from '@/components/layout/WebVitalsInit';
+import PageViewTracker from '@/components/layout/PageViewTracker';
 import ConditionalLayout from '@/components/layout/ConditionalLayout';
 import '../globals.css';
 
@@ -138,6 +139,7 @@ export default async function LocaleLayout({
                         <KonamiListener />
                     </ConditionalLayout>
                     <WebVitalsInit />
+                    <PageViewTracker />
                 </NextIntlClientProvider>
             </body>
         </html>
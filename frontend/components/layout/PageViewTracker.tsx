@@ -0,0 +1,46 @@
+"use client";
+
+import { useEffect, useRef } from 'react';
+import { usePathname } from 'next/navigation';
+import { trackPageView } from '../../lib/api';
+
+const VISITOR_ID_KEY = 'visitor_id';
+
+function getVisitorId(): string | undefined {
+    try {
+        let id = localStorage.getItem(VISITOR_ID_KEY);
+        if (!id) {
+            id = crypto.randomUUID();
+            localStorage.setItem(VISITOR_ID_KEY, id);
+        }
+        return id;
+    } catch {
+        // Storage disabled (e.g. private mode): count the view without an ID
+        return undefined;
+    }
+}
+
+/**
+ * PageViewTracker - Client component recording a page view per route change
+ */
+export default function PageViewTracker() {
+    const pathname = usePathname();
+    const isFirstView = useRef(true);
+
+    useEffect(() => {
+        // Skip the admin panel
+        if (!pathname || pathname.includes('/ctrl-x7k9p2m')) return;
+
+        const projectSlug = pathname.match(/\/projects\/([^/]+)/)?.[1];
+        trackPageView({
+            page_path: pathname,
+            project_slug: projectSlug,
+            visitor_id: getVisitorId(),
+            // Only the landing view has an external referrer
+            referrer: isFirstView.current ? document.referrer || undefined : undefined,
+        });
+        isFirstView.current = false;
+    }, [pathname]);
+
+    return null;
+}
@@ -99,3 +99,61 @@ export async function trackAnalytics(data: AnalyticsEvent): Promise<void> {
         console.warn('Analytics tracking failed:', error);
     }
 }
+
+export interface PageViewEvent {
+    page_path: string;
+    project_slug?: string;
+    visitor_id?: string;
+    referrer?: string;
+}
+
+// Page views are queued and sent together to the batch endpoint
+const PAGEVIEW_FLUSH_DELAY_MS = 2000;
+const PAGEVIEW_BATCH_MAX = 100;
+let pageViewQueue: PageViewEvent[] = [];
+let pageViewTimer: ReturnType<typeof setTimeout> | null = null;
+
+function flushPageViews(useBeacon = false): void {
+    if (pageViewTimer) {
+        clearTimeout(pageViewTimer);
+        pageViewTimer = null;
+    }
+    if (pageViewQueue.length === 0) return;
+
+    const items = pageViewQueue.splice(0, PAGEVIEW_BATCH_MAX);
+    const body = JSON.stringify({ items });
+    const url = `${API_URL}/analytics/pageview/batch`;
+
+    if (useBeacon && typeof navigator !== 'undefined' && navigator.sendBeacon) {
+        // A string body is sent as text/plain, which needs no CORS preflight
+        // (browsers refuse cross-origin application/json beacons)
+        navigator.sendBeacon(url, body);
+    } else {
+        fetch(url, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body,
+            keepalive: true,
+        }).catch((error) => {
+            // Silently fail for analytics - don't block user experience
+            console.warn('Analytics tracking failed:', error);
+        });
+    }
+
+    if (pageViewQueue.length > 0) flushPageViews(useBeacon);
+}
+
+if (typeof window !== 'undefined') {
+    window.addEventListener('pagehide', () => flushPageViews(true));
+}
+
+export function trackPageView(event: PageViewEvent): void {
+    pageViewQueue.push(event);
+    if (pageViewQueue.length >= PAGEVIEW_BATCH_MAX) {
+        flushPageViews();
+    } else if (!pageViewTimer) {
+        pageViewTimer = setTimeout(() => flushPageViews(), PAGEVIEW_FLUSH_DELAY_MS);
+    }
+}